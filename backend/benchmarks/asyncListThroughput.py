@@ -0,0 +1,115 @@
+"""Compara a vazao das listagens no caminho sincrono e no assincrono.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.asyncListThroughput --requests 2000 --concurrency 200
+
+O caminho sincrono reproduz o comportamento antigo dos routers: cada chamada
+ocupa uma thread de um pool com ``--threads`` workers (40 no FastAPI). O caminho
+assincrono dispara ate ``--concurrency`` chamadas simultaneas em um unico event loop.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+from ..persistence.databaseManager import DatabaseManager
+from ..service.avaliacaoService import AsyncAvaliacaoService, AvaliacaoService
+from ..service.ocorrenciaService import AsyncOcorrenciaService, OcorrenciaService
+from ..service.servicoService import AsyncServicoService, ServicoService
+
+_ENDPOINTS: Dict[str, Tuple[Callable, Callable, str]] = {
+    "ocorrencias": (OcorrenciaService, AsyncOcorrenciaService, "list_ocorrencias"),
+    "avaliacoes": (AvaliacaoService, AsyncAvaliacaoService, "list_avaliacoes"),
+    "servicos": (ServicoService, AsyncServicoService, "list_servicos"),
+}
+
+
+def _summary(label: str, total_seconds: float, latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if ordered else 0.0
+    return (
+        f"{label:<6} {len(latencies) / total_seconds:>9.1f} req/s  "
+        f"p50={statistics.median(ordered) * 1000:.1f}ms  p95={p95 * 1000:.1f}ms"
+    )
+
+
+def _run_sync(database_url: str, endpoint: str, args: argparse.Namespace) -> str:
+    service_cls, _, method_name = _ENDPOINTS[endpoint]
+    db_manager = DatabaseManager(
+        database_url,
+        echo=False,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+    )
+    method = getattr(service_cls(db_manager), method_name)
+
+    def _timed_call() -> float:
+        started = time.perf_counter()
+        method()
+        return time.perf_counter() - started
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            started = time.perf_counter()
+            latencies = list(executor.map(lambda _: _timed_call(), range(args.requests)))
+            elapsed = time.perf_counter() - started
+    finally:
+        db_manager.dispose()
+
+    return _summary("sync", elapsed, latencies)
+
+
+async def _run_async(database_url: str, endpoint: str, args: argparse.Namespace) -> str:
+    _, service_cls, method_name = _ENDPOINTS[endpoint]
+    db_manager = AsyncDatabaseManager(
+        database_url,
+        echo=False,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+    )
+    method = getattr(service_cls(db_manager), method_name)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _timed_call() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await method()
+            return time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(_timed_call() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await db_manager.dispose()
+
+    return _summary("async", elapsed, list(latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=sorted(_ENDPOINTS), action="append")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    for endpoint in args.endpoint or sorted(_ENDPOINTS):
+        print(f"/{endpoint}/ ({args.requests} chamadas)")
+        print("  " + _run_sync(database_url, endpoint, args))
+        print("  " + asyncio.run(_run_async(database_url, endpoint, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Avaliacoes simultaneas de um servico popular, com a media incremental e com o AVG.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.avaliacaoConcurrency --existing 1000 10000 100000 --requests 2000 --concurrency 16
+
+Cria dois servicos sinteticos, um por caminho (marcados em ``nome`` e
+removidos no final com as suas avaliacoes, exceto com ``--keep``) e, para cada
+tamanho de ``--existing``, completa as avaliacoes de cada um ate esse numero e
+grava ``--requests`` avaliacoes novas em ``--concurrency`` threads, uma
+transacao por avaliacao:
+
+* ``incremental``: o ``INSERT`` em AVALIACAO que ``sp_registrar_avaliacao``
+  faz e o ``UPDATE`` por diferenca da linha do servico. No MySQL quem faz o
+  ``UPDATE`` e o gatilho de ``sql/funcoes.sql``; nos bancos sem esses gatilhos
+  (o SQLite de desenvolvimento) o benchmark o executa na mesma transacao;
+* ``recalculo AVG``: o mesmo ``INSERT`` seguido do ``UPDATE`` que os gatilhos
+  antigos faziam, com o ``AVG`` sobre todas as avaliacoes do servico. No MySQL
+  o gatilho incremental tambem dispara nesse caminho.
+
+Mostra a vazao e as latencias p50/p99 de cada caminho e, no final, se
+``nota_media_servico``, ``soma_notas_servico`` e ``qtd_avaliacoes_servico`` do
+servico incremental conferem com AVALIACAO apos as gravacoes simultaneas. So o
+MySQL tem travas por linha; no SQLite as escritas sao serializadas pelo banco
+inteiro e os numeros servem apenas para conferir o benchmark.
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+
+from ..persistence.databaseManager import DatabaseManager
+
+_MARKER = "benchmark avaliacaoConcurrency"
+
+# Bancos com os gatilhos de sql/funcoes.sql; nos demais o benchmark faz o UPDATE incremental.
+_TRIGGER_DIALECTS = ("mysql", "mariadb")
+
+_REFERENCES_SQL = text(
+    "SELECT (SELECT cod_orgao FROM ORGAO_PUBLICO ORDER BY cod_orgao LIMIT 1) AS cod_orgao, "
+    "(SELECT cod_oco FROM OCORRENCIA ORDER BY cod_oco LIMIT 1) AS cod_oco, "
+    "(SELECT cpf FROM MORADOR ORDER BY cpf LIMIT 1) AS cpf"
+)
+_INSERT_SERVICO_SQL = text(
+    "INSERT INTO SERVICO (cod_orgao, cod_ocorrencia, nome, descr, inicio_servico) "
+    "VALUES (:cod_orgao, :cod_oco, :marker, :marker, '2024-01-01')"
+)
+_SELECT_SERVICO_SQL = text("SELECT MAX(cod_servico) FROM SERVICO WHERE nome = :marker")
+_COUNT_AVALIACOES_SQL = text("SELECT COUNT(*) FROM AVALIACAO WHERE cod_servico = :cod_servico")
+_INSERT_AVALIACAO_SQL = text(
+    "INSERT INTO AVALIACAO (cod_ocorrencia, cod_servico, cpf_morador, nota_serv, nota_tempo, opiniao) "
+    "VALUES (:cod_oco, :cod_servico, :cpf, :nota_serv, :nota_tempo, :marker)"
+)
+# O que trg_avaliacao_media_after_insert faz, para bancos sem o gatilho. No SQLite
+# todas as expressoes do SET leem os valores anteriores da linha.
+_INCREMENT_SQL = text(
+    "UPDATE SERVICO SET soma_notas_servico = soma_notas_servico + :soma, "
+    "qtd_avaliacoes_servico = qtd_avaliacoes_servico + :qtd, "
+    "nota_media_servico = (soma_notas_servico + :soma) / (2.0 * (qtd_avaliacoes_servico + :qtd)) "
+    "WHERE cod_servico = :cod_servico"
+)
+# O que trg_avaliacao_media_after_insert fazia antes da media incremental.
+_RECALCULATE_SQL = text(
+    "UPDATE SERVICO SET nota_media_servico = ("
+    "SELECT AVG((nota_serv + nota_tempo) / 2.0) FROM AVALIACAO WHERE cod_servico = :cod_servico"
+    ") WHERE cod_servico = :cod_servico"
+)
+_CHECK_SQL = text(
+    "SELECT s.nota_media_servico, s.soma_notas_servico, s.qtd_avaliacoes_servico, "
+    "(SELECT AVG((nota_serv + nota_tempo) / 2.0) FROM AVALIACAO a WHERE a.cod_servico = s.cod_servico) AS media, "
+    "(SELECT SUM(nota_serv + nota_tempo) FROM AVALIACAO a WHERE a.cod_servico = s.cod_servico) AS soma, "
+    "(SELECT COUNT(*) FROM AVALIACAO a WHERE a.cod_servico = s.cod_servico) AS qtd "
+    "FROM SERVICO s WHERE s.cod_servico = :cod_servico"
+)
+_DELETE_SQL = (
+    text("DELETE FROM AVALIACAO WHERE cod_servico IN (SELECT cod_servico FROM SERVICO WHERE nome = :marker)"),
+    text("DELETE FROM SERVICO WHERE nome = :marker"),
+)
+
+
+def _avaliacao(references: Dict[str, Any], cod_servico: int, position: int) -> Dict[str, Any]:
+    return {
+        "cod_oco": references["cod_oco"],
+        "cod_servico": cod_servico,
+        "cpf": references["cpf"],
+        "nota_serv": 1 + position % 5,
+        "nota_tempo": 1 + position * 7 % 5,
+        "marker": _MARKER,
+    }
+
+
+def _increment(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "cod_servico": rows[0]["cod_servico"],
+        "soma": sum(row["nota_serv"] + row["nota_tempo"] for row in rows),
+        "qtd": len(rows),
+    }
+
+
+def _fill(
+    db_manager: DatabaseManager,
+    references: Dict[str, Any],
+    cod_servico: int,
+    total: int,
+    emulate_trigger: bool,
+) -> None:
+    with db_manager.begin() as connection:
+        existing = connection.execute(_COUNT_AVALIACOES_SQL, {"cod_servico": cod_servico}).scalar_one()
+        rows = [_avaliacao(references, cod_servico, position) for position in range(existing, total)]
+        for start in range(0, len(rows), 5000):
+            connection.execute(_INSERT_AVALIACAO_SQL, rows[start:start + 5000])
+        if rows and emulate_trigger:
+            connection.execute(_INCREMENT_SQL, _increment(rows))
+
+
+def _submit(db_manager: DatabaseManager, params: Dict[str, Any], recalculate: bool, emulate_trigger: bool) -> float:
+    started = time.perf_counter()
+    with db_manager.begin() as connection:
+        connection.execute(_INSERT_AVALIACAO_SQL, params)
+        if recalculate:
+            connection.execute(_RECALCULATE_SQL, {"cod_servico": params["cod_servico"]})
+        elif emulate_trigger:
+            connection.execute(_INCREMENT_SQL, _increment([params]))
+    return time.perf_counter() - started
+
+
+def _run(
+    db_manager: DatabaseManager,
+    references: Dict[str, Any],
+    cod_servico: int,
+    args: argparse.Namespace,
+    recalculate: bool,
+    emulate_trigger: bool,
+) -> None:
+    params = [_avaliacao(references, cod_servico, position) for position in range(args.requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        timings: List[float] = list(
+            executor.map(lambda item: _submit(db_manager, item, recalculate, emulate_trigger), params)
+        )
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    label = "recalculo AVG" if recalculate else "incremental"
+    print(
+        f"  {label:<14} {args.requests / elapsed:>8.0f} avaliacoes/s  "
+        f"p50 {statistics.median(timings) * 1000:>7.2f} ms  p99 {p99 * 1000:>7.2f} ms"
+    )
+
+
+def _check(db_manager: DatabaseManager, cod_servico: int) -> None:
+    row = db_manager.execute_read_query(_CHECK_SQL, {"cod_servico": cod_servico})[0]
+    media: Optional[float] = None if row["media"] is None else round(float(row["media"]), 2)
+    stored = None if row["nota_media_servico"] is None else float(row["nota_media_servico"])
+    print(
+        f"Agregados do servico {cod_servico}: qtd {row['qtd_avaliacoes_servico']} (AVALIACAO: {row['qtd']}), "
+        f"soma {row['soma_notas_servico']} (AVALIACAO: {row['soma']}), "
+        f"nota_media_servico {stored} (AVG: {media})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--existing", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--keep", action="store_true", help="mantem as linhas sinteticas no final")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False, pool_size=args.concurrency, max_overflow=0)
+    try:
+        references = db_manager.execute_read_query(_REFERENCES_SQL)[0]
+        if None in references.values():
+            raise SystemExit("O banco precisa de ao menos um ORGAO_PUBLICO, uma OCORRENCIA e um MORADOR.")
+        servicos = []
+        with db_manager.begin() as connection:
+            emulate_trigger = connection.dialect.name not in _TRIGGER_DIALECTS
+            for _ in range(2):
+                connection.execute(_INSERT_SERVICO_SQL, {**references, "marker": _MARKER})
+                servicos.append(connection.execute(_SELECT_SERVICO_SQL, {"marker": _MARKER}).scalar_one())
+        incremental, legacy = servicos
+
+        gatilho = "UPDATE incremental executado pelo benchmark" if emulate_trigger else "gatilhos do banco"
+        print(f"{args.requests} avaliacoes em {args.concurrency} threads ({gatilho})")
+        for existing in sorted(args.existing):
+            _fill(db_manager, references, incremental, existing, emulate_trigger)
+            _fill(db_manager, references, legacy, existing, emulate_trigger=False)
+            print(f"com {existing} avaliacoes anteriores")
+            _run(db_manager, references, incremental, args, recalculate=False, emulate_trigger=emulate_trigger)
+            _run(db_manager, references, legacy, args, recalculate=True, emulate_trigger=False)
+        _check(db_manager, incremental)
+    finally:
+        if not args.keep:
+            with db_manager.begin() as connection:
+                for statement in _DELETE_SQL:
+                    connection.execute(statement, {"marker": _MARKER})
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compara o caminho de dicionarios com o RowSet compacto nas listagens.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.compactRows --repeat 5
+
+Para cada listagem mede a latencia (mediana de ``--repeat`` execucoes) e o pico
+de memoria alocada (tracemalloc) de consultar e serializar a resposta inteira:
+
+* ``dict``: ``execute_read_query`` + ``jsonable_encoder`` + ``json.dumps``, como
+  os routers faziam;
+* ``rowset``: ``execute_read_rows`` + ``row_set_json``.
+
+As duas respostas sao comparadas antes da medicao.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from ..persistence import avaliacaoRepository, funcionarioRepository, ocorrenciaRepository  # noqa: F401 - registram as instrucoes
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.statementRegistry import statements
+from ..routers.rowSerializer import ColumnEncoders, row_set_json
+
+# listagem -> (instrucao registrada, ajuste por linha no caminho antigo, encoders do RowSet)
+_ENDPOINTS: Dict[str, Tuple[str, Optional[Callable[[Dict[str, Any]], Dict[str, Any]]], Optional[ColumnEncoders]]] = {
+    "ocorrencias": ("ocorrencia.list_ocorrencias", None, None),
+    "avaliacoes": ("avaliacao.list_avaliacoes", None, None),
+    "funcionarios": ("funcionario.list_funcionarios", None, None),
+}
+
+
+def _dict_path(db_manager: DatabaseManager, endpoint: str) -> bytes:
+    name, per_row, _ = _ENDPOINTS[endpoint]
+    rows = db_manager.execute_read_query(statements.get(name))
+    if per_row is not None:
+        rows = [per_row(row) for row in rows]
+    return json.dumps(jsonable_encoder(rows), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _row_set_path(db_manager: DatabaseManager, endpoint: str) -> bytes:
+    name, _, encoders = _ENDPOINTS[endpoint]
+    return row_set_json(db_manager.execute_read_rows(statements.get(name)), encoders)
+
+
+def _median_ms(fn: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def _peak_mib(fn: Callable[[], bytes]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=sorted(_ENDPOINTS), action="append")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    try:
+        for endpoint in args.endpoint or sorted(_ENDPOINTS):
+            dict_body = _dict_path(db_manager, endpoint)
+            row_set_body = _row_set_path(db_manager, endpoint)
+            if json.loads(dict_body) != json.loads(row_set_body):
+                raise SystemExit(f"/{endpoint}/: respostas divergentes entre os dois caminhos")
+
+            rows = len(json.loads(row_set_body))
+            print(f"/{endpoint}/ ({rows} linhas, {len(row_set_body) / 1024:.0f} KiB)")
+            for label, path in (("dict", _dict_path), ("rowset", _row_set_path)):
+                latency = _median_ms(lambda: path(db_manager, endpoint), args.repeat)
+                peak = _peak_mib(lambda: path(db_manager, endpoint))
+                print(f"  {label:<7} {latency:>9.1f} ms  pico={peak:>8.1f} MiB")
+    finally:
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Linhas lidas e bytes enviados pela listagem de moradores com varios contatos.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.contactFanOut --moradores 2000 --emails 3 --telefones 2
+
+Insere ``--moradores`` moradores sinteticos (marcados em ``nome`` e removidos no
+final, exceto com ``--keep``), cada um com ``--emails`` emails e ``--telefones``
+telefones, e compara:
+
+* ``join``: a consulta antiga, com LEFT JOIN em EMAIL e TELEFONE, que devolve
+  emails x telefones linhas por morador (cada uma virava um objeto na resposta);
+* ``por cpf``: ``MoradorService.list_moradores``, que le moradores, emails e
+  telefones em consultas separadas e junta os contatos por cpf.
+
+Mostra as linhas e celulas (linhas x colunas) lidas do driver, os objetos e o
+tamanho do corpo JSON da resposta e a mediana de ``--repeat`` execucoes.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Any, Callable, Tuple
+
+from sqlalchemy import text
+
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.statementRegistry import statements
+from ..routers.jsonResponses import dumps
+from ..service.moradorService import MoradorService
+
+_MARKER = "benchmark contactFanOut"
+_INSERT_BATCH_SIZE = 1000
+
+_JOINED_SQL = text(
+    "SELECT m.cpf, m.nome, m.cod_local, m.endereco, m.data_nasc, "
+    "loc.estado, loc.cidade, loc.bairro, em.email, tel.telefone, tel.DDD AS ddd "
+    "FROM MORADOR AS m "
+    "LEFT JOIN LOCALIDADE AS loc ON loc.cod_local = m.cod_local "
+    "LEFT JOIN EMAIL AS em ON em.cpf_morador = m.cpf "
+    "LEFT JOIN TELEFONE AS tel ON tel.cpf_morador = m.cpf "
+    "ORDER BY m.nome"
+)
+_LOCALIDADE_SQL = text("SELECT cod_local FROM LOCALIDADE ORDER BY cod_local LIMIT 1")
+_DELETE_EMAILS_SQL = text("DELETE FROM EMAIL WHERE cpf_morador IN (SELECT cpf FROM MORADOR WHERE nome = :marker)")
+_DELETE_TELEFONES_SQL = text(
+    "DELETE FROM TELEFONE WHERE cpf_morador IN (SELECT cpf FROM MORADOR WHERE nome = :marker)"
+)
+_DELETE_MORADORES_SQL = text("DELETE FROM MORADOR WHERE nome = :marker")
+
+
+def _insert(db_manager: DatabaseManager, moradores: int, emails: int, telefones: int) -> None:
+    locais = db_manager.execute_read_query(_LOCALIDADE_SQL)
+    if not locais:
+        raise SystemExit("O banco precisa de ao menos uma LOCALIDADE.")
+    cod_local = locais[0]["cod_local"]
+
+    for offset in range(0, moradores, _INSERT_BATCH_SIZE):
+        cpfs = [f"8{index:010d}" for index in range(offset, min(offset + _INSERT_BATCH_SIZE, moradores))]
+        with db_manager.begin() as connection:
+            connection.execute(
+                statements.get("morador.insert_morador"),
+                [
+                    {
+                        "cpf": cpf,
+                        "nome": _MARKER,
+                        "cod_local": cod_local,
+                        "endereco": "Rua do benchmark",
+                        "data_nasc": "1990-01-01",
+                        "senha": "x",
+                    }
+                    for cpf in cpfs
+                ],
+            )
+            connection.execute(
+                statements.get("morador.insert_email"),
+                [{"cpf": cpf, "email": f"{cpf}.{slot}@fanout.test"} for cpf in cpfs for slot in range(emails)],
+            )
+            connection.execute(
+                statements.get("morador.insert_telefone"),
+                [
+                    {"cpf": cpf, "telefone": f"9{int(cpf) % 1_000_000:06d}{slot:02d}", "ddd": "61"}
+                    for cpf in cpfs
+                    for slot in range(telefones)
+                ],
+            )
+
+
+def _read_volume(db_manager: DatabaseManager, *queries: Any) -> Tuple[int, int]:
+    rows = cells = 0
+    for query in queries:
+        row_set = db_manager.execute_read_rows(query)
+        rows += len(row_set.rows)
+        cells += len(row_set.rows) * len(row_set.columns)
+    return rows, cells
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--moradores", type=int, default=2000)
+    parser.add_argument("--emails", type=int, default=3)
+    parser.add_argument("--telefones", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="mantem as linhas sinteticas no final")
+    args = parser.parse_args()
+    if args.moradores > 1_000_000 or args.telefones > 100:
+        raise SystemExit("Use ate 1000000 moradores e 100 telefones por morador.")
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    service = MoradorService(db_manager)
+    try:
+        _insert(db_manager, args.moradores, args.emails, args.telefones)
+
+        per_cpf_queries = [
+            statements.get(name) for name in ("morador.list_moradores", "morador.list_emails", "morador.list_telefones")
+        ]
+        cases = (
+            ("join", (_JOINED_SQL,), lambda: db_manager.execute_read_query(_JOINED_SQL)),
+            ("por cpf", per_cpf_queries, service.list_moradores),
+        )
+
+        print(f"{args.moradores} moradores sinteticos com {args.emails} emails e {args.telefones} telefones cada")
+        for label, queries, fn in cases:
+            rows, cells = _read_volume(db_manager, *queries)
+            objects = fn()
+            body = dumps(objects)
+            latency = _median_ms(lambda: dumps(fn()), args.repeat)
+            print(
+                f"  {label:<8} linhas={rows:>8}  celulas={cells:>9}  objetos={len(objects):>7}  "
+                f"corpo={len(body) / 1024:>8.1f} KiB  tempo={latency:>7.1f} ms"
+            )
+    finally:
+        if not args.keep:
+            with db_manager.begin() as connection:
+                connection.execute(_DELETE_EMAILS_SQL, {"marker": _MARKER})
+                connection.execute(_DELETE_TELEFONES_SQL, {"marker": _MARKER})
+                connection.execute(_DELETE_MORADORES_SQL, {"marker": _MARKER})
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
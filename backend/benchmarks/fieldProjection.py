@@ -0,0 +1,100 @@
+"""Bytes enviados e tempo de consulta das listagens com e sem ``?fields=``.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.fieldProjection --repeat 5
+
+Para cada listagem compara a consulta completa com a projecao usada por uma
+tela tipica (``--fields`` substitui os campos de todas as listagens). Mede a
+mediana de ``--repeat`` execucoes da consulta (linhas ja lidas do driver) e o
+tamanho do corpo JSON gerado pelo mesmo caminho das rotas.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.rowSet import RowSet
+from ..routers.jsonResponses import dumps
+from ..routers.rowSerializer import row_set_json
+from ..service.avaliacaoService import AvaliacaoService
+from ..service.funcionarioService import FuncionarioService
+from ..service.moradorService import MoradorService
+from ..service.ocorrenciaService import OcorrenciaService
+from ..service.servicoService import ServicoService
+
+Fields = Optional[Sequence[str]]
+
+# listagem -> campos de uma tela tipica
+_SCREEN_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "funcionarios": ("cpf", "nome", "cargo_nome"),
+    "moradores": ("cpf", "nome"),
+    "ocorrencias": ("cod_oco", "tipo_nome", "data", "tipo_status"),
+    "avaliacoes": ("cod_aval", "servico_nome", "nota_serv", "nota_tempo"),
+    "servicos": ("cod_servico", "nome", "cod_ocorrencia"),
+}
+
+
+def _streamed(chunks) -> RowSet:
+    columns, rows = (), []
+    for chunk in chunks:
+        columns = chunk.columns
+        rows.extend(chunk.rows)
+    return RowSet(columns, rows)
+
+
+def _endpoints(db_manager: DatabaseManager) -> Dict[str, Tuple[Callable[[Fields], object], Callable[[object], bytes]]]:
+    funcionarios = FuncionarioService(db_manager)
+    moradores = MoradorService(db_manager)
+    ocorrencias = OcorrenciaService(db_manager)
+    avaliacoes = AvaliacaoService(db_manager)
+    servicos = ServicoService(db_manager)
+    return {
+        "funcionarios": (funcionarios.list_funcionario_rows, row_set_json),
+        "moradores": (moradores.list_moradores, dumps),
+        "ocorrencias": (lambda fields: _streamed(ocorrencias.stream_ocorrencias(fields)), row_set_json),
+        "avaliacoes": (lambda fields: _streamed(avaliacoes.stream_avaliacoes(fields)), row_set_json),
+        "servicos": (servicos.list_servicos, dumps),
+    }
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=sorted(_SCREEN_FIELDS), action="append")
+    parser.add_argument("--fields", help="campos separados por virgula, para todas as listagens")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    try:
+        endpoints = _endpoints(db_manager)
+        for endpoint in args.endpoint or sorted(_SCREEN_FIELDS):
+            query, encode = endpoints[endpoint]
+            fields = tuple(args.fields.split(",")) if args.fields else _SCREEN_FIELDS[endpoint]
+
+            print(f"/{endpoint}/?fields={','.join(fields)}")
+            for label, selected in (("completo", None), ("fields", fields)):
+                body = encode(query(selected))
+                latency = _median_ms(lambda: query(selected), args.repeat)
+                print(f"  {label:<9} consulta={latency:>9.1f} ms  corpo={len(body) / 1024:>10.1f} KiB")
+    finally:
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
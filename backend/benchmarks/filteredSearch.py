@@ -0,0 +1,143 @@
+"""Latencia da busca filtrada de ocorrencias conforme a tabela cresce.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.filteredSearch --sizes 10000 100000 1000000
+
+Para cada tamanho em ``--sizes`` a tabela OCORRENCIA recebe linhas sinteticas
+(marcadas em ``descr`` e removidas no final, exceto com ``--keep``) ate atingir
+o total; em seguida mede a mediana de ``--repeat`` execucoes de:
+
+* cada combinacao de filtros de ``OcorrenciaRepository.search_ocorrencias``, na
+  primeira pagina e em uma pagina do meio da tabela (cursor por chave);
+* ``navegador``: a lista completa filtrada em Python, como o frontend fazia.
+
+Com os indices de ``sql/gerarTabelas.sql`` a busca deve ficar estavel entre os
+tamanhos, enquanto o caminho do navegador cresce com a tabela.
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import text
+
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.statementRegistry import statements
+from ..service.ocorrenciaService import OcorrenciaService
+
+_MARKER = "benchmark filteredSearch"
+_STATUSES = ("NAO INICIADA", "EM ANDAMENTO", "FINALIZADA")
+_INSERT_BATCH_SIZE = 5000
+
+_COUNT_SQL = text("SELECT COUNT(*) FROM OCORRENCIA")
+_DELETE_SQL = text("DELETE FROM OCORRENCIA WHERE descr = :marker")
+_MIDDLE_KEY_SQL = text("SELECT data, cod_oco FROM OCORRENCIA ORDER BY data DESC, cod_oco DESC LIMIT 1 OFFSET :offset")
+
+
+def _references(db_manager: DatabaseManager) -> Dict[str, Any]:
+    tipos = db_manager.execute_read_query("SELECT cod_tipo, orgao_pub FROM TIPO_OCORRENCIA ORDER BY cod_tipo")
+    locais = db_manager.execute_read_query("SELECT cod_local, cidade, bairro FROM LOCALIDADE ORDER BY cod_local")
+    moradores = db_manager.execute_read_query("SELECT cpf FROM MORADOR ORDER BY cpf LIMIT 1")
+    if not tipos or not locais or not moradores:
+        raise SystemExit("O banco precisa de ao menos um TIPO_OCORRENCIA, uma LOCALIDADE e um MORADOR.")
+    return {"tipos": tipos, "locais": locais, "cpf": moradores[0]["cpf"]}
+
+
+def _cases(refs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    tipo = refs["tipos"][0]
+    local = refs["locais"][0]
+    return {
+        "tipo_status": {"tipo_status": "EM ANDAMENTO"},
+        "cod_tipo": {"cod_tipo": tipo["cod_tipo"]},
+        "bairro+cidade": {"bairro": local["bairro"], "cidade": local["cidade"]},
+        "periodo": {"data_inicio": "2023-03-01", "data_fim": "2023-03-31"},
+        "cpf_morador": {"cpf_morador": refs["cpf"]},
+        "orgao_pub+status": {"orgao_pub": tipo["orgao_pub"], "tipo_status": "FINALIZADA"},
+    }
+
+
+def _grow(db_manager: DatabaseManager, refs: Dict[str, Any], target: int) -> int:
+    current = db_manager.execute_read_rows(_COUNT_SQL).rows[0][0]
+    insert_sql = statements.get("ocorrencia.insert_ocorrencia")
+    tipos, locais = refs["tipos"], refs["locais"]
+    start = date(2020, 1, 1)
+
+    for offset in range(current, target, _INSERT_BATCH_SIZE):
+        batch = [
+            {
+                "cod_tipo": tipos[position % len(tipos)]["cod_tipo"],
+                "cpf_morador": refs["cpf"],
+                "cod_local": locais[position % len(locais)]["cod_local"],
+                "endereco": f"Endereco {position}",
+                "data": (start + timedelta(days=position % 1825)).isoformat(),
+                "tipo_status": _STATUSES[position % len(_STATUSES)],
+                "descr": _MARKER,
+            }
+            for position in range(offset, min(offset + _INSERT_BATCH_SIZE, target))
+        ]
+        with db_manager.begin() as connection:
+            connection.execute(insert_sql, batch)
+    return max(current, target)
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def _browser_filter(service: OcorrenciaService, status: str) -> List[Any]:
+    matches = []
+    for chunk in service.stream_ocorrencias():
+        position = chunk.columns.index("tipo_status")
+        matches.extend(row for row in chunk.rows if row[position] == status)
+    return matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="mantem as linhas sinteticas no final")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    service = OcorrenciaService(db_manager)
+    try:
+        refs = _references(db_manager)
+        cases = _cases(refs)
+        for size in sorted(args.sizes):
+            total = _grow(db_manager, refs, size)
+            middle = db_manager.execute_read_query(_MIDDLE_KEY_SQL, {"offset": total // 2})[0]
+            after = (str(middle["data"]), int(middle["cod_oco"]))
+
+            print(f"OCORRENCIA com {total} linhas (ms, pagina de {args.page_size})")
+            for label, filters in cases.items():
+                first = _median_ms(lambda: service.search_ocorrencias(filters, limit=args.page_size + 1), args.repeat)
+                deep = _median_ms(
+                    lambda: service.search_ocorrencias(filters, limit=args.page_size + 1, after=after),
+                    args.repeat,
+                )
+                print(f"  {label:<17} primeira={first:>8.2f}  meio={deep:>8.2f}")
+            browser = _median_ms(lambda: _browser_filter(service, "EM ANDAMENTO"), args.repeat)
+            print(f"  {'navegador':<17} lista completa + filtro={browser:>8.2f}")
+    finally:
+        if not args.keep:
+            with db_manager.begin() as connection:
+                connection.execute(_DELETE_SQL, {"marker": _MARKER})
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
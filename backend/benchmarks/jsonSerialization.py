@@ -0,0 +1,137 @@
+"""Tempo de serializacao das listagens por 10 mil linhas, antes e depois do orjson.
+
+Uso (a partir da raiz do repositorio, sem banco):
+
+    python -m backend.benchmarks.jsonSerialization --rows 50000 --repeat 5
+
+As linhas sao sinteticas, com os tipos devolvidos pelo driver (``date``,
+``datetime`` e ``Decimal`` em ``nota_media_servico``). Caminhos comparados:
+
+* ``jsonable_encoder``: ``jsonable_encoder`` + ``json.dumps``, o que o FastAPI
+  fazia com as listas de dicionarios devolvidas pelos handlers;
+* ``orjson``: ``OrjsonResponse.render`` direto sobre a lista de dicionarios;
+* ``orjson rowset``: ``row_set_json`` sobre o ``RowSet`` (colunas + tuplas).
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from ..persistence.rowSet import RowSet
+from ..routers.jsonResponses import OrjsonResponse
+from ..routers.rowSerializer import row_set_json
+
+_PER_ROWS = 10_000
+
+
+def _ocorrencia(position: int) -> Dict[str, Any]:
+    return {
+        "cod_oco": position,
+        "cod_tipo": position % 7,
+        "tipo_nome": "Buraco na via",
+        "tipo_descr": "Buraco ou afundamento no asfalto",
+        "cod_local": position % 50,
+        "estado": "DF",
+        "cidade": "Brasilia",
+        "bairro": "Asa Norte",
+        "endereco": f"SQN {position % 400} Bloco {position % 11}",
+        "cpf_morador": f"{position:011d}",
+        "morador_nome": "Maria da Silva",
+        "data": date(2024, 1, 1) + timedelta(days=position % 365),
+        "tipo_status": "EM ANDAMENTO",
+        "descr": "Ocorrencia registrada pelo aplicativo",
+    }
+
+
+def _avaliacao(position: int) -> Dict[str, Any]:
+    inicio = datetime(2024, 1, 1, 8) + timedelta(hours=position % 5000)
+    return {
+        "cod_aval": position,
+        "cod_ocorrencia": position,
+        "cod_servico": position % 300,
+        "cpf_morador": f"{position:011d}",
+        "nota_serv": position % 5 + 1,
+        "nota_tempo": position % 4 + 1,
+        "opiniao": "Servico realizado dentro do prazo",
+        "ocorrencia_status": "CONCLUIDA",
+        "servico_nome": "Tapa-buraco",
+        "orgao_nome": "Secretaria de Obras",
+        "morador_nome": "Maria da Silva",
+        "servico_descr": "Recapeamento parcial",
+        "data_ocorrencia": inicio.date(),
+        "inicio_servico": inicio,
+        "fim_servico": inicio + timedelta(days=2),
+    }
+
+
+def _servico(position: int) -> Dict[str, Any]:
+    return {
+        "cod_servico": position,
+        "cod_orgao": position % 20,
+        "orgao_nome": "Secretaria de Obras",
+        "cod_ocorrencia": position,
+        "nome": "Tapa-buraco",
+        "descr": "Recapeamento parcial",
+        "inicio_servico": date(2024, 1, 1) + timedelta(days=position % 365),
+        "fim_servico": date(2024, 1, 3) + timedelta(days=position % 365),
+        "nota_media_servico": Decimal(position % 500) / 100,
+    }
+
+
+_SHAPES: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "ocorrencias": _ocorrencia,
+    "avaliacoes": _avaliacao,
+    "servicos": _servico,
+}
+
+
+def _before(rows: List[Dict[str, Any]], _row_set: RowSet) -> bytes:
+    return json.dumps(
+        jsonable_encoder(rows),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _orjson(rows: List[Dict[str, Any]], _row_set: RowSet) -> bytes:
+    return OrjsonResponse(None).render(rows)
+
+
+def _orjson_row_set(_rows: List[Dict[str, Any]], row_set: RowSet) -> bytes:
+    return row_set_json(row_set)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shape", choices=sorted(_SHAPES), action="append")
+    parser.add_argument("--rows", type=int, default=_PER_ROWS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = (("jsonable_encoder", _before), ("orjson", _orjson), ("orjson rowset", _orjson_row_set))
+    for shape in args.shape or sorted(_SHAPES):
+        rows = [_SHAPES[shape](position) for position in range(args.rows)]
+        row_set = RowSet(tuple(rows[0]), [tuple(row.values()) for row in rows])
+        expected = json.loads(_before(rows, row_set))
+
+        print(f"/{shape}/ ({args.rows} linhas, ms por {_PER_ROWS} linhas)")
+        for label, path in paths:
+            if json.loads(path(rows, row_set)) != expected:
+                raise SystemExit(f"/{shape}/: saida de {label} diverge do jsonable_encoder")
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                path(rows, row_set)
+                timings.append(time.perf_counter() - started)
+            per_rows = statistics.median(timings) * 1000 * _PER_ROWS / args.rows
+            print(f"  {label:<17} {per_rows:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Vazao da gravacao de ocorrencias uma a uma e em lote.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.ocorrenciaBatch --items 2000 --chunk-sizes 100 500 1000
+
+Grava ``--items`` ocorrencias sinteticas (marcadas em ``descr`` e removidas no
+final, exceto com ``--keep``), cada uma com a localidade por nome, escolhida
+entre as ja cadastradas, como os orgaos parceiros enviam:
+
+* ``uma a uma``: ``OcorrenciaService.create_ocorrencia`` por item, como um
+  ``POST /ocorrencias/`` por ocorrencia (transacao, localidade, releitura);
+* ``lote``: ``OcorrenciaService.create_ocorrencias``, o caminho de
+  ``POST /ocorrencias/batch``, para cada tamanho de bloco em ``--chunk-sizes``.
+"""
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+from ..persistence.databaseManager import DatabaseManager
+from ..service.ocorrenciaService import OcorrenciaService
+
+_MARKER = "benchmark ocorrenciaBatch"
+
+_DELETE_SQL = text("DELETE FROM OCORRENCIA WHERE descr = :marker")
+
+
+def _items(db_manager: DatabaseManager, count: int) -> List[Dict[str, Any]]:
+    tipos = db_manager.execute_read_query("SELECT cod_tipo FROM TIPO_OCORRENCIA ORDER BY cod_tipo")
+    locais = db_manager.execute_read_query("SELECT estado, cidade, bairro FROM LOCALIDADE ORDER BY cod_local LIMIT 20")
+    moradores = db_manager.execute_read_query("SELECT cpf FROM MORADOR ORDER BY cpf LIMIT 1")
+    if not tipos or not locais or not moradores:
+        raise SystemExit("O banco precisa de ao menos um TIPO_OCORRENCIA, uma LOCALIDADE e um MORADOR.")
+
+    start = date(2024, 1, 1)
+    return [
+        {
+            "cod_tipo": tipos[position % len(tipos)]["cod_tipo"],
+            "cpf_morador": moradores[0]["cpf"],
+            "endereco": f"Endereco {position}",
+            "data": (start + timedelta(days=position % 365)).isoformat(),
+            "tipo_status": "NAO INICIADA",
+            "descr": _MARKER,
+            "cod_local": None,
+            "localidade": dict(locais[position % len(locais)]),
+        }
+        for position in range(count)
+    ]
+
+
+def _report(label: str, items: int, elapsed: float) -> None:
+    print(f"  {label:<18} {elapsed * 1000:>9.1f} ms  {items / elapsed:>9.0f} ocorrencias/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--keep", action="store_true", help="mantem as linhas sinteticas no final")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    service = OcorrenciaService(db_manager)
+    try:
+        items = _items(db_manager, args.items)
+        print(f"{args.items} ocorrencias")
+
+        started = time.perf_counter()
+        for item in items:
+            service.create_ocorrencia(**item)
+        _report("uma a uma", args.items, time.perf_counter() - started)
+
+        for chunk_size in args.chunk_sizes:
+            started = time.perf_counter()
+            results = service.create_ocorrencias(items, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - started
+            failed = sum(1 for result in results if "erro" in result)
+            if failed:
+                raise SystemExit(f"{failed} ocorrencias recusadas no lote de {chunk_size}")
+            _report(f"lote de {chunk_size}", args.items, elapsed)
+    finally:
+        if not args.keep:
+            with db_manager.begin() as connection:
+                connection.execute(_DELETE_SQL, {"marker": _MARKER})
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
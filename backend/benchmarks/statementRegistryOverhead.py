@@ -0,0 +1,107 @@
+"""Mede o custo por chamada removido pelo registro de instrucoes nos get_*_by_id.
+
+Uso (a partir da raiz do repositorio):
+
+    python -m backend.benchmarks.statementRegistryOverhead --iterations 20000
+
+Sem banco, compara montar ``text()`` a cada chamada (comportamento antigo) com
+reaproveitar o ``TextClause`` registrado, incluindo a geracao da chave de cache
+de compilacao. Com ``DATABASE_URL`` configurada e ``--database``, executa tambem
+cada consulta contra o banco pelos dois caminhos.
+"""
+import argparse
+import os
+import time
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from ..persistence import (  # noqa: F401 - registram as instrucoes
+    avaliacaoRepository,
+    cargoRepository,
+    funcionarioRepository,
+    moradorRepository,
+    ocorrenciaRepository,
+    orgaoPublicoRepository,
+    servicoRepository,
+    tipoOcorrenciaRepository,
+)
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.statementRegistry import statements
+
+# (instrucao por chave, parametro, listagem usada para descobrir uma chave existente)
+_LOOKUPS: List[Tuple[str, str, str]] = [
+    ("avaliacao.get_avaliacao_by_id", "cod_aval", "avaliacao.list_avaliacoes"),
+    ("cargo.get_cargo_by_id", "cod_cargo", "cargo.list_cargos"),
+    ("funcionario.get_funcionario_by_cpf", "cpf", "funcionario.list_funcionarios"),
+    ("morador.get_morador_by_cpf", "cpf", "morador.list_moradores"),
+    ("ocorrencia.get_ocorrencia_by_id", "cod_oco", "ocorrencia.list_ocorrencias"),
+    ("orgao_publico.get_orgao_by_id", "cod_orgao", "orgao_publico.list_orgaos"),
+    ("servico.get_servico_by_id", "cod_servico", "servico.list_servicos"),
+    ("tipo_ocorrencia.get_tipo_by_id", "cod_tipo", "tipo_ocorrencia.list_tipos"),
+]
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def _statement_overhead(iterations: int) -> None:
+    print(f"Preparo da instrucao ({iterations} chamadas, microssegundos por chamada)")
+    for name, _, _ in _LOOKUPS:
+        registered = statements.get(name)
+        raw_sql = registered.text
+
+        def _rebuild() -> object:
+            return text(raw_sql)._generate_cache_key()
+
+        def _reuse() -> object:
+            return registered._generate_cache_key()
+
+        before = _per_call_us(_rebuild, iterations)
+        after = _per_call_us(_reuse, iterations)
+        print(f"  {name:<38} text()={before:>7.2f}  registrado={after:>7.2f}  economia={before - after:>7.2f}")
+
+
+def _database_round_trips(database_url: str, iterations: int) -> None:
+    db_manager = DatabaseManager(database_url, echo=False)
+    print(f"Execucao contra o banco ({iterations} chamadas, microssegundos por chamada)")
+    try:
+        for name, param, list_name in _LOOKUPS:
+            rows = db_manager.execute_read_query(statements.get(list_name))
+            if not rows:
+                print(f"  {name:<38} sem linhas para consultar")
+                continue
+
+            registered: TextClause = statements.get(name)
+            params = {param: rows[0][param]}
+            raw_sql = registered.text
+            before = _per_call_us(lambda: db_manager.execute_read_query(raw_sql, params), iterations)
+            after = _per_call_us(lambda: db_manager.execute_read_query(registered, params), iterations)
+            print(f"  {name:<38} text()={before:>8.1f}  registrado={after:>8.1f}  economia={before - after:>7.1f}")
+    finally:
+        db_manager.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--database", action="store_true", help="executa tambem contra DATABASE_URL")
+    parser.add_argument("--database-iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    _statement_overhead(args.iterations)
+
+    if args.database:
+        database_url = os.getenv("DATABASE_URL")
+        if not database_url:
+            raise SystemExit("DATABASE_URL env nao configurada.")
+        _database_round_trips(database_url, args.database_iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Conexoes retiradas dos pools por escrita, com e sem a releitura separada.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.benchmarks.writeCheckouts --items 200
+
+Para cada operacao (criar e atualizar ocorrencias, moradores e cargos), grava
+``--items`` linhas sinteticas (marcadas e removidas no final, exceto com
+``--keep``) de duas formas:
+
+* ``releitura``: o caminho antigo dos servicos, a escrita seguida de
+  ``get_*`` numa segunda conexao, dentro de ``pin_reads_to_primary()``;
+* ``na transacao``: ``create_*``/``update_*`` dos servicos, que devolvem a linha
+  lida na propria transacao da escrita.
+
+Mostra os checkouts por operacao (somando o pool de escrita e os de leitura,
+de ``get_pool_status``) e a mediana do tempo por operacao.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+
+from ..persistence.databaseManager import DatabaseManager
+from ..persistence.replicaRouter import pin_reads_to_primary
+from ..service.cargoService import CargoService
+from ..service.moradorService import MoradorService
+from ..service.ocorrenciaService import OcorrenciaService
+
+_MARKER = "benchmark writeCheckouts"
+
+_REFERENCES_SQL = text(
+    "SELECT (SELECT cod_tipo FROM TIPO_OCORRENCIA ORDER BY cod_tipo LIMIT 1) AS cod_tipo, "
+    "(SELECT cod_local FROM LOCALIDADE ORDER BY cod_local LIMIT 1) AS cod_local, "
+    "(SELECT cpf FROM MORADOR ORDER BY cpf LIMIT 1) AS cpf"
+)
+_DELETE_SQL = (
+    text("DELETE FROM OCORRENCIA WHERE descr = :marker"),
+    text("DELETE FROM EMAIL WHERE cpf_morador IN (SELECT cpf FROM MORADOR WHERE endereco = :marker)"),
+    text("DELETE FROM TELEFONE WHERE cpf_morador IN (SELECT cpf FROM MORADOR WHERE endereco = :marker)"),
+    text("DELETE FROM MORADOR WHERE endereco = :marker"),
+    text("DELETE FROM CARGO WHERE descricao = :marker"),
+)
+
+# (rotulo, escrita pelo servico, releitura feita pelo caminho antigo)
+Case = Tuple[str, Callable[[int], Any], Callable[[int, Any], Any]]
+
+
+def _checkouts(db_manager: DatabaseManager) -> int:
+    status = db_manager.get_pool_status()
+    return status["primary"]["checkouts"] + sum(pool["checkouts"] for pool in status["read"].values())
+
+
+def _cases(db_manager: DatabaseManager, pass_number: int) -> List[Case]:
+    references = db_manager.execute_read_query(_REFERENCES_SQL)[0]
+    if None in references.values():
+        raise SystemExit("O banco precisa de ao menos um TIPO_OCORRENCIA, uma LOCALIDADE e um MORADOR.")
+
+    ocorrencias = OcorrenciaService(db_manager)
+    moradores = MoradorService(db_manager)
+    cargos = CargoService(db_manager)
+    ids: Dict[str, List[int]] = {"ocorrencia": [], "cargo": []}
+
+    def cpf(position: int) -> str:
+        return f"6{pass_number}{position:09d}"
+
+    def create_ocorrencia(position: int) -> Any:
+        created = ocorrencias.create_ocorrencia(
+            cod_tipo=references["cod_tipo"],
+            cpf_morador=references["cpf"],
+            endereco=f"Endereco {position}",
+            data="2024-01-01",
+            tipo_status="NAO INICIADA",
+            descr=_MARKER,
+            cod_local=references["cod_local"],
+        )
+        ids["ocorrencia"].append(created["cod_oco"])
+        return created
+
+    def create_morador(position: int) -> Any:
+        return moradores.create_morador(
+            cpf=cpf(position),
+            nome=f"Morador {position}",
+            endereco=_MARKER,
+            data_nasc="1990-01-01",
+            senha="x",
+            cod_local=references["cod_local"],
+            email=f"{cpf(position)}@example.com",
+            telefone=f"7{pass_number}{position:07d}",
+            ddd="61",
+        )
+
+    def create_cargo(position: int) -> Any:
+        created = cargos.create_cargo(nome=f"Cargo {pass_number}.{position}", descricao=_MARKER)
+        ids["cargo"].append(created["cod_cargo"])
+        return created
+
+    return [
+        (
+            "criar ocorrencia",
+            create_ocorrencia,
+            lambda _, created: ocorrencias.get_ocorrencia_by_id(created["cod_oco"]),
+        ),
+        (
+            "atualizar ocorrencia",
+            lambda position: ocorrencias.update_ocorrencia(ids["ocorrencia"][position], tipo_status="EM ANDAMENTO"),
+            lambda position, _: ocorrencias.get_ocorrencia_by_id(ids["ocorrencia"][position]),
+        ),
+        (
+            "criar morador",
+            create_morador,
+            lambda position, _: moradores.get_morador_by_cpf(cpf(position)),
+        ),
+        (
+            "atualizar morador",
+            lambda position: moradores.update_morador(cpf(position), nome=f"Morador {position}b"),
+            lambda position, _: moradores.get_morador_by_cpf(cpf(position)),
+        ),
+        (
+            "criar cargo",
+            create_cargo,
+            lambda _, created: cargos.get_cargo_by_id(created["cod_cargo"]),
+        ),
+        (
+            "atualizar cargo",
+            lambda position: cargos.update_cargo(ids["cargo"][position], nome=f"Cargo {pass_number}.{position}b"),
+            lambda position, _: cargos.get_cargo_by_id(ids["cargo"][position]),
+        ),
+    ]
+
+
+def _run(db_manager: DatabaseManager, items: int, write: Callable[[int], Any], reread: Any) -> Tuple[float, float]:
+    """Checkouts e mediana em ms por operacao; ``reread`` None dispensa a releitura."""
+    timings = []
+    before = _checkouts(db_manager)
+    for position in range(items):
+        started = time.perf_counter()
+        result = write(position)
+        if reread is not None:
+            with pin_reads_to_primary():
+                reread(position, result)
+        timings.append(time.perf_counter() - started)
+    return (_checkouts(db_manager) - before) / items, statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="mantem as linhas sinteticas no final")
+    args = parser.parse_args()
+    if args.items > 1_000_000:
+        raise SystemExit("Use ate 1000000 itens.")
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    try:
+        legacy = _cases(db_manager, 1)
+        current = _cases(db_manager, 2)
+        print(f"{args.items} operacoes de cada tipo")
+        print(f"  {'':<22} {'releitura':>22}  {'na transacao':>22}")
+        for (label, legacy_write, reread), (_, write, _) in zip(legacy, current):
+            legacy_checkouts, legacy_ms = _run(db_manager, args.items, legacy_write, reread)
+            checkouts, elapsed_ms = _run(db_manager, args.items, write, None)
+            print(
+                f"  {label:<22} {legacy_checkouts:>5.1f} checkouts {legacy_ms:>6.2f} ms  "
+                f"{checkouts:>5.1f} checkouts {elapsed_ms:>6.2f} ms"
+            )
+    finally:
+        if not args.keep:
+            with db_manager.begin() as connection:
+                for statement in _DELETE_SQL:
+                    connection.execute(statement, {"marker": _MARKER})
+        db_manager.dispose()
+
+
+if __name__ == "__main__":
+    main()
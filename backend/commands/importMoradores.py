@@ -0,0 +1,75 @@
+"""Importa moradores de um arquivo CSV ou NDJSON.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.commands.importMoradores moradores.csv --chunk-size 1000
+
+Colunas (ou chaves, no NDJSON): ``cpf``, ``nome``, ``endereco``, ``data_nasc``
+(AAAA-MM-DD), ``senha``, ``cod_local`` ou ``estado``/``cidade``/``bairro``, e
+opcionalmente ``email``, ``telefone`` e ``ddd``. No NDJSON a localidade tambem
+pode vir aninhada em ``localidade``.
+
+O arquivo e lido e gravado em blocos de ``--chunk-size`` linhas, cada um na sua
+transacao, com memoria limitada qualquer que seja o tamanho do arquivo. As
+linhas recusadas vao para ``--rejeitos`` (NDJSON com ``linha``, ``motivo`` e
+``registro``; padrao ``<arquivo>.rejeitos.ndjson``) e o progresso e mostrado a
+cada bloco. Linhas ja importadas sao recusadas por CPF repetido, entao o
+comando pode ser executado de novo apos uma interrupcao.
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from ..persistence.databaseManager import DatabaseManager
+from ..routers.jsonResponses import dumps
+from ..service.moradorImport import IMPORT_CHUNK_SIZE, IMPORT_READERS, ImportRejection, import_event
+from ..service.moradorService import MoradorService
+
+_SUFFIX_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo", type=Path)
+    parser.add_argument("--formato", choices=sorted(IMPORT_READERS), help="padrao: pela extensao do arquivo")
+    parser.add_argument("--rejeitos", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    formato = args.formato or _SUFFIX_FORMATS.get(args.arquivo.suffix.lower())
+    if formato is None:
+        raise SystemExit("Informe --formato (csv ou ndjson) para esta extensao.")
+    rejeitos = args.rejeitos or args.arquivo.with_name(f"{args.arquivo.name}.rejeitos.ndjson")
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    service = MoradorService(db_manager)
+    started = time.perf_counter()
+    progress = None
+    try:
+        with args.arquivo.open(encoding="utf-8-sig", newline="") as source, rejeitos.open("wb") as rejects:
+            records = IMPORT_READERS[formato](source)
+            for event in service.import_moradores(records, chunk_size=args.chunk_size):
+                if isinstance(event, ImportRejection):
+                    rejects.write(dumps(import_event(event)) + b"\n")
+                    continue
+                progress = event
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{progress.lidas} lidas, {progress.importadas} importadas, {progress.rejeitadas} recusadas "
+                    f"({progress.lidas / elapsed if elapsed else 0:.0f} linhas/s)"
+                )
+    finally:
+        db_manager.dispose()
+
+    if progress is not None and progress.rejeitadas:
+        print(f"Linhas recusadas em {rejeitos}")
+    print(f"Concluido em {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Move as imagens das colunas ``imagem`` de FOTO e FOTO_MINIATURA para o BlobStore.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.commands.migrateFotoBlobs --batch-size 200
+
+Em bancos criados antes do BlobStore, aplique antes (MySQL):
+
+    ALTER TABLE FOTO ADD COLUMN content_type VARCHAR(50), ADD COLUMN tamanho_bytes INT;
+    ALTER TABLE FOTO_MINIATURA ADD COLUMN hash CHAR(64), ADD COLUMN content_type VARCHAR(50),
+        MODIFY imagem MEDIUMBLOB NULL;
+
+(incluindo ``ADD COLUMN hash CHAR(64)`` em FOTO se a coluna ainda nao existir).
+
+Cada lote e gravado em ``BLOB_STORE_DIR`` e confirmado numa transacao que
+preenche ``hash``, ``content_type`` e ``tamanho_bytes`` e zera ``imagem``. O
+comando pode ser interrompido e executado de novo; ao final as colunas
+``imagem`` podem ser removidas (``ALTER TABLE ... DROP COLUMN imagem``).
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import text
+
+from ..persistence.blobStore import BlobStore, blob_store_from_env
+from ..persistence.databaseManager import DatabaseManager
+from ..service.funcionarioService import foto_media_type
+
+_SELECT_FOTOS_SQL = text(
+    "SELECT cod_foto, imagem FROM FOTO "
+    "WHERE imagem IS NOT NULL AND cod_foto > :after "
+    "ORDER BY cod_foto LIMIT :limit"
+)
+_UPDATE_FOTO_SQL = text(
+    "UPDATE FOTO SET hash = :hash, content_type = :content_type, tamanho_bytes = :tamanho_bytes, imagem = NULL "
+    "WHERE cod_foto = :cod_foto"
+)
+# As linhas migradas saem do filtro, entao cada lote recomeca do inicio.
+_SELECT_MINIATURAS_SQL = text(
+    "SELECT cpf_func, tamanho, imagem FROM FOTO_MINIATURA "
+    "WHERE imagem IS NOT NULL "
+    "ORDER BY cpf_func, tamanho LIMIT :limit"
+)
+_UPDATE_MINIATURA_SQL = text(
+    "UPDATE FOTO_MINIATURA SET hash = :hash, content_type = :content_type, imagem = NULL "
+    "WHERE cpf_func = :cpf_func AND tamanho = :tamanho"
+)
+
+
+def _migrate_fotos(db_manager: DatabaseManager, blob_store: BlobStore, batch_size: int) -> int:
+    moved, after = 0, 0
+    while True:
+        rows = db_manager.execute_read_query(_SELECT_FOTOS_SQL, {"after": after, "limit": batch_size})
+        if not rows:
+            return moved
+
+        updates = []
+        for row in rows:
+            imagem = bytes(row["imagem"])
+            updates.append(
+                {
+                    "cod_foto": row["cod_foto"],
+                    "hash": blob_store.put(imagem),
+                    "content_type": foto_media_type(imagem),
+                    "tamanho_bytes": len(imagem),
+                }
+            )
+        with db_manager.begin() as connection:
+            connection.execute(_UPDATE_FOTO_SQL, updates)
+
+        moved += len(rows)
+        after = rows[-1]["cod_foto"]
+        print(f"FOTO: {moved} imagens movidas (ate cod_foto {after})")
+
+
+def _migrate_miniaturas(db_manager: DatabaseManager, blob_store: BlobStore, batch_size: int) -> int:
+    moved = 0
+    while True:
+        rows = db_manager.execute_read_query(_SELECT_MINIATURAS_SQL, {"limit": batch_size})
+        if not rows:
+            return moved
+
+        updates = []
+        for row in rows:
+            imagem = bytes(row["imagem"])
+            updates.append(
+                {
+                    "cpf_func": row["cpf_func"],
+                    "tamanho": row["tamanho"],
+                    "hash": blob_store.put(imagem),
+                    "content_type": foto_media_type(imagem),
+                }
+            )
+        with db_manager.begin() as connection:
+            connection.execute(_UPDATE_MINIATURA_SQL, updates)
+
+        moved += len(rows)
+        print(f"FOTO_MINIATURA: {moved} imagens movidas")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--skip-miniaturas", action="store_true", help="migra apenas a tabela FOTO")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    blob_store = blob_store_from_env()
+    started = time.perf_counter()
+    try:
+        fotos = _migrate_fotos(db_manager, blob_store, args.batch_size)
+        miniaturas = 0 if args.skip_miniaturas else _migrate_miniaturas(db_manager, blob_store, args.batch_size)
+    finally:
+        db_manager.dispose()
+    print(f"{fotos} fotos e {miniaturas} miniaturas movidas em {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Reconstroi os agregados de nota de SERVICO a partir de AVALIACAO.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.commands.rebuildNotasServico --batch-size 500
+
+Os gatilhos de AVALIACAO (``sql/funcoes.sql``) mantem ``soma_notas_servico``
+(soma de ``nota_serv + nota_tempo``), ``qtd_avaliacoes_servico`` e a
+``nota_media_servico`` derivada delas pela diferenca de cada escrita. Este
+comando recalcula os tres com um ``GROUP BY`` por lote de servicos, para a
+carga inicial e para corrigir divergencias (avaliacoes gravadas com os
+gatilhos desativados, remocoes em cascata, que nao disparam gatilhos).
+
+Em bancos criados antes desses campos, aplique antes (MySQL):
+
+    ALTER TABLE SERVICO ADD COLUMN soma_notas_servico INT NOT NULL DEFAULT 0,
+        ADD COLUMN qtd_avaliacoes_servico INT NOT NULL DEFAULT 0;
+
+recrie os gatilhos de ``sql/funcoes.sql`` e execute o comando.
+
+Cada lote trava as suas linhas de SERVICO (``FOR UPDATE``) antes de somar as
+avaliacoes, entao avaliacoes gravadas durante a reconstrucao esperam o lote e
+sao somadas depois dele pelos gatilhos. O comando pode ser executado a
+qualquer momento e mostra quantos servicos estavam divergentes.
+"""
+import argparse
+import os
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Numeric, bindparam, text
+
+from ..persistence.databaseManager import DatabaseManager
+
+_LOCK_SUFFIXES = {
+    "mysql": " FOR UPDATE",
+    "mariadb": " FOR UPDATE",
+}
+
+_SELECT_SERVICOS_SQL = (
+    "SELECT cod_servico, soma_notas_servico, qtd_avaliacoes_servico, nota_media_servico FROM SERVICO "
+    "WHERE cod_servico > :after ORDER BY cod_servico LIMIT :limit"
+)
+_SELECT_AGREGADOS_SQL = text(
+    "SELECT cod_servico, SUM(nota_serv + nota_tempo) AS soma, COUNT(*) AS qtd FROM AVALIACAO "
+    "WHERE cod_servico IN :cod_servicos GROUP BY cod_servico"
+).bindparams(bindparam("cod_servicos", expanding=True))
+_UPDATE_SERVICO_SQL = text(
+    "UPDATE SERVICO SET soma_notas_servico = :soma, qtd_avaliacoes_servico = :qtd, nota_media_servico = :media "
+    "WHERE cod_servico = :cod_servico"
+).bindparams(bindparam("media", type_=Numeric(4, 2)))
+
+_CENTESIMOS = Decimal("0.01")
+
+
+def _media(soma: int, qtd: int) -> Optional[Decimal]:
+    """Mesmo arredondamento do ``DECIMAL(4,2)`` de ``nota_media_servico``."""
+    if not qtd:
+        return None
+    return (Decimal(soma) / (2 * qtd)).quantize(_CENTESIMOS, rounding=ROUND_HALF_UP)
+
+
+def _rebuild_batch(db_manager: DatabaseManager, after: int, batch_size: int) -> Tuple[int, int, int]:
+    """(servicos lidos, servicos corrigidos, ultimo cod_servico) de um lote."""
+    with db_manager.begin() as connection:
+        lock = _LOCK_SUFFIXES.get(connection.dialect.name, "")
+        servicos = connection.execute(
+            text(_SELECT_SERVICOS_SQL + lock), {"after": after, "limit": batch_size}
+        ).mappings().all()
+        if not servicos:
+            return 0, 0, after
+
+        cod_servicos = [servico["cod_servico"] for servico in servicos]
+        agregados: Dict[int, Any] = {
+            row.cod_servico: row for row in connection.execute(_SELECT_AGREGADOS_SQL, {"cod_servicos": cod_servicos})
+        }
+
+        updates = []
+        for servico in servicos:
+            agregado = agregados.get(servico["cod_servico"])
+            soma = int(agregado.soma) if agregado is not None else 0
+            qtd = int(agregado.qtd) if agregado is not None else 0
+            media = _media(soma, qtd)
+            atual = servico["nota_media_servico"]
+            if (
+                servico["soma_notas_servico"] != soma
+                or servico["qtd_avaliacoes_servico"] != qtd
+                or (None if atual is None else Decimal(str(atual)).quantize(_CENTESIMOS)) != media
+            ):
+                updates.append({"cod_servico": servico["cod_servico"], "soma": soma, "qtd": qtd, "media": media})
+        if updates:
+            connection.execute(_UPDATE_SERVICO_SQL, updates)
+    return len(servicos), len(updates), cod_servicos[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    started = time.perf_counter()
+    lidos = corrigidos = after = 0
+    try:
+        while True:
+            count, fixed, after = _rebuild_batch(db_manager, after, args.batch_size)
+            if not count:
+                break
+            lidos += count
+            corrigidos += fixed
+            print(f"{lidos} servicos conferidos, {corrigidos} corrigidos (ate cod_servico {after})")
+    finally:
+        db_manager.dispose()
+    print(f"{lidos} servicos conferidos e {corrigidos} corrigidos em {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
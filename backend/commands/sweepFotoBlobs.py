@@ -0,0 +1,70 @@
+"""Remove do BlobStore as imagens que nenhuma linha de FOTO ou FOTO_MINIATURA referencia.
+
+Uso (a partir da raiz do repositorio, com DATABASE_URL configurada):
+
+    python -m backend.commands.sweepFotoBlobs --min-age-minutes 60
+
+O servico de funcionarios grava a foto e as miniaturas em ``BLOB_STORE_DIR``
+antes da transacao que as registra. Se a transacao falha, ou quando a foto e
+trocada ou o funcionario removido, os arquivos ficam sem referencia; conteudos
+iguais compartilham o arquivo, entao so este comando decide o que apagar.
+
+So sao removidos arquivos gravados ha mais de ``--min-age-minutes`` (``put``
+renova a data de um conteudo ja existente), o que preserva as imagens de
+cadastros cuja transacao ainda nao terminou. Com ``--dry-run`` apenas conta os
+orfaos. O comando pode ser executado a qualquer momento, inclusive depois de
+``migrateFotoBlobs``.
+"""
+import argparse
+import os
+import time
+from typing import Set
+
+from sqlalchemy import text
+
+from ..persistence.blobStore import blob_store_from_env
+from ..persistence.databaseManager import DatabaseManager
+
+_SELECT_HASHES_SQL = text(
+    "SELECT hash FROM FOTO WHERE hash IS NOT NULL "
+    "UNION SELECT hash FROM FOTO_MINIATURA WHERE hash IS NOT NULL"
+)
+
+
+def _referenced(db_manager: DatabaseManager) -> Set[str]:
+    return {row["hash"].strip() for row in db_manager.execute_read_query(_SELECT_HASHES_SQL)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-age-minutes", type=float, default=60)
+    parser.add_argument("--dry-run", action="store_true", help="apenas conta os arquivos sem referencia")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL env nao configurada.")
+
+    db_manager = DatabaseManager(database_url, echo=False)
+    blob_store = blob_store_from_env()
+    started = time.perf_counter()
+    # O corte vem antes da leitura das referencias: uma imagem registrada depois
+    # dela foi gravada (ou renovada por ``put``) depois do corte e nao e apagada.
+    older_than = time.time() - args.min_age_minutes * 60
+    try:
+        referenced = _referenced(db_manager)
+    finally:
+        db_manager.dispose()
+
+    orfaos = [key for key in blob_store.keys(older_than) if key not in referenced]
+    removidos = 0
+    if not args.dry_run:
+        removidos = sum(blob_store.delete(key, older_than) for key in orfaos)
+    print(
+        f"{len(referenced)} imagens referenciadas, {len(orfaos)} sem referencia, "
+        f"{removidos} removidas em {time.perf_counter() - started:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import os
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, Dict
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -14,7 +16,9 @@ load_dotenv(dotenv_path=BASE_DIR / ".env", override=False)
 
 if __package__:
     from .routers import (
+        adminRouter,
         loginRouter,
+        metricsRouter,
         cargosRouter,
         funcionariosRouter,
         moradoresRouter,
@@ -24,21 +28,28 @@ if __package__:
         servicosRouter,
         avaliacoesRouter,
     )
-    from .persistence.databaseManager import DatabaseManager
-    from .service.funcionarioService import FuncionarioService
-    from .service.moradorService import MoradorService
-    from .service.ocorrenciaService import OcorrenciaService
-    from .service.tipoOcorrenciaService import TipoOcorrenciaService
-    from .service.orgaoPublicoService import OrgaoPublicoService
-    from .service.servicoService import ServicoService
-    from .service.avaliacaoService import AvaliacaoService
-    from .service.cargoService import CargoService
+    from .persistence.asyncDatabaseManager import AsyncDatabaseManager
+    from .persistence.blobStore import blob_store_from_env
+    from .persistence.poolStatistics import track_request_round_trips
+    from .persistence.slowQueryLog import request_context
+    from .routers.jsonResponses import OrjsonResponse
+    from .service.funcionarioService import AsyncFuncionarioService
+    from .service.moradorService import AsyncMoradorService
+    from .service.ocorrenciaService import AsyncOcorrenciaService
+    from .service.tipoOcorrenciaService import AsyncTipoOcorrenciaService
+    from .service.orgaoPublicoService import AsyncOrgaoPublicoService
+    from .service.servicoService import AsyncServicoService
+    from .service.avaliacaoService import AsyncAvaliacaoService
+    from .service.cargoService import AsyncCargoService
+    from .service.thumbnailPool import ThumbnailPool
 else:
     import sys
 
     sys.path.append(str(BASE_DIR.parent))
     from backend.routers import (
+        adminRouter,
         loginRouter,
+        metricsRouter,
         cargosRouter,
         funcionariosRouter,
         moradoresRouter,
@@ -48,15 +59,76 @@ else:
         servicosRouter,
         avaliacoesRouter,
     )
-    from backend.persistence.databaseManager import DatabaseManager
-    from backend.service.funcionarioService import FuncionarioService
-    from backend.service.moradorService import MoradorService
-    from backend.service.ocorrenciaService import OcorrenciaService
-    from backend.service.tipoOcorrenciaService import TipoOcorrenciaService
-    from backend.service.orgaoPublicoService import OrgaoPublicoService
-    from backend.service.servicoService import ServicoService
-    from backend.service.avaliacaoService import AvaliacaoService
-    from backend.service.cargoService import CargoService
+    from backend.persistence.asyncDatabaseManager import AsyncDatabaseManager
+    from backend.persistence.blobStore import blob_store_from_env
+    from backend.persistence.poolStatistics import track_request_round_trips
+    from backend.persistence.slowQueryLog import request_context
+    from backend.routers.jsonResponses import OrjsonResponse
+    from backend.service.funcionarioService import AsyncFuncionarioService
+    from backend.service.moradorService import AsyncMoradorService
+    from backend.service.ocorrenciaService import AsyncOcorrenciaService
+    from backend.service.tipoOcorrenciaService import AsyncTipoOcorrenciaService
+    from backend.service.orgaoPublicoService import AsyncOrgaoPublicoService
+    from backend.service.servicoService import AsyncServicoService
+    from backend.service.avaliacaoService import AsyncAvaliacaoService
+    from backend.service.cargoService import AsyncCargoService
+    from backend.service.thumbnailPool import ThumbnailPool
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} env deve ser um inteiro.") from exc
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} env deve ser um numero.") from exc
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _pool_settings_from_env() -> Dict[str, Any]:
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 10),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 20),
+        "pool_timeout": _env_float("DB_POOL_TIMEOUT", 10.0),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_use_lifo": _env_bool("DB_POOL_USE_LIFO", True),
+    }
+
+
+def _replica_settings_from_env() -> Dict[str, Any]:
+    replica_urls = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+    return {
+        "replica_urls": replica_urls,
+        "replica_balancing": os.getenv("DB_REPLICA_BALANCING", "round_robin").strip() or "round_robin",
+        "read_your_writes": _env_bool("DB_READ_YOUR_WRITES", True),
+    }
+
+
+def _slow_query_settings_from_env() -> Dict[str, Any]:
+    threshold_ms = _env_float("DB_SLOW_QUERY_MS", 500.0)
+    return {
+        "slow_query_threshold": threshold_ms / 1000 if threshold_ms >= 0 else None,
+        "slow_query_capacity": _env_int("DB_SLOW_QUERY_LOG_SIZE", 100),
+        "explain_slow_queries": _env_bool("DB_SLOW_QUERY_EXPLAIN", True),
+    }
 
 
 @asynccontextmanager
@@ -65,36 +137,75 @@ async def lifespan(_: FastAPI):
     if not database_url:
         raise RuntimeError("DATABASE_URL env nao configurada.")
 
-    db_manager = DatabaseManager(database_url=database_url, echo=False)
-    funcionario_service = FuncionarioService(db_manager)
-    morador_service = MoradorService(db_manager)
-    cargo_service = CargoService(db_manager)
+    db_manager = AsyncDatabaseManager(
+        database_url=database_url,
+        echo=False,
+        **_pool_settings_from_env(),
+        **_replica_settings_from_env(),
+        **_slow_query_settings_from_env(),
+    )
+    thumbnail_pool = ThumbnailPool(max_workers=_env_int("THUMBNAIL_WORKERS", 2))
+    funcionario_service = AsyncFuncionarioService(db_manager, thumbnail_pool, blob_store_from_env())
+    morador_service = AsyncMoradorService(db_manager)
+    cargo_service = AsyncCargoService(db_manager)
 
     funcionariosRouter.set_funcionario_service(funcionario_service)
     moradoresRouter.set_morador_service(morador_service)
     cargosRouter.set_cargo_service(cargo_service)
     loginRouter.set_login_services(morador_service, funcionario_service)
-    ocorrenciasRouter.set_ocorrencia_service(OcorrenciaService(db_manager))
-    tiposOcorrenciaRouter.set_tipos_ocorrencia_service(TipoOcorrenciaService(db_manager))
-    orgaosPublicosRouter.set_orgao_publico_service(OrgaoPublicoService(db_manager))
-    avaliacoesRouter.set_avaliacao_service(AvaliacaoService(db_manager))
-    servicosRouter.set_servico_service(ServicoService(db_manager))
+    ocorrenciasRouter.set_ocorrencia_service(AsyncOcorrenciaService(db_manager))
+    tiposOcorrenciaRouter.set_tipos_ocorrencia_service(AsyncTipoOcorrenciaService(db_manager))
+    orgaosPublicosRouter.set_orgao_publico_service(AsyncOrgaoPublicoService(db_manager))
+    avaliacoesRouter.set_avaliacao_service(AsyncAvaliacaoService(db_manager))
+    servicosRouter.set_servico_service(AsyncServicoService(db_manager))
+    adminRouter.set_database_manager(db_manager)
+    metricsRouter.set_database_manager(db_manager)
 
     try:
         yield
     finally:
-        db_manager.engine.dispose()
+        thumbnail_pool.shutdown()
+        await db_manager.dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=OrjsonResponse)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+
+@app.middleware("http")
+async def contar_idas_ao_banco_economizadas(request: Request, call_next):
+    with track_request_round_trips() as round_trips_saved:
+        response = await call_next(request)
+    # Leituras feitas durante o envio de respostas em streaming ficam so no total de /admin/pool.
+    response.headers["X-DB-Round-Trips-Saved"] = str(round_trips_saved[0])
+    return response
+
+
+@app.middleware("http")
+async def medir_latencia_por_rota(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        with request_context(request.scope):
+            response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metricsRouter.route_metrics.observe(
+            request.method,
+            metricsRouter.route_template(request),
+            status_code,
+            time.perf_counter() - started,
+        )
+
+
 app.include_router(loginRouter.router)
 app.include_router(cargosRouter.router)
 app.include_router(funcionariosRouter.router)
@@ -104,6 +215,8 @@ app.include_router(tiposOcorrenciaRouter.router)
 app.include_router(orgaosPublicosRouter.router)
 app.include_router(servicosRouter.router)
 app.include_router(avaliacoesRouter.router)
+app.include_router(adminRouter.router)
+app.include_router(metricsRouter.router)
 
 
 @app.get("/")
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, TypeVar, Union
+
+from sqlalchemy.engine import Connection, Engine, Result, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.sql.elements import TextClause
+
+from .databaseManager import DEFAULT_STREAM_CHUNK_SIZE
+from .poolStatistics import PoolStatistics, ReadPathStatistics
+from .queryMetrics import QUERY_LABEL_OPTION, QueryMetrics, current_query_label
+from .replicaRouter import ROUND_ROBIN, ReadReplica, ReplicaRouter, read_pool_status, reads_pinned_to_primary
+from .rowSet import RowSet, rows_as_dicts
+from .slowQueryLog import DEFAULT_SLOW_QUERY_CAPACITY, EXPLAIN_OPTION, EXPLAIN_QUERY_LABEL, SlowQuery, SlowQueryLog
+from .statementRegistry import as_statement
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ASYNC_DRIVERS = {
+	"mysql": "mysql+aiomysql",
+	"mariadb": "mariadb+aiomysql",
+	"sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> str:
+	url = make_url(database_url)
+	backend = url.get_backend_name()
+	if url.get_driver_name() in {"aiomysql", "asyncmy", "aiosqlite"}:
+		return database_url
+
+	async_driver = _ASYNC_DRIVERS.get(backend)
+	if async_driver is None:
+		raise ValueError(f"Banco {backend} nao possui driver assincrono configurado")
+	return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+class AsyncDatabaseManager:
+
+	def __init__(
+		self,
+		database_url: str,
+		echo: bool = True,
+		*,
+		pool_size: int = 5,
+		max_overflow: int = 10,
+		pool_timeout: float = 30.0,
+		pool_recycle: int = -1,
+		pool_pre_ping: bool = False,
+		pool_use_lifo: bool = False,
+		replica_urls: Sequence[str] = (),
+		replica_balancing: str = ROUND_ROBIN,
+		read_your_writes: bool = True,
+		slow_query_threshold: Optional[float] = None,
+		slow_query_capacity: int = DEFAULT_SLOW_QUERY_CAPACITY,
+		explain_slow_queries: bool = True,
+	) -> None:
+		self.database_url = to_async_url(database_url)
+		self.replica_urls = tuple(to_async_url(url) for url in replica_urls)
+		self.read_your_writes = read_your_writes
+		pool_settings = {
+			"pool_size": pool_size,
+			"max_overflow": max_overflow,
+			"pool_timeout": pool_timeout,
+			"pool_recycle": pool_recycle,
+			"pool_pre_ping": pool_pre_ping,
+			"pool_use_lifo": pool_use_lifo,
+		}
+		self.engine: AsyncEngine = create_async_engine(self.database_url, echo=echo, **pool_settings)
+		self.pool_statistics = PoolStatistics()
+		self.pool_statistics.attach(self.engine.sync_engine)
+
+		self.primary_read = _read_replica("primary", self.database_url, echo, pool_settings)
+		replicas = [
+			_read_replica(f"replica_{position}", url, echo, pool_settings)
+			for position, url in enumerate(self.replica_urls, start=1)
+		]
+		self.replica_router: ReplicaRouter[AsyncEngine] = ReplicaRouter(
+			replicas or [self.primary_read],
+			replica_balancing,
+		)
+		self.read_path_statistics = ReadPathStatistics()
+
+		self.query_metrics = QueryMetrics()
+		for engine in self._sync_engines():
+			self.query_metrics.attach(engine)
+
+		# O EXPLAIN das consultas lentas roda numa task do event loop, sem
+		# atrasar a requisicao que disparou a consulta.
+		self.slow_query_log: Optional[SlowQueryLog] = None
+		self._explain_tasks: Set["asyncio.Task[None]"] = set()
+		if slow_query_threshold is not None:
+			self.slow_query_log = SlowQueryLog(slow_query_threshold, slow_query_capacity)
+			if explain_slow_queries:
+				self.slow_query_log.schedule_explain = self._schedule_explain
+			for engine in self._sync_engines():
+				self.slow_query_log.attach(engine)
+
+
+	@asynccontextmanager
+	async def connect(self) -> AsyncIterator[AsyncConnection]:
+		async with _checkout(self.engine, self.pool_statistics) as connection:
+			yield connection
+
+
+	@asynccontextmanager
+	async def connect_read(self) -> AsyncIterator[AsyncConnection]:
+		replica = self._select_read_replica()
+		async with _checkout(replica.engine, replica.statistics) as connection:
+			yield connection
+
+
+	@asynccontextmanager
+	async def begin(self) -> AsyncIterator[AsyncConnection]:
+		async with self.connect() as connection:
+			async with connection.begin():
+				yield connection
+
+
+	def get_pool_status(self) -> Dict[str, Any]:
+		return {
+			"primary": self.pool_statistics.snapshot(self.engine.sync_engine.pool),
+			"read": read_pool_status(self.primary_read, self.replica_router),
+			"replica_balancing": self.replica_router.balancing,
+			"read_your_writes": self.read_your_writes,
+			"read_path": self.read_path_statistics.snapshot(),
+		}
+
+
+	def _sync_engines(self) -> List[Engine]:
+		read_engines = {replica.sync_engine for replica in (self.primary_read, *self.replica_router.replicas)}
+		return [self.engine.sync_engine, *read_engines]
+
+
+	def _schedule_explain(self, entry: SlowQuery) -> None:
+		# Os eventos do cursor rodam na thread do event loop (via greenlet).
+		task = asyncio.get_running_loop().create_task(self._explain_slow_query(entry))
+		self._explain_tasks.add(task)
+		task.add_done_callback(self._explain_tasks.discard)
+
+
+	async def _explain_slow_query(self, entry: SlowQuery) -> None:
+		assert self.slow_query_log is not None
+		try:
+			async with _checkout(self.primary_read.engine, self.primary_read.statistics) as connection:
+				result = await connection.exec_driver_sql(
+					entry.explain_sql(),
+					entry.parameters,
+					execution_options={EXPLAIN_OPTION: True, QUERY_LABEL_OPTION: EXPLAIN_QUERY_LABEL},
+				)
+				entry.record_plan(result.all())
+		except Exception as exc:
+			logger.warning("Falha ao executar EXPLAIN da consulta lenta %s: %s", entry.label, exc)
+			entry.record_explain_error(exc)
+		finally:
+			self.slow_query_log.finish_explain(entry)
+
+
+	def _select_read_replica(self) -> ReadReplica[AsyncEngine]:
+		if self.read_your_writes and reads_pinned_to_primary():
+			return self.primary_read
+		return self.replica_router.choose()
+
+
+	async def execute_raw_query(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> Sequence[dict[str, Any]]:
+		async with self.connect() as connection:
+			result: Result = await connection.execute(as_statement(statement), params or {})
+			await connection.commit()
+
+			if not result.returns_rows:
+				return []
+
+			rows = [dict(row) for row in result.mappings()]
+			self.query_metrics.record_rows(current_query_label(), len(rows))
+			return rows
+
+
+	async def execute_read_query(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> Sequence[dict[str, Any]]:
+		async with self.connect_read() as connection:
+			result: Result = await connection.execute(as_statement(statement), params or {})
+			rows = [dict(row) for row in result.mappings()]
+		self.read_path_statistics.record_read()
+		self.query_metrics.record_rows(current_query_label(), len(rows))
+		return rows
+
+
+	async def execute_read_rows(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> RowSet:
+		"""Como ``execute_read_query``, mas devolve as linhas como tuplas num ``RowSet``."""
+		async with self.connect_read() as connection:
+			result: Result = await connection.execute(as_statement(statement), params or {})
+			rows = RowSet.from_result_rows(result.keys(), result)
+		self.read_path_statistics.record_read()
+		self.query_metrics.record_rows(current_query_label(), len(rows))
+		return rows
+
+
+	def stream_raw_query(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict] = None,
+		*,
+		chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+	) -> AsyncIterator[List[dict[str, Any]]]:
+		return self._stream(statement, params, chunk_size, current_query_label(), rows_as_dicts)
+
+
+	def stream_raw_rows(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict] = None,
+		*,
+		chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+	) -> AsyncIterator[RowSet]:
+		"""Como ``stream_raw_query``, mas cada bloco e um ``RowSet``."""
+		return self._stream(statement, params, chunk_size, current_query_label(), RowSet.from_result_rows)
+
+
+	async def _stream(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict],
+		chunk_size: int,
+		label: Optional[str],
+		build_chunk: Callable[[Sequence[str], Sequence[Any]], Any],
+	) -> AsyncIterator[Any]:
+		self.read_path_statistics.record_read()
+		async with self.connect_read() as connection:
+			result = await connection.stream(
+				as_statement(statement),
+				params or {},
+				execution_options={"max_row_buffer": chunk_size, QUERY_LABEL_OPTION: label},
+			)
+			columns = tuple(result.keys())
+			async for partition in result.partitions(chunk_size):
+				self.query_metrics.record_rows(label, len(partition))
+				yield build_chunk(columns, partition)
+
+
+	async def run_in_transaction(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		"""Executa ``fn(connection, *args, **kwargs)`` numa transacao.
+
+		``fn`` recebe uma ``Connection`` sincrona, o que permite reaproveitar as
+		rotinas de escrita dos repositorios sincronos sem bloquear o event loop.
+		"""
+		def _call(connection: Connection) -> T:
+			return fn(connection, *args, **kwargs)
+
+		async with self.begin() as connection:
+			return await connection.run_sync(_call)
+
+
+	async def run_read(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		"""Como ``run_in_transaction``, mas numa conexao de leitura (replica, AUTOCOMMIT)."""
+		def _call(connection: Connection) -> T:
+			return fn(connection, *args, **kwargs)
+
+		async with self.connect_read() as connection:
+			result = await connection.run_sync(_call)
+		self.read_path_statistics.record_read()
+		return result
+
+
+	async def dispose(self) -> None:
+		for task in list(self._explain_tasks):
+			task.cancel()
+		await self.engine.dispose()
+		await self.primary_read.engine.dispose()
+		for replica in self.replica_router.replicas:
+			if replica is not self.primary_read:
+				await replica.engine.dispose()
+
+
+def _read_replica(name: str, database_url: str, echo: bool, pool_settings: Dict[str, Any]) -> ReadReplica[AsyncEngine]:
+	engine = create_async_engine(
+		database_url,
+		echo=echo,
+		isolation_level="AUTOCOMMIT",
+		pool_reset_on_return=None,
+		**pool_settings,
+	)
+	return ReadReplica(name, engine, engine.sync_engine)
+
+
+@asynccontextmanager
+async def _checkout(engine: AsyncEngine, statistics: PoolStatistics) -> AsyncIterator[AsyncConnection]:
+	started = time.perf_counter()
+	try:
+		connection = await engine.connect().start()
+	except PoolTimeoutError:
+		statistics.record_timeout(time.perf_counter() - started)
+		logger.warning("Timeout aguardando conexao do pool")
+		raise
+	statistics.record_wait(time.perf_counter() - started)
+
+	try:
+		yield connection
+	finally:
+		await connection.close()
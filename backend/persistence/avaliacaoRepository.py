@@ -1,31 +1,127 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Sequence, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import bindparam
 from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
 
-from .databaseManager import DatabaseManager
-
-_AVALIACAO_VIEW_BASE_QUERY = (
-    "SELECT \n"
-    "\tcod_aval,\n"
-    "\tcod_oco AS cod_ocorrencia,\n"
-    "\tcod_servico,\n"
-    "\tmorador_cpf AS cpf_morador,\n"
-    "\tnota_serv,\n"
-    "\tnota_tempo,\n"
-    "\topiniao,\n"
-    "\ttipo_status AS ocorrencia_status,\n"
-    "\tservico_nome,\n"
-    "\torgao_nome,\n"
-    "\tmorador_nome,\n"
-    "\tservico_descr,\n"
-    "\tdata_ocorrencia,\n"
-    "\tinicio_servico,\n"
-    "\tfim_servico\n"
-    "FROM vw_avaliacoes_completas"
+from .asyncDatabaseManager import AsyncDatabaseManager
+from .databaseManager import DEFAULT_STREAM_CHUNK_SIZE, DatabaseManager
+from .projection import Projection
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import statements
+
+_AVALIACAO_VIEW_PROJECTION = Projection(
+    "FROM vw_avaliacoes_completas",
+    (
+        ("cod_aval", "cod_aval", ()),
+        ("cod_ocorrencia", "cod_oco", ()),
+        ("cod_servico", "cod_servico", ()),
+        ("cpf_morador", "morador_cpf", ()),
+        ("nota_serv", "nota_serv", ()),
+        ("nota_tempo", "nota_tempo", ()),
+        ("opiniao", "opiniao", ()),
+        ("ocorrencia_status", "tipo_status", ()),
+        ("servico_nome", "servico_nome", ()),
+        ("orgao_nome", "orgao_nome", ()),
+        ("morador_nome", "morador_nome", ()),
+        ("servico_descr", "servico_descr", ()),
+        ("data_ocorrencia", "data_ocorrencia", ()),
+        ("inicio_servico", "inicio_servico", ()),
+        ("fim_servico", "fim_servico", ()),
+    ),
+)
+AVALIACAO_FIELDS = _AVALIACAO_VIEW_PROJECTION.fields
+
+_LIST_AVALIACOES_SQL = _AVALIACAO_VIEW_PROJECTION.register("avaliacao.list_avaliacoes", "\nORDER BY cod_aval DESC")
+_GET_AVALIACAO_BY_ID_SQL = _AVALIACAO_VIEW_PROJECTION.register(
+    "avaliacao.get_avaliacao_by_id",
+    "\nWHERE cod_aval = :cod_aval",
+)
+_GET_AVALIACAO_BY_OCORRENCIA_SQL = _AVALIACAO_VIEW_PROJECTION.register(
+    "avaliacao.get_avaliacao_by_ocorrencia",
+    "\nWHERE cod_oco = :cod_ocorrencia",
+)
+
+# Avaliacoes de varias ocorrencias numa so consulta (lista expandida no IN).
+_LIST_AVALIACOES_BY_OCORRENCIAS_SQL = _AVALIACAO_VIEW_PROJECTION.register(
+    "avaliacao.list_avaliacoes_by_ocorrencias",
+    "\nWHERE cod_oco IN :cod_ocorrencias\nORDER BY cod_oco, cod_aval",
+).statement.bindparams(bindparam("cod_ocorrencias", expanding=True))
+
+# Exportacao completa em ordem crescente de cod_aval; AVALIACAO nao tem data
+# propria, entao ``since`` e o ultimo cod_aval ja exportado.
+_EXPORT_AVALIACOES_SQL = _AVALIACAO_VIEW_PROJECTION.register("avaliacao.export_avaliacoes", "\nORDER BY cod_aval")
+_EXPORT_AVALIACOES_SINCE_SQL = _AVALIACAO_VIEW_PROJECTION.register(
+    "avaliacao.export_avaliacoes_since",
+    "\nWHERE cod_aval > :since\nORDER BY cod_aval",
+)
+
+# Busca paginada: a subconsulta escolhe apenas os cod_aval da pagina (em AVALIACAO,
+# pela chave primaria) e so essas linhas passam pelos JOINs da view, restritos aos
+# das colunas pedidas.
+_AVALIACAO_PAGE_PROJECTION = Projection(
+    (
+        "FROM (\n"
+        "\tSELECT a.cod_aval\n"
+        "\tFROM AVALIACAO AS a{where}\n"
+        "\tORDER BY a.cod_aval DESC\n"
+        "\tLIMIT :limit\n"
+        ") AS pagina\n"
+        "JOIN AVALIACAO AS a ON a.cod_aval = pagina.cod_aval"
+    ),
+    (
+        ("cod_aval", "a.cod_aval", ()),
+        ("cod_ocorrencia", "a.cod_ocorrencia", ()),
+        ("cod_servico", "a.cod_servico", ()),
+        ("cpf_morador", "a.cpf_morador", ()),
+        ("nota_serv", "a.nota_serv", ()),
+        ("nota_tempo", "a.nota_tempo", ()),
+        ("opiniao", "a.opiniao", ()),
+        ("ocorrencia_status", "o.tipo_status", ("o",)),
+        ("servico_nome", "s.nome", ("s",)),
+        ("orgao_nome", "org.nome", ("s", "org")),
+        ("morador_nome", "m.nome", ("m",)),
+        ("servico_descr", "s.descr", ("s",)),
+        ("data_ocorrencia", "o.data", ("o",)),
+        ("inicio_servico", "s.inicio_servico", ("s",)),
+        ("fim_servico", "s.fim_servico", ("s",)),
+    ),
+    (
+        ("s", "JOIN SERVICO AS s ON s.cod_servico = a.cod_servico"),
+        ("o", "JOIN OCORRENCIA AS o ON o.cod_oco = a.cod_ocorrencia"),
+        ("org", "JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = s.cod_orgao"),
+        ("m", "JOIN MORADOR AS m ON m.cpf = a.cpf_morador"),
+    ),
+)
+_AVALIACAO_PAGE_ORDER = "\nORDER BY a.cod_aval DESC"
+
+# Filtros aceitos pela busca -> condicao SQL; os de SERVICO viram uma unica
+# subconsulta sobre a tabela de servicos, menor que AVALIACAO.
+AVALIACAO_FILTERS: Dict[str, str] = {
+    "cod_servico": "a.cod_servico = :cod_servico",
+    "nota_min": "a.nota_serv >= :nota_min",
+    "nota_max": "a.nota_serv <= :nota_max",
+}
+_SERVICO_FILTERS: Dict[str, str] = {
+    "servico_nome": "s.nome LIKE :servico_nome ESCAPE '!'",
+    "cod_orgao": "s.cod_orgao = :cod_orgao",
+}
+_AFTER_COD_AVAL = "a.cod_aval < :after_cod_aval"
+
+_DELETE_AVALIACAO_SQL = statements.register(
+    "avaliacao.delete_avaliacao",
+    "DELETE FROM AVALIACAO WHERE cod_aval = :cod_aval",
+)
+_CALL_REGISTRAR_AVALIACAO_SQL = statements.register(
+    "avaliacao.call_registrar_avaliacao",
+    "CALL sp_registrar_avaliacao(:cod_ocorrencia, :cod_servico, :cpf_morador, "
+    ":nota_serv, :nota_tempo, :opiniao, @novo_cod_aval)",
 )
+_SELECT_NOVO_COD_AVAL_SQL = statements.register("avaliacao.select_novo_cod_aval", "SELECT @novo_cod_aval")
 
 
+@instrument_repository
 class AvaliacaoRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -33,19 +129,53 @@ class AvaliacaoRepository:
 
 
     def list_avaliacoes(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_AVALIACAO_VIEW_BASE_QUERY}\nORDER BY cod_aval DESC"
-        return self._db_manager.execute_raw_query(sql)
+        return self._db_manager.execute_read_query(_LIST_AVALIACOES_SQL.statement)
+
+
+    def stream_avaliacoes(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[RowSet]:
+        return self._db_manager.stream_raw_rows(_LIST_AVALIACOES_SQL.for_fields(fields), chunk_size=chunk_size)
+
+
+    def export_avaliacoes(
+        self,
+        since: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[RowSet]:
+        statement, params = _export_statement(since, fields)
+        return self._db_manager.stream_raw_rows(statement, params, chunk_size=chunk_size)
+
+
+    def search_avaliacoes(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        statement, params = _search_statement(filters, limit, after, fields)
+        return self._db_manager.execute_read_rows(statement, params)
 
 
     def get_avaliacao_by_id(self, cod_aval: int) -> Optional[dict[str, Any]]:
-        sql = f"{_AVALIACAO_VIEW_BASE_QUERY}\nWHERE cod_aval = :cod_aval"
-        result = self._db_manager.execute_raw_query(sql, {"cod_aval": cod_aval})
+        result = self._db_manager.execute_read_query(_GET_AVALIACAO_BY_ID_SQL.statement, {"cod_aval": cod_aval})
         return result[0] if result else None
 
 
-    def get_avaliacao_by_ocorrencia(self, cod_ocorrencia: int) -> Optional[dict[str, Any]]:
-        sql = f"{_AVALIACAO_VIEW_BASE_QUERY}\nWHERE cod_oco = :cod_ocorrencia"
-        result = self._db_manager.execute_raw_query(sql, {"cod_ocorrencia": cod_ocorrencia})
+    def get_avaliacao_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[dict[str, Any]]:
+        result = self._db_manager.execute_read_query(
+            _GET_AVALIACAO_BY_OCORRENCIA_SQL.for_fields(fields),
+            {"cod_ocorrencia": cod_ocorrencia},
+        )
         return result[0] if result else None
 
 
@@ -58,9 +188,9 @@ class AvaliacaoRepository:
         nota_serv: int,
         nota_tempo: int,
         opiniao: Optional[str],
-    ) -> int:
-        with self._db_manager.engine.begin() as connection:
-            return self._call_registrar_avaliacao(
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _call_registrar_avaliacao(
                 connection,
                 cod_ocorrencia=cod_ocorrencia,
                 cod_servico=cod_servico,
@@ -71,33 +201,79 @@ class AvaliacaoRepository:
             )
 
 
-    def update_avaliacao(self, cod_aval: int, fields_to_update: Dict[str, Any]) -> None:
+    def update_avaliacao(self, cod_aval: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
         if not fields_to_update:
-            return
-
-        with self._db_manager.engine.begin() as connection:
-            set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update)
-            params = {**fields_to_update, "cod_aval": cod_aval}
-            connection.execute(
-                text(
-                    f"UPDATE AVALIACAO SET {set_clause} "
-                    "WHERE cod_aval = :cod_aval"
-                ),
-                params,
-            )
+            return self.get_avaliacao_by_id(cod_aval)
+
+        with self._db_manager.begin() as connection:
+            return _update_avaliacao(connection, cod_aval, fields_to_update)
 
 
     def delete_avaliacao(self, cod_aval: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM AVALIACAO WHERE cod_aval = :cod_aval"),
-                {"cod_aval": cod_aval},
-            )
+        with self._db_manager.begin() as connection:
+            _delete_avaliacao(connection, cod_aval)
+
+
+@instrument_repository
+class AsyncAvaliacaoRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_avaliacoes(self) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_AVALIACOES_SQL.statement)
+
+
+    def stream_avaliacoes(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[RowSet]:
+        return self._db_manager.stream_raw_rows(_LIST_AVALIACOES_SQL.for_fields(fields), chunk_size=chunk_size)
+
+
+    def export_avaliacoes(
+        self,
+        since: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[RowSet]:
+        statement, params = _export_statement(since, fields)
+        return self._db_manager.stream_raw_rows(statement, params, chunk_size=chunk_size)
+
+
+    async def search_avaliacoes(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        statement, params = _search_statement(filters, limit, after, fields)
+        return await self._db_manager.execute_read_rows(statement, params)
+
+
+    async def get_avaliacao_by_id(self, cod_aval: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_AVALIACAO_BY_ID_SQL.statement, {"cod_aval": cod_aval})
+        return result[0] if result else None
+
+
+    async def get_avaliacao_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(
+            _GET_AVALIACAO_BY_OCORRENCIA_SQL.for_fields(fields),
+            {"cod_ocorrencia": cod_ocorrencia},
+        )
+        return result[0] if result else None
 
 
-    def _call_registrar_avaliacao(
+    async def create_avaliacao(
         self,
-        connection: Connection,
         *,
         cod_ocorrencia: int,
         cod_servico: int,
@@ -105,24 +281,127 @@ class AvaliacaoRepository:
         nota_serv: int,
         nota_tempo: int,
         opiniao: Optional[str],
-    ) -> int:
-        result = connection.execute(
-            text(
-                "CALL sp_registrar_avaliacao(:cod_ocorrencia, :cod_servico, :cpf_morador, "
-                ":nota_serv, :nota_tempo, :opiniao, @novo_cod_aval)"
-            ),
-            {
-                "cod_ocorrencia": cod_ocorrencia,
-                "cod_servico": cod_servico,
-                "cpf_morador": cpf_morador,
-                "nota_serv": nota_serv,
-                "nota_tempo": nota_tempo,
-                "opiniao": opiniao,
-            },
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _call_registrar_avaliacao,
+            cod_ocorrencia=cod_ocorrencia,
+            cod_servico=cod_servico,
+            cpf_morador=cpf_morador,
+            nota_serv=nota_serv,
+            nota_tempo=nota_tempo,
+            opiniao=opiniao,
+        )
+
+
+    async def update_avaliacao(self, cod_aval: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+        if not fields_to_update:
+            return await self.get_avaliacao_by_id(cod_aval)
+
+        return await self._db_manager.run_in_transaction(_update_avaliacao, cod_aval, fields_to_update)
+
+
+    async def delete_avaliacao(self, cod_aval: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_avaliacao, cod_aval)
+
+
+@labelled_query("AvaliacaoRepository")
+def select_avaliacoes_by_ocorrencias(connection: Connection, cod_ocorrencias: Sequence[int]) -> RowSet:
+    result = connection.execute(_LIST_AVALIACOES_BY_OCORRENCIAS_SQL, {"cod_ocorrencias": list(cod_ocorrencias)})
+    return RowSet.from_result_rows(result.keys(), result)
+
+
+def _export_statement(since: Optional[int], fields: Optional[Sequence[str]]) -> Tuple[TextClause, Dict[str, Any]]:
+    if since is None:
+        return _EXPORT_AVALIACOES_SQL.for_fields(fields), {}
+    return _EXPORT_AVALIACOES_SINCE_SQL.for_fields(fields), {"since": since}
+
+
+def _search_statement(
+    filters: Mapping[str, Any],
+    limit: int,
+    after: Optional[int],
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """Busca com os filtros informados (``None`` e ignorado), ja paginada por cod_aval."""
+    active = sorted(name for name, value in filters.items() if value is not None)
+    unknown = [name for name in active if name not in AVALIACAO_FILTERS and name not in _SERVICO_FILTERS]
+    if unknown:
+        raise ValueError(f"Filtros de avaliacao desconhecidos: {', '.join(unknown)}")
+
+    params: Dict[str, Any] = {name: filters[name] for name in active}
+    params["limit"] = limit
+    if "servico_nome" in params:
+        params["servico_nome"] = f"%{_escape_like(params['servico_nome'])}%"
+
+    conditions = [AVALIACAO_FILTERS[name] for name in active if name in AVALIACAO_FILTERS]
+    servico_conditions = [_SERVICO_FILTERS[name] for name in active if name in _SERVICO_FILTERS]
+    if servico_conditions:
+        conditions.append(
+            "a.cod_servico IN (SELECT s.cod_servico FROM SERVICO AS s WHERE "
+            f"{' AND '.join(servico_conditions)})"
         )
-        result.close()
-        cod_aval = connection.execute(text("SELECT @novo_cod_aval"))
-        cod_value = cod_aval.scalar_one()
-        if cod_value is None:
-            raise RuntimeError("Procedure sp_registrar_avaliacao nao retornou identificador")
-        return int(cod_value)
+    if after is not None:
+        params["after_cod_aval"] = after
+        conditions.append(_AFTER_COD_AVAL)
+
+    where = f"\n\tWHERE {' AND '.join(conditions)}" if conditions else ""
+    select = _AVALIACAO_PAGE_PROJECTION.select(fields).format(where=where)
+    return statements.dynamic(f"{select}{_AVALIACAO_PAGE_ORDER}"), params
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+@labelled_query("AvaliacaoRepository")
+def _update_avaliacao(connection: Connection, cod_aval: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+    params = {**fields_to_update, "cod_aval": cod_aval}
+    connection.execute(
+        statements.update("AVALIACAO", fields_to_update, key_column="cod_aval"),
+        params,
+    )
+    return _select_avaliacao(connection, cod_aval)
+
+
+@labelled_query("AvaliacaoRepository")
+def _delete_avaliacao(connection: Connection, cod_aval: int) -> None:
+    connection.execute(
+        _DELETE_AVALIACAO_SQL,
+        {"cod_aval": cod_aval},
+    )
+
+
+@labelled_query("AvaliacaoRepository")
+def _call_registrar_avaliacao(
+    connection: Connection,
+    *,
+    cod_ocorrencia: int,
+    cod_servico: int,
+    cpf_morador: str,
+    nota_serv: int,
+    nota_tempo: int,
+    opiniao: Optional[str],
+) -> Optional[dict[str, Any]]:
+    result = connection.execute(
+        _CALL_REGISTRAR_AVALIACAO_SQL,
+        {
+            "cod_ocorrencia": cod_ocorrencia,
+            "cod_servico": cod_servico,
+            "cpf_morador": cpf_morador,
+            "nota_serv": nota_serv,
+            "nota_tempo": nota_tempo,
+            "opiniao": opiniao,
+        },
+    )
+    result.close()
+    cod_aval = connection.execute(_SELECT_NOVO_COD_AVAL_SQL)
+    cod_value = cod_aval.scalar_one()
+    if cod_value is None:
+        raise RuntimeError("Procedure sp_registrar_avaliacao nao retornou identificador")
+    return _select_avaliacao(connection, int(cod_value))
+
+
+@labelled_query("AvaliacaoRepository")
+def _select_avaliacao(connection: Connection, cod_aval: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_AVALIACAO_BY_ID_SQL.statement, {"cod_aval": cod_aval})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
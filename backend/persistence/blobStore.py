@@ -0,0 +1,114 @@
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+DEFAULT_BLOB_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "blobs"
+
+
+def content_key(content: bytes) -> str:
+    """Chave do conteudo no armazenamento (SHA-256 em hexadecimal)."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class BlobStore(ABC):
+    """Armazenamento de arquivos enderecado pelo conteudo.
+
+    Conteudos iguais tem a mesma chave e sao gravados uma unica vez.
+    """
+
+    @abstractmethod
+    def put(self, content: bytes) -> str:
+        ...
+
+
+    @abstractmethod
+    def read(self, key: str) -> Optional[bytes]:
+        ...
+
+
+    @abstractmethod
+    def keys(self, older_than: float) -> Iterator[str]:
+        """Chaves gravadas (ou repetidas em ``put``) antes de ``older_than``, em segundos desde a epoch."""
+
+
+    @abstractmethod
+    def delete(self, key: str, older_than: float) -> bool:
+        """Remove o conteudo se ainda for anterior a ``older_than``; ``False`` se ficou."""
+
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Arquivo local do conteudo, para respostas sem copia (sendfile); ``None`` se nao houver."""
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    """Arquivos em ``root/ab/cd/<chave>``, gravados de forma atomica."""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+
+
+    def put(self, content: bytes) -> str:
+        key = content_key(content)
+        path = self._path(key)
+        if path.exists():
+            # Conteudo repetido conta como recem gravado para a varredura de orfaos.
+            os.utime(path)
+            return key
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(content)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return key
+
+
+    def read(self, key: str) -> Optional[bytes]:
+        path = self.local_path(key)
+        return path.read_bytes() if path is not None else None
+
+
+    def keys(self, older_than: float) -> Iterator[str]:
+        for path in self.root.glob("??/??/*"):
+            if _KEY_PATTERN.fullmatch(path.name) and path.stat().st_mtime < older_than:
+                yield path.name
+
+
+    def delete(self, key: str, older_than: float) -> bool:
+        path = self._path(key)
+        try:
+            if path.stat().st_mtime >= older_than:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+
+    def local_path(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        return path if path.is_file() else None
+
+
+    def _path(self, key: str) -> Path:
+        if not _KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"Chave de blob invalida: {key!r}")
+        return self.root / key[:2] / key[2:4] / key
+
+
+def blob_store_from_env() -> BlobStore:
+    """Armazenamento local em ``BLOB_STORE_DIR`` (padrao ``backend/data/blobs``)."""
+    return LocalBlobStore(os.getenv("BLOB_STORE_DIR") or DEFAULT_BLOB_STORE_DIR)
@@ -1,8 +1,12 @@
 from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
 from .databaseManager import DatabaseManager
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import LAST_INSERT_ID_SQL, statements
 
 _CARGO_BASE_QUERY = (
     "SELECT "
@@ -12,7 +16,23 @@ _CARGO_BASE_QUERY = (
     "FROM CARGO AS cargo"
 )
 
+_LIST_CARGOS_SQL = statements.register("cargo.list_cargos", f"{_CARGO_BASE_QUERY}\nORDER BY cargo.nome")
+_GET_CARGO_BY_ID_SQL = statements.register(
+    "cargo.get_cargo_by_id",
+    f"{_CARGO_BASE_QUERY}\nWHERE cargo.cod_cargo = :cod_cargo",
+)
+
+_INSERT_CARGO_SQL = statements.register(
+    "cargo.insert_cargo",
+    "INSERT INTO CARGO (nome, descricao) VALUES (:nome, :descricao)",
+)
+_DELETE_CARGO_SQL = statements.register(
+    "cargo.delete_cargo",
+    "DELETE FROM CARGO WHERE cod_cargo = :cod_cargo",
+)
 
+
+@instrument_repository
 class CargoRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -20,48 +40,96 @@ class CargoRepository:
 
 
     def list_cargos(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_CARGO_BASE_QUERY}\nORDER BY cargo.nome"
-        return self._db_manager.execute_raw_query(sql)
+        return self._db_manager.execute_read_query(_LIST_CARGOS_SQL)
 
 
     def get_cargo_by_id(self, cod_cargo: int) -> Optional[dict[str, Any]]:
-        sql = f"{_CARGO_BASE_QUERY}\nWHERE cargo.cod_cargo = :cod_cargo"
-        result = self._db_manager.execute_raw_query(sql, {"cod_cargo": cod_cargo})
+        result = self._db_manager.execute_read_query(_GET_CARGO_BY_ID_SQL, {"cod_cargo": cod_cargo})
         return result[0] if result else None
 
 
-    def create_cargo(self, *, nome: str, descricao: Optional[str]) -> int:
-        insert_sql = "INSERT INTO CARGO (nome, descricao) VALUES (:nome, :descricao)"
+    def create_cargo(self, *, nome: str, descricao: Optional[str]) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_cargo(connection, nome=nome, descricao=descricao)
+
+
+    def update_cargo(self, cod_cargo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+        if not fields_to_update:
+            return self.get_cargo_by_id(cod_cargo)
+
+        with self._db_manager.begin() as connection:
+            return _update_cargo(connection, cod_cargo, fields_to_update)
+
+
+    def delete_cargo(self, cod_cargo: int) -> None:
+        with self._db_manager.begin() as connection:
+            _delete_cargo(connection, cod_cargo)
+
+
+@instrument_repository
+class AsyncCargoRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
 
-        with self._db_manager.engine.begin() as connection:
-            result = connection.execute(
-                text(insert_sql),
-                {"nome": nome, "descricao": descricao},
-            )
-            cod_cargo = result.lastrowid
-            if not cod_cargo:
-                cod_cargo_result = connection.execute(text("SELECT LAST_INSERT_ID()"))
-                cod_cargo = cod_cargo_result.scalar_one()
 
-        return int(cod_cargo)
+    async def list_cargos(self) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_CARGOS_SQL)
 
 
-    def update_cargo(self, cod_cargo: int, fields_to_update: Dict[str, Any]) -> None:
+    async def get_cargo_by_id(self, cod_cargo: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_CARGO_BY_ID_SQL, {"cod_cargo": cod_cargo})
+        return result[0] if result else None
+
+
+    async def create_cargo(self, *, nome: str, descricao: Optional[str]) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(_insert_cargo, nome=nome, descricao=descricao)
+
+
+    async def update_cargo(self, cod_cargo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
         if not fields_to_update:
-            return
+            return await self.get_cargo_by_id(cod_cargo)
 
-        with self._db_manager.engine.begin() as connection:
-            set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update)
-            params = {**fields_to_update, "cod_cargo": cod_cargo}
-            connection.execute(
-                text(f"UPDATE CARGO SET {set_clause} WHERE cod_cargo = :cod_cargo"),
-                params,
-            )
+        return await self._db_manager.run_in_transaction(_update_cargo, cod_cargo, fields_to_update)
 
 
-    def delete_cargo(self, cod_cargo: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM CARGO WHERE cod_cargo = :cod_cargo"),
-                {"cod_cargo": cod_cargo},
-            )
+    async def delete_cargo(self, cod_cargo: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_cargo, cod_cargo)
+
+
+@labelled_query("CargoRepository")
+def _insert_cargo(connection: Connection, *, nome: str, descricao: Optional[str]) -> Optional[dict[str, Any]]:
+    result = connection.execute(
+        _INSERT_CARGO_SQL,
+        {"nome": nome, "descricao": descricao},
+    )
+    cod_cargo = result.lastrowid
+    if not cod_cargo:
+        cod_cargo_result = connection.execute(LAST_INSERT_ID_SQL)
+        cod_cargo = cod_cargo_result.scalar_one()
+
+    return _select_cargo(connection, int(cod_cargo))
+
+
+@labelled_query("CargoRepository")
+def _update_cargo(connection: Connection, cod_cargo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+    params = {**fields_to_update, "cod_cargo": cod_cargo}
+    connection.execute(
+        statements.update("CARGO", fields_to_update, key_column="cod_cargo"),
+        params,
+    )
+    return _select_cargo(connection, cod_cargo)
+
+
+@labelled_query("CargoRepository")
+def _delete_cargo(connection: Connection, cod_cargo: int) -> None:
+    connection.execute(
+        _DELETE_CARGO_SQL,
+        {"cod_cargo": cod_cargo},
+    )
+
+
+@labelled_query("CargoRepository")
+def _select_cargo(connection: Connection, cod_cargo: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_CARGO_BY_ID_SQL, {"cod_cargo": cod_cargo})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
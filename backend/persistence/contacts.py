@@ -0,0 +1,75 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .rowSet import RowSet
+
+EMAIL_FIELDS = ("email", "emails")
+TELEFONE_FIELDS = ("telefone", "ddd", "telefones")
+
+# Linhas de contato de uma pessoa (sem o cpf) -> campos da resposta.
+ContactValues = Callable[[List[Tuple[Any, ...]]], Dict[str, Any]]
+
+
+def email_values(rows: List[Tuple[Any, ...]]) -> Dict[str, Any]:
+    emails = [email for (email,) in rows]
+    return {"email": emails[0] if emails else None, "emails": emails}
+
+
+def telefone_values(rows: List[Tuple[Any, ...]]) -> Dict[str, Any]:
+    telefones = [{"telefone": telefone, "ddd": ddd} for telefone, ddd in rows]
+    first = telefones[0] if telefones else {"telefone": None, "ddd": None}
+    return {"telefone": first["telefone"], "ddd": first["ddd"], "telefones": telefones}
+
+
+def wants_contacts(fields: Optional[Sequence[str]], contact_fields: Sequence[str]) -> bool:
+    return fields is None or any(field in fields for field in contact_fields)
+
+
+def person_columns(
+    columns: Sequence[str],
+    fields: Optional[Sequence[str]],
+    contact_fields: Sequence[str],
+) -> Optional[Tuple[str, ...]]:
+    """Colunas da consulta da pessoa: as pedidas, mais ``cpf`` se houver contatos a anexar."""
+    if fields is None:
+        return None
+    selected = [column for column in columns if column in fields]
+    if "cpf" not in selected and any(field in fields for field in contact_fields):
+        selected.insert(0, "cpf")
+    return tuple(selected)
+
+
+def attach_contacts(
+    people: RowSet,
+    fields: Optional[Sequence[str]],
+    contacts: Sequence[Tuple[RowSet, ContactValues, Sequence[str]]],
+) -> RowSet:
+    """Uma linha por pessoa, com os contatos lidos a parte agrupados por cpf.
+
+    Um JOIN com EMAIL e TELEFONE devolveria emails x telefones linhas por
+    pessoa. Cada item de ``contacts`` e (linhas ``cpf, ...``, conversao,
+    campos possiveis); so os campos pedidos entram, e ``cpf`` sai se nao foi pedido.
+    """
+    if not contacts:
+        return people
+
+    wanted = None if fields is None else set(fields)
+    keep_cpf = wanted is None or "cpf" in wanted
+    cpf_position = people.columns.index("cpf")
+    sources = [
+        (rows.group_by_first_column(), values, [name for name in names if wanted is None or name in wanted])
+        for rows, values, names in contacts
+    ]
+
+    columns = [column for column in people.columns if keep_cpf or column != "cpf"]
+    for _, _, names in sources:
+        columns.extend(names)
+
+    extended_rows = []
+    for row in people.rows:
+        cpf = row[cpf_position]
+        extended = list(row) if keep_cpf else [*row[:cpf_position], *row[cpf_position + 1:]]
+        for by_cpf, values, names in sources:
+            computed = values(by_cpf.get(cpf, []))
+            extended.extend(computed[name] for name in names)
+        extended_rows.append(tuple(extended))
+    return RowSet(columns, extended_rows)
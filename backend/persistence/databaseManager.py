@@ -1,25 +1,277 @@
 import logging
-from typing import Any, Optional, Sequence
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar, Union
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine, Result
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine, Result
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.sql.elements import TextClause
+
+from .poolStatistics import PoolStatistics, ReadPathStatistics
+from .queryMetrics import QUERY_LABEL_OPTION, QueryMetrics, current_query_label
+from .replicaRouter import ROUND_ROBIN, ReadReplica, ReplicaRouter, read_pool_status, reads_pinned_to_primary
+from .rowSet import RowSet, rows_as_dicts
+from .slowQueryLog import DEFAULT_SLOW_QUERY_CAPACITY, EXPLAIN_OPTION, EXPLAIN_QUERY_LABEL, SlowQuery, SlowQueryLog
+from .statementRegistry import as_statement
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+DEFAULT_STREAM_CHUNK_SIZE = 1000
+
 
 class DatabaseManager:
-	
-	def __init__(self, database_url: str, echo: bool = True) -> None:
+
+	def __init__(
+		self,
+		database_url: str,
+		echo: bool = True,
+		*,
+		pool_size: int = 5,
+		max_overflow: int = 10,
+		pool_timeout: float = 30.0,
+		pool_recycle: int = -1,
+		pool_pre_ping: bool = False,
+		pool_use_lifo: bool = False,
+		replica_urls: Sequence[str] = (),
+		replica_balancing: str = ROUND_ROBIN,
+		read_your_writes: bool = True,
+		slow_query_threshold: Optional[float] = None,
+		slow_query_capacity: int = DEFAULT_SLOW_QUERY_CAPACITY,
+		explain_slow_queries: bool = True,
+	) -> None:
 		self.database_url = database_url
-		self.engine: Engine = create_engine(database_url, echo=echo, future=True)
+		self.replica_urls = tuple(replica_urls)
+		self.read_your_writes = read_your_writes
+		pool_settings = {
+			"pool_size": pool_size,
+			"max_overflow": max_overflow,
+			"pool_timeout": pool_timeout,
+			"pool_recycle": pool_recycle,
+			"pool_pre_ping": pool_pre_ping,
+			"pool_use_lifo": pool_use_lifo,
+		}
+		self.engine: Engine = create_engine(database_url, echo=echo, future=True, **pool_settings)
+		self.pool_statistics = PoolStatistics()
+		self.pool_statistics.attach(self.engine)
+
+		# Leituras usam pools proprios em AUTOCOMMIT: nenhum COMMIT apos o SELECT
+		# e nenhum ROLLBACK de reset na devolucao da conexao.
+		self.primary_read = ReadReplica("primary", _create_read_engine(database_url, echo, pool_settings))
+		replicas = [
+			ReadReplica(f"replica_{position}", _create_read_engine(url, echo, pool_settings))
+			for position, url in enumerate(self.replica_urls, start=1)
+		]
+		self.replica_router: ReplicaRouter[Engine] = ReplicaRouter(replicas or [self.primary_read], replica_balancing)
+		self.read_path_statistics = ReadPathStatistics()
+
+		self.query_metrics = QueryMetrics()
+		for engine in self._sync_engines():
+			self.query_metrics.attach(engine)
+
+		# Consultas acima de slow_query_threshold (segundos) vao para o log e tem o
+		# EXPLAIN executado numa thread propria, fora da requisicao.
+		self.slow_query_log: Optional[SlowQueryLog] = None
+		self._explain_executor: Optional[ThreadPoolExecutor] = None
+		if slow_query_threshold is not None:
+			self.slow_query_log = SlowQueryLog(slow_query_threshold, slow_query_capacity)
+			if explain_slow_queries:
+				self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+				self.slow_query_log.schedule_explain = self._schedule_explain
+			for engine in self._sync_engines():
+				self.slow_query_log.attach(engine)
+
+
+	@contextmanager
+	def connect(self) -> Iterator[Connection]:
+		with _checkout(self.engine, self.pool_statistics) as connection:
+			yield connection
+
+
+	@contextmanager
+	def connect_read(self) -> Iterator[Connection]:
+		"""Conexao em AUTOCOMMIT para consultas que nao alteram dados.
+
+		Vai para uma replica, exceto dentro de ``pin_reads_to_primary()`` com
+		``read_your_writes`` habilitado.
+		"""
+		replica = self._select_read_replica()
+		with _checkout(replica.engine, replica.statistics) as connection:
+			yield connection
+
+
+	@contextmanager
+	def begin(self) -> Iterator[Connection]:
+		with self.connect() as connection:
+			with connection.begin():
+				yield connection
+
+
+	def get_pool_status(self) -> Dict[str, Any]:
+		return {
+			"primary": self.pool_statistics.snapshot(self.engine.pool),
+			"read": read_pool_status(self.primary_read, self.replica_router),
+			"replica_balancing": self.replica_router.balancing,
+			"read_your_writes": self.read_your_writes,
+			"read_path": self.read_path_statistics.snapshot(),
+		}
+
+
+	def dispose(self) -> None:
+		if self._explain_executor is not None:
+			self._explain_executor.shutdown(wait=False, cancel_futures=True)
+		self.engine.dispose()
+		self.primary_read.engine.dispose()
+		for replica in self.replica_router.replicas:
+			if replica is not self.primary_read:
+				replica.engine.dispose()
+
+
+	def _sync_engines(self) -> List[Engine]:
+		read_engines = {replica.sync_engine for replica in (self.primary_read, *self.replica_router.replicas)}
+		return [self.engine, *read_engines]
+
+
+	def _schedule_explain(self, entry: SlowQuery) -> None:
+		assert self._explain_executor is not None
+		self._explain_executor.submit(self._explain_slow_query, entry)
+
 
+	def _explain_slow_query(self, entry: SlowQuery) -> None:
+		assert self.slow_query_log is not None
+		try:
+			with _checkout(self.primary_read.engine, self.primary_read.statistics) as connection:
+				explaining = connection.execution_options(**{EXPLAIN_OPTION: True, QUERY_LABEL_OPTION: EXPLAIN_QUERY_LABEL})
+				result = explaining.exec_driver_sql(entry.explain_sql(), entry.parameters)
+				entry.record_plan(result.all())
+		except Exception as exc:
+			logger.warning("Falha ao executar EXPLAIN da consulta lenta %s: %s", entry.label, exc)
+			entry.record_explain_error(exc)
+		finally:
+			self.slow_query_log.finish_explain(entry)
 
-	def execute_raw_query(self, raw_sql: str, params: Optional[dict] = None) -> Sequence[dict[str, Any]]:
-		with self.engine.connect() as connection:
-			result: Result = connection.execute(text(raw_sql), params or {})
+
+	def _select_read_replica(self) -> ReadReplica[Engine]:
+		if self.read_your_writes and reads_pinned_to_primary():
+			return self.primary_read
+		return self.replica_router.choose()
+
+
+	def execute_raw_query(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> Sequence[dict[str, Any]]:
+		with self.connect() as connection:
+			result: Result = connection.execute(as_statement(statement), params or {})
 			connection.commit()
 
 			if not result.returns_rows:
 				return []
 
-			return [dict(row) for row in result.mappings()]
+			rows = [dict(row) for row in result.mappings()]
+			self.query_metrics.record_rows(current_query_label(), len(rows))
+			return rows
+
+
+	def execute_read_query(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> Sequence[dict[str, Any]]:
+		with self.connect_read() as connection:
+			result: Result = connection.execute(as_statement(statement), params or {})
+			rows = [dict(row) for row in result.mappings()]
+		self.read_path_statistics.record_read()
+		self.query_metrics.record_rows(current_query_label(), len(rows))
+		return rows
+
+
+	def execute_read_rows(self, statement: Union[str, TextClause], params: Optional[dict] = None) -> RowSet:
+		"""Como ``execute_read_query``, mas devolve as linhas como tuplas num ``RowSet``."""
+		with self.connect_read() as connection:
+			result: Result = connection.execute(as_statement(statement), params or {})
+			rows = RowSet.from_result_rows(result.keys(), result)
+		self.read_path_statistics.record_read()
+		self.query_metrics.record_rows(current_query_label(), len(rows))
+		return rows
+
+
+	def run_read(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+		"""Executa ``fn(connection, *args, **kwargs)`` numa unica conexao de leitura.
+
+		Para leituras compostas de varias consultas, que assim usam um so checkout.
+		"""
+		with self.connect_read() as connection:
+			result = fn(connection, *args, **kwargs)
+		self.read_path_statistics.record_read()
+		return result
+
+
+	def stream_raw_query(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict] = None,
+		*,
+		chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+	) -> Iterator[List[dict[str, Any]]]:
+		"""Executa a consulta com cursor do lado do servidor (SSCursor no pymysql).
+
+		As linhas sao entregues em blocos de ``chunk_size``; a conexao permanece
+		ocupada ate o iterador ser consumido ou fechado.
+		"""
+		return self._stream(statement, params, chunk_size, current_query_label(), rows_as_dicts)
+
+
+	def stream_raw_rows(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict] = None,
+		*,
+		chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+	) -> Iterator[RowSet]:
+		"""Como ``stream_raw_query``, mas cada bloco e um ``RowSet``."""
+		return self._stream(statement, params, chunk_size, current_query_label(), RowSet.from_result_rows)
+
+
+	def _stream(
+		self,
+		statement: Union[str, TextClause],
+		params: Optional[dict],
+		chunk_size: int,
+		label: Optional[str],
+		build_chunk: Callable[[Sequence[str], Sequence[Any]], Any],
+	) -> Iterator[Any]:
+		self.read_path_statistics.record_read()
+		with self.connect_read() as connection:
+			streaming = connection.execution_options(
+				stream_results=True,
+				max_row_buffer=chunk_size,
+				**{QUERY_LABEL_OPTION: label},
+			)
+			result: Result = streaming.execute(as_statement(statement), params or {})
+			columns = tuple(result.keys())
+			for partition in result.partitions(chunk_size):
+				self.query_metrics.record_rows(label, len(partition))
+				yield build_chunk(columns, partition)
+
+
+def _create_read_engine(database_url: str, echo: bool, pool_settings: Dict[str, Any]) -> Engine:
+	return create_engine(
+		database_url,
+		echo=echo,
+		future=True,
+		isolation_level="AUTOCOMMIT",
+		pool_reset_on_return=None,
+		**pool_settings,
+	)
+
+
+@contextmanager
+def _checkout(engine: Engine, statistics: PoolStatistics) -> Iterator[Connection]:
+	started = time.perf_counter()
+	try:
+		connection = engine.connect()
+	except PoolTimeoutError:
+		statistics.record_timeout(time.perf_counter() - started)
+		logger.warning("Timeout aguardando conexao do pool")
+		raise
+	statistics.record_wait(time.perf_counter() - started)
+
+	with connection:
+		yield connection
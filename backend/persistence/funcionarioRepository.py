@@ -1,31 +1,122 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Mapping, Optional, Sequence
 
-from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
+from .contacts import EMAIL_FIELDS, attach_contacts, email_values, person_columns, wants_contacts
 from .databaseManager import DatabaseManager
+from .projection import ProjectedStatement, Projection
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import statements
 
-_FUNCIONARIO_BASE_QUERY = (
-    "SELECT \n"
-    "\tf.cpf,\n"
-    "\tf.nome,\n"
-    "\tf.orgao_pub,\n"
-    "\torg.nome AS orgao_nome,\n"
-    "\tf.cargo,\n"
-    "\tcg.nome AS cargo_nome,\n"
-    "\tf.data_nasc,\n"
-    "\tf.inicio_contrato,\n"
-    "\tf.fim_contrato,\n"
-    "\tft.imagem AS foto,\n"
-    "\tem.email\n"
-    "FROM FUNCIONARIO AS f\n"
-    "LEFT JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = f.orgao_pub\n"
-    "LEFT JOIN CARGO AS cg ON cg.cod_cargo = f.cargo\n"
-    "LEFT JOIN FOTO AS ft ON ft.cpf_func = f.cpf\n"
-    "LEFT JOIN EMAIL AS em ON em.cpf_func = f.cpf"
+_FUNCIONARIO_PROJECTION = Projection(
+    "FROM FUNCIONARIO AS f",
+    (
+        ("cpf", "f.cpf", ()),
+        ("nome", "f.nome", ()),
+        ("orgao_pub", "f.orgao_pub", ()),
+        ("orgao_nome", "org.nome", ("org",)),
+        ("cargo", "f.cargo", ()),
+        ("cargo_nome", "cg.nome", ("cg",)),
+        ("data_nasc", "f.data_nasc", ()),
+        ("inicio_contrato", "f.inicio_contrato", ()),
+        ("fim_contrato", "f.fim_contrato", ()),
+        ("foto_hash", "ft.hash", ("ft",)),
+    ),
+    (
+        ("org", "LEFT JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = f.orgao_pub"),
+        ("cg", "LEFT JOIN CARGO AS cg ON cg.cod_cargo = f.cargo"),
+        ("ft", "LEFT JOIN FOTO AS ft ON ft.cpf_func = f.cpf"),
+        ("em", "LEFT JOIN EMAIL AS em ON em.cpf_func = f.cpf"),
+    ),
 )
+# Emails vem de uma consulta propria, anexados por cpf (ver contacts.py); FOTO e 1:1.
+FUNCIONARIO_FIELDS = _FUNCIONARIO_PROJECTION.fields + EMAIL_FIELDS
 
+_LIST_FUNCIONARIOS_SQL = _FUNCIONARIO_PROJECTION.register("funcionario.list_funcionarios", "\nORDER BY f.nome")
+_GET_FUNCIONARIO_BY_CPF_SQL = _FUNCIONARIO_PROJECTION.register(
+    "funcionario.get_funcionario_by_cpf",
+    "\nWHERE f.cpf = :cpf",
+)
+_GET_FUNCIONARIO_BY_EMAIL_SQL = _FUNCIONARIO_PROJECTION.register(
+    "funcionario.get_funcionario_by_email",
+    "\nWHERE em.email = :email",
+    joins=("em",),
+)
+_LIST_EMAILS_SQL = statements.register(
+    "funcionario.list_emails",
+    "SELECT cpf_func, email FROM EMAIL WHERE cpf_func IS NOT NULL ORDER BY cpf_func, cod_email",
+)
+_GET_EMAILS_SQL = statements.register(
+    "funcionario.get_emails",
+    "SELECT cpf_func, email FROM EMAIL WHERE cpf_func = :cpf ORDER BY cod_email",
+)
+_GET_AUTH_RECORD_SQL = statements.register(
+    "funcionario.get_auth_record",
+    "SELECT "
+    "\tf.cpf, "
+    "\tf.nome, "
+    "\tf.senha, "
+    "\tf.orgao_pub, "
+    "\tf.cargo "
+    "FROM FUNCIONARIO AS f "
+    "JOIN EMAIL AS em ON em.cpf_func = f.cpf "
+    "WHERE em.email = :email",
+)
+# hash: chave do arquivo no BlobStore; foto_hash: versao da foto original (ETag).
+_GET_FOTO_SQL = statements.register(
+    "funcionario.get_foto",
+    "SELECT hash, hash AS foto_hash, content_type FROM FOTO WHERE cpf_func = :cpf",
+)
+# Fotos gravadas antes das miniaturas caem na imagem original.
+_GET_FOTO_MINIATURA_SQL = statements.register(
+    "funcionario.get_foto_miniatura",
+    "SELECT "
+    "\tCOALESCE(mi.hash, ft.hash) AS hash, "
+    "\tft.hash AS foto_hash, "
+    "\tCOALESCE(mi.content_type, ft.content_type) AS content_type "
+    "FROM FOTO AS ft "
+    "LEFT JOIN FOTO_MINIATURA AS mi ON mi.cpf_func = ft.cpf_func AND mi.tamanho = :tamanho "
+    "WHERE ft.cpf_func = :cpf",
+)
 
+_INSERT_FUNCIONARIO_SQL = statements.register(
+    "funcionario.insert_funcionario",
+    "INSERT INTO FUNCIONARIO (cpf, nome, orgao_pub, cargo, data_nasc, inicio_contrato, fim_contrato, senha) "
+    "VALUES (:cpf, :nome, :orgao_pub, :cargo, :data_nasc, :inicio_contrato, :fim_contrato, :senha)",
+)
+_INSERT_EMAIL_SQL = statements.register(
+    "funcionario.insert_email",
+    "INSERT INTO EMAIL (cpf_func, email) VALUES (:cpf, :email)",
+)
+_INSERT_FOTO_SQL = statements.register(
+    "funcionario.insert_foto",
+    "INSERT INTO FOTO (cpf_func, hash, content_type, tamanho_bytes) "
+    "VALUES (:cpf, :hash, :content_type, :tamanho_bytes)",
+)
+_INSERT_MINIATURA_SQL = statements.register(
+    "funcionario.insert_foto_miniatura",
+    "INSERT INTO FOTO_MINIATURA (cpf_func, tamanho, hash, content_type) "
+    "VALUES (:cpf, :tamanho, :hash, :content_type)",
+)
+_DELETE_FUNCIONARIO_SQL = statements.register(
+    "funcionario.delete_funcionario",
+    "DELETE FROM FUNCIONARIO WHERE cpf = :cpf",
+)
+_DELETE_EMAIL_SQL = statements.register("funcionario.delete_email", "DELETE FROM EMAIL WHERE cpf_func = :cpf")
+_DELETE_FOTO_SQL = statements.register("funcionario.delete_foto", "DELETE FROM FOTO WHERE cpf_func = :cpf")
+_DELETE_MINIATURAS_SQL = statements.register(
+    "funcionario.delete_foto_miniaturas",
+    "DELETE FROM FOTO_MINIATURA WHERE cpf_func = :cpf",
+)
+
+
+def _funcionario_columns(fields: Optional[Sequence[str]]) -> Optional[Sequence[str]]:
+    return person_columns(_FUNCIONARIO_PROJECTION.fields, fields, EMAIL_FIELDS)
+
+
+@instrument_repository
 class FuncionarioRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -33,35 +124,37 @@ class FuncionarioRepository:
 
 
     def list_funcionarios(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_FUNCIONARIO_BASE_QUERY}\nORDER BY f.nome"
-        return self._db_manager.execute_raw_query(sql)
+        return self.list_funcionario_rows().as_dicts()
+
+
+    def list_funcionario_rows(self, fields: Optional[Sequence[str]] = None) -> RowSet:
+        funcionarios = self._db_manager.execute_read_rows(_LIST_FUNCIONARIOS_SQL.for_fields(_funcionario_columns(fields)))
+        if not wants_contacts(fields, EMAIL_FIELDS):
+            return funcionarios
+        emails = self._db_manager.execute_read_rows(_LIST_EMAILS_SQL)
+        return attach_contacts(funcionarios, fields, [(emails, email_values, EMAIL_FIELDS)])
+
+
+    def get_funcionario_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._db_manager.run_read(_select_funcionario, _GET_FUNCIONARIO_BY_CPF_SQL, {"cpf": cpf}, fields)
+
+
+    def get_funcionario_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._db_manager.run_read(_select_funcionario, _GET_FUNCIONARIO_BY_EMAIL_SQL, {"email": email}, fields)
 
 
-    def get_funcionario_by_cpf(self, cpf: str) -> Optional[dict[str, Any]]:
-        sql = f"{_FUNCIONARIO_BASE_QUERY}\nWHERE f.cpf = :cpf"
-        result = self._db_manager.execute_raw_query(sql, {"cpf": cpf})
+    def get_auth_record(self, email: str) -> Optional[dict[str, Any]]:
+        result = self._db_manager.execute_read_query(_GET_AUTH_RECORD_SQL, {"email": email})
         return result[0] if result else None
 
 
-    def get_funcionario_by_email(self, email: str) -> Optional[dict[str, Any]]:
-        sql = f"{_FUNCIONARIO_BASE_QUERY}\nWHERE em.email = :email"
-        result = self._db_manager.execute_raw_query(sql, {"email": email})
+    def get_foto(self, cpf: str) -> Optional[dict[str, Any]]:
+        result = self._db_manager.execute_read_query(_GET_FOTO_SQL, {"cpf": cpf})
         return result[0] if result else None
 
 
-    def get_auth_record(self, email: str) -> Optional[dict[str, Any]]:
-        sql = (
-            "SELECT "
-            "\tf.cpf, "
-            "\tf.nome, "
-            "\tf.senha, "
-            "\tf.orgao_pub, "
-            "\tf.cargo "
-            "FROM FUNCIONARIO AS f "
-            "JOIN EMAIL AS em ON em.cpf_func = f.cpf "
-            "WHERE em.email = :email"
-        )
-        result = self._db_manager.execute_raw_query(sql, {"email": email})
+    def get_foto_miniatura(self, cpf: str, tamanho: int) -> Optional[dict[str, Any]]:
+        result = self._db_manager.execute_read_query(_GET_FOTO_MINIATURA_SQL, {"cpf": cpf, "tamanho": tamanho})
         return result[0] if result else None
 
 
@@ -70,85 +163,245 @@ class FuncionarioRepository:
         payload: Dict[str, Any],
         *,
         email: Optional[str],
-        foto: Optional[bytes],
-    ) -> None:
-        insert_sql = (
-            "INSERT INTO FUNCIONARIO (cpf, nome, orgao_pub, cargo, data_nasc, inicio_contrato, fim_contrato, senha) "
-            "VALUES (:cpf, :nome, :orgao_pub, :cargo, :data_nasc, :inicio_contrato, :fim_contrato, :senha)"
+        foto: Optional[Mapping[str, Any]],
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_funcionario(connection, payload, email=email, foto=foto)
+
+
+    def update_funcionario(
+        self,
+        cpf: str,
+        fields_to_update: Dict[str, Any],
+        *,
+        email: Optional[str],
+        update_email: bool,
+        foto: Optional[Mapping[str, Any]],
+        update_foto: bool,
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _update_funcionario(
+                connection,
+                cpf,
+                fields_to_update,
+                email=email,
+                update_email=update_email,
+                foto=foto,
+                update_foto=update_foto,
+            )
+
+
+    def delete_funcionario(self, cpf: str) -> None:
+        with self._db_manager.begin() as connection:
+            _delete_funcionario(connection, cpf)
+
+
+@instrument_repository
+class AsyncFuncionarioRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_funcionarios(self) -> Sequence[dict[str, Any]]:
+        return (await self.list_funcionario_rows()).as_dicts()
+
+
+    async def list_funcionario_rows(self, fields: Optional[Sequence[str]] = None) -> RowSet:
+        funcionarios = await self._db_manager.execute_read_rows(
+            _LIST_FUNCIONARIOS_SQL.for_fields(_funcionario_columns(fields)),
         )
+        if not wants_contacts(fields, EMAIL_FIELDS):
+            return funcionarios
+        emails = await self._db_manager.execute_read_rows(_LIST_EMAILS_SQL)
+        return attach_contacts(funcionarios, fields, [(emails, email_values, EMAIL_FIELDS)])
 
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(text(insert_sql), payload)
-            cpf = payload["cpf"]
 
-            if email:
-                connection.execute(
-                    text("INSERT INTO EMAIL (cpf_func, email) VALUES (:cpf, :email)"),
-                    {"cpf": cpf, "email": email},
-                )
+    async def get_funcionario_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_read(_select_funcionario, _GET_FUNCIONARIO_BY_CPF_SQL, {"cpf": cpf}, fields)
 
-            if foto is not None:
-                connection.execute(
-                    text("INSERT INTO FOTO (cpf_func, imagem) VALUES (:cpf, :foto)"),
-                    {"cpf": cpf, "foto": foto},
-                )
 
+    async def get_funcionario_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_read(_select_funcionario, _GET_FUNCIONARIO_BY_EMAIL_SQL, {"email": email}, fields)
 
-    def update_funcionario(
+
+    async def get_auth_record(self, email: str) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_AUTH_RECORD_SQL, {"email": email})
+        return result[0] if result else None
+
+
+    async def get_foto(self, cpf: str) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_FOTO_SQL, {"cpf": cpf})
+        return result[0] if result else None
+
+
+    async def get_foto_miniatura(self, cpf: str, tamanho: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_FOTO_MINIATURA_SQL, {"cpf": cpf, "tamanho": tamanho})
+        return result[0] if result else None
+
+
+    async def create_funcionario(
+        self,
+        payload: Dict[str, Any],
+        *,
+        email: Optional[str],
+        foto: Optional[Mapping[str, Any]],
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(_insert_funcionario, payload, email=email, foto=foto)
+
+
+    async def update_funcionario(
         self,
         cpf: str,
         fields_to_update: Dict[str, Any],
         *,
         email: Optional[str],
         update_email: bool,
-        foto: Optional[bytes],
+        foto: Optional[Mapping[str, Any]],
         update_foto: bool,
-    ) -> None:
-        with self._db_manager.engine.begin() as connection:
-            if fields_to_update:
-                set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update.keys())
-                params = {**fields_to_update, "cpf": cpf}
-                connection.execute(
-                    text(f"UPDATE FUNCIONARIO SET {set_clause} WHERE cpf = :cpf"),
-                    params,
-                )
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _update_funcionario,
+            cpf,
+            fields_to_update,
+            email=email,
+            update_email=update_email,
+            foto=foto,
+            update_foto=update_foto,
+        )
 
-            if update_email:
-                self._sync_email(connection, cpf, email)
 
-            if update_foto:
-                self._sync_foto(connection, cpf, foto)
+    async def delete_funcionario(self, cpf: str) -> None:
+        await self._db_manager.run_in_transaction(_delete_funcionario, cpf)
 
 
-    def delete_funcionario(self, cpf: str) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM FUNCIONARIO WHERE cpf = :cpf"),
-                {"cpf": cpf},
-            )
+@labelled_query("FuncionarioRepository")
+def _insert_funcionario(
+    connection: Connection,
+    payload: Dict[str, Any],
+    *,
+    email: Optional[str],
+    foto: Optional[Mapping[str, Any]],
+) -> Optional[dict[str, Any]]:
+    connection.execute(_INSERT_FUNCIONARIO_SQL, payload)
+    cpf = payload["cpf"]
+
+    if email:
+        connection.execute(
+            _INSERT_EMAIL_SQL,
+            {"cpf": cpf, "email": email},
+        )
+
+    if foto is not None:
+        _insert_foto(connection, cpf, foto)
+
+    return _select_funcionario(connection, _GET_FUNCIONARIO_BY_CPF_SQL, {"cpf": cpf})
 
 
-    def _sync_email(self, connection: Connection, cpf: str, email: Optional[str]) -> None:
+@labelled_query("FuncionarioRepository")
+def _update_funcionario(
+    connection: Connection,
+    cpf: str,
+    fields_to_update: Dict[str, Any],
+    *,
+    email: Optional[str],
+    update_email: bool,
+    foto: Optional[Mapping[str, Any]],
+    update_foto: bool,
+) -> Optional[dict[str, Any]]:
+    if fields_to_update:
+        params = {**fields_to_update, "cpf": cpf}
         connection.execute(
-            text("DELETE FROM EMAIL WHERE cpf_func = :cpf"),
-            {"cpf": cpf},
+            statements.update("FUNCIONARIO", fields_to_update, key_column="cpf"),
+            params,
         )
 
-        if email:
-            connection.execute(
-                text("INSERT INTO EMAIL (cpf_func, email) VALUES (:cpf, :email)"),
-                {"cpf": cpf, "email": email},
-            )
+    if update_email:
+        _sync_email(connection, cpf, email)
+
+    if update_foto:
+        _sync_foto(connection, cpf, foto)
+
+    return _select_funcionario(connection, _GET_FUNCIONARIO_BY_CPF_SQL, {"cpf": cpf})
+
+
+@labelled_query("FuncionarioRepository")
+def _select_funcionario(
+    connection: Connection,
+    statement: ProjectedStatement,
+    params: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None,
+) -> Optional[dict[str, Any]]:
+    """Funcionario com os emails, em consultas feitas todas em ``connection``."""
+    result = connection.execute(statement.for_fields(_funcionario_columns(fields)), params)
+    funcionario = RowSet.from_result_rows(result.keys(), result)
+    if not funcionario.rows:
+        return None
+    if not wants_contacts(fields, EMAIL_FIELDS):
+        return funcionario.first_dict()
+    cpf = funcionario.rows[0][funcionario.columns.index("cpf")]
+    result = connection.execute(_GET_EMAILS_SQL, {"cpf": cpf})
+    emails = RowSet.from_result_rows(result.keys(), result)
+    return attach_contacts(funcionario, fields, [(emails, email_values, EMAIL_FIELDS)]).first_dict()
 
 
-    def _sync_foto(self, connection: Connection, cpf: str, foto: Optional[bytes]) -> None:
+@labelled_query("FuncionarioRepository")
+def _delete_funcionario(connection: Connection, cpf: str) -> None:
+    connection.execute(
+        _DELETE_FUNCIONARIO_SQL,
+        {"cpf": cpf},
+    )
+
+
+@labelled_query("FuncionarioRepository")
+def _sync_email(connection: Connection, cpf: str, email: Optional[str]) -> None:
+    connection.execute(
+        _DELETE_EMAIL_SQL,
+        {"cpf": cpf},
+    )
+
+    if email:
         connection.execute(
-            text("DELETE FROM FOTO WHERE cpf_func = :cpf"),
-            {"cpf": cpf},
+            _INSERT_EMAIL_SQL,
+            {"cpf": cpf, "email": email},
         )
 
-        if foto is not None:
-            connection.execute(
-                text("INSERT INTO FOTO (cpf_func, imagem) VALUES (:cpf, :foto)"),
-                {"cpf": cpf, "foto": foto},
-            )
+
+@labelled_query("FuncionarioRepository")
+def _sync_foto(connection: Connection, cpf: str, foto: Optional[Mapping[str, Any]]) -> None:
+    connection.execute(
+        _DELETE_MINIATURAS_SQL,
+        {"cpf": cpf},
+    )
+    connection.execute(
+        _DELETE_FOTO_SQL,
+        {"cpf": cpf},
+    )
+
+    if foto is not None:
+        _insert_foto(connection, cpf, foto)
+
+
+def _insert_foto(connection: Connection, cpf: str, foto: Mapping[str, Any]) -> None:
+    """Metadados de uma foto ja gravada no BlobStore.
+
+    ``foto`` traz ``hash``, ``content_type``, ``tamanho_bytes`` e ``miniaturas``
+    (tamanho -> ``{"hash", "content_type"}``).
+    """
+    connection.execute(
+        _INSERT_FOTO_SQL,
+        {
+            "cpf": cpf,
+            "hash": foto["hash"],
+            "content_type": foto["content_type"],
+            "tamanho_bytes": foto["tamanho_bytes"],
+        },
+    )
+    if foto["miniaturas"]:
+        connection.execute(
+            _INSERT_MINIATURA_SQL,
+            [
+                {"cpf": cpf, "tamanho": tamanho, **miniatura}
+                for tamanho, miniatura in foto["miniaturas"].items()
+            ],
+        )
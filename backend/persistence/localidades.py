@@ -0,0 +1,157 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, event
+from sqlalchemy.engine import Connection
+
+from .statementRegistry import statements
+
+# (estado, cidade, bairro)
+LocalidadeKey = Tuple[str, str, str]
+
+LOCALIDADE_KEYS = ("estado", "cidade", "bairro")
+
+# Localidades mantidas em memoria por processo (a tabela e pequena e quase so cresce).
+LOCALIDADE_CACHE_SIZE = 4096
+
+_SELECT_LOCALIDADES_SQL = statements.register(
+    "localidade.select_localidades",
+    "SELECT cod_local, estado, cidade, bairro FROM LOCALIDADE WHERE (estado, cidade, bairro) IN :chaves",
+).bindparams(bindparam("chaves", expanding=True))
+
+# Com o indice unico em (estado, cidade, bairro), workers que criam a mesma
+# localidade ao mesmo tempo nao geram duplicatas nem erro de chave.
+_INSERT_LOCALIDADE_SQL = {
+    "mysql": statements.register(
+        "localidade.insert_localidade.mysql",
+        "INSERT INTO LOCALIDADE (estado, cidade, bairro) VALUES (:estado, :cidade, :bairro) "
+        "ON DUPLICATE KEY UPDATE cod_local = cod_local",
+    ),
+    "sqlite": statements.register(
+        "localidade.insert_localidade.sqlite",
+        "INSERT INTO LOCALIDADE (estado, cidade, bairro) VALUES (:estado, :cidade, :bairro) "
+        "ON CONFLICT (estado, cidade, bairro) DO NOTHING",
+    ),
+}
+_INSERT_LOCALIDADE_SQL["mariadb"] = _INSERT_LOCALIDADE_SQL["mysql"]
+
+
+def localidade_key(localidade: Optional[Mapping[str, str]]) -> LocalidadeKey:
+    """Chave da localidade informada por nome; ``ValueError`` se faltar algum campo."""
+    if not localidade:
+        raise ValueError("Localidade deve ser informada quando cod_local nao for fornecido")
+    missing = set(LOCALIDADE_KEYS) - set(localidade.keys())
+    if missing:
+        raise ValueError(f"Campos de localidade ausentes: {', '.join(sorted(missing))}")
+    return (localidade["estado"], localidade["cidade"], localidade["bairro"])
+
+
+class LocalidadeResolver:
+    """Resolve localidades por nome em ``cod_local``, criando as que faltam.
+
+    Os codigos ja conhecidos ficam num LRU de ``capacity`` entradas, entao a
+    localidade de um bairro frequente nao custa nenhuma consulta. Uma entrada so
+    vai para o LRU quando a transacao que a leu ou criou e confirmada; num
+    rollback o ``cod_local`` recem inserido deixaria de existir.
+    """
+
+    def __init__(self, capacity: int = LOCALIDADE_CACHE_SIZE) -> None:
+        self._capacity = capacity
+        self._cache: "OrderedDict[LocalidadeKey, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+
+    def resolve(self, connection: Connection, keys: Iterable[LocalidadeKey]) -> Dict[LocalidadeKey, int]:
+        """cod_local de cada localidade; as ausentes do LRU custam no maximo tres instrucoes."""
+        resolved: Dict[LocalidadeKey, int] = {}
+        missing: Set[LocalidadeKey] = set()
+        with self._lock:
+            for key in set(keys):
+                cod_local = self._cache.get(key)
+                if cod_local is None:
+                    missing.add(key)
+                else:
+                    self._cache.move_to_end(key)
+                    resolved[key] = cod_local
+            self._hits += len(resolved)
+            self._misses += len(missing)
+        if not missing:
+            return resolved
+
+        found = self._lookup(connection, missing)
+        absent = sorted(missing - found.keys())
+        if absent:
+            statement = _INSERT_LOCALIDADE_SQL.get(connection.dialect.name, _INSERT_LOCALIDADE_SQL["mysql"])
+            connection.execute(statement, [dict(zip(LOCALIDADE_KEYS, key)) for key in absent])
+            found = self._lookup(connection, missing)
+        self._remember(connection, found)
+        resolved.update(found)
+        return resolved
+
+
+    def resolve_cod_local(
+        self,
+        connection: Connection,
+        cod_local: Optional[int],
+        localidade: Optional[Mapping[str, str]],
+    ) -> int:
+        """``cod_local`` informado ou o da localidade por nome (criada se preciso)."""
+        if cod_local is not None:
+            return cod_local
+        key = localidade_key(localidade)
+        return self.resolve(connection, (key,))[key]
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self._hits, "misses": self._misses}
+
+
+    def _lookup(self, connection: Connection, keys: Set[LocalidadeKey]) -> Dict[LocalidadeKey, int]:
+        result = connection.execute(_SELECT_LOCALIDADES_SQL, {"chaves": sorted(keys)})
+        found: Dict[LocalidadeKey, int] = {}
+        for cod_local, estado, cidade, bairro in result:
+            found.setdefault((estado, cidade, bairro), int(cod_local))
+        return found
+
+
+    def _remember(self, connection: Connection, found: Mapping[LocalidadeKey, int]) -> None:
+        if not connection.in_transaction():
+            self._store(found)
+            return
+
+        # O listener de commit continua registrado depois de um rollback na mesma
+        # conexao; ``pending`` impede que ele grave codigos de uma transacao desfeita.
+        pending = [True]
+
+        def on_commit(_connection: Connection) -> None:
+            if pending[0]:
+                pending[0] = False
+                self._store(found)
+
+        def on_rollback(_connection: Connection) -> None:
+            pending[0] = False
+
+        event.listen(connection, "commit", on_commit, once=True)
+        event.listen(connection, "rollback", on_rollback, once=True)
+
+
+    def _store(self, found: Mapping[LocalidadeKey, int]) -> None:
+        with self._lock:
+            for key, cod_local in found.items():
+                self._cache[key] = cod_local
+                self._cache.move_to_end(key)
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+
+
+# Compartilhado pelos repositorios de moradores e ocorrencias.
+localidade_resolver = LocalidadeResolver()
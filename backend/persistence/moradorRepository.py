@@ -1,58 +1,140 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Mapping, Optional, Sequence, Set
 
-from sqlalchemy import text
+from sqlalchemy import bindparam
 from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
+from .contacts import (
+    EMAIL_FIELDS,
+    TELEFONE_FIELDS,
+    attach_contacts,
+    email_values,
+    person_columns,
+    telefone_values,
+    wants_contacts,
+)
 from .databaseManager import DatabaseManager
+from .localidades import localidade_resolver
+from .projection import Projection
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import statements
+
+_MORADOR_PROJECTION = Projection(
+    "FROM MORADOR AS m",
+    (
+        ("cpf", "m.cpf", ()),
+        ("nome", "m.nome", ()),
+        ("cod_local", "m.cod_local", ()),
+        ("endereco", "m.endereco", ()),
+        ("data_nasc", "m.data_nasc", ()),
+        ("estado", "loc.estado", ("loc",)),
+        ("cidade", "loc.cidade", ("loc",)),
+        ("bairro", "loc.bairro", ("loc",)),
+    ),
+    (
+        ("loc", "LEFT JOIN LOCALIDADE AS loc ON loc.cod_local = m.cod_local"),
+    ),
+)
+# Emails e telefones vem de consultas proprias, anexados por cpf (ver contacts.py).
+MORADOR_FIELDS = _MORADOR_PROJECTION.fields + EMAIL_FIELDS + TELEFONE_FIELDS
+
+_LIST_MORADORES_SQL = _MORADOR_PROJECTION.register("morador.list_moradores", "\nORDER BY m.nome")
+_GET_MORADOR_BY_CPF_SQL = _MORADOR_PROJECTION.register("morador.get_morador_by_cpf", "\nWHERE m.cpf = :cpf")
+_LIST_EMAILS_SQL = statements.register(
+    "morador.list_emails",
+    "SELECT cpf_morador, email FROM EMAIL WHERE cpf_morador IS NOT NULL ORDER BY cpf_morador, cod_email",
+)
+_GET_EMAILS_SQL = statements.register(
+    "morador.get_emails",
+    "SELECT cpf_morador, email FROM EMAIL WHERE cpf_morador = :cpf ORDER BY cod_email",
+)
+_LIST_TELEFONES_SQL = statements.register(
+    "morador.list_telefones",
+    "SELECT cpf_morador, telefone, DDD FROM TELEFONE WHERE cpf_morador IS NOT NULL ORDER BY cpf_morador, telefone",
+)
+_GET_TELEFONES_SQL = statements.register(
+    "morador.get_telefones",
+    "SELECT cpf_morador, telefone, DDD FROM TELEFONE WHERE cpf_morador = :cpf ORDER BY telefone",
+)
+_GET_AUTH_RECORD_SQL = statements.register(
+    "morador.get_auth_record",
+    "SELECT "
+    "\tm.cpf, "
+    "\tm.nome, "
+    "\tm.senha "
+    "FROM MORADOR AS m "
+    "JOIN EMAIL AS em ON em.cpf_morador = m.cpf "
+    "WHERE em.email = :email",
+)
 
-_MORADOR_BASE_QUERY = (
-    "SELECT \n"
-    "\tm.cpf,\n"
-    "\tm.nome,\n"
-    "\tm.cod_local,\n"
-    "\tm.endereco,\n"
-    "\tm.data_nasc,\n"
-    "\tloc.estado,\n"
-    "\tloc.cidade,\n"
-    "\tloc.bairro,\n"
-    "\tem.email,\n"
-    "\ttel.telefone,\n"
-    "\ttel.DDD AS ddd\n"
-    "FROM MORADOR AS m\n"
-    "LEFT JOIN LOCALIDADE AS loc ON loc.cod_local = m.cod_local\n"
-    "LEFT JOIN EMAIL AS em ON em.cpf_morador = m.cpf\n"
-    "LEFT JOIN TELEFONE AS tel ON tel.cpf_morador = m.cpf"
+_INSERT_MORADOR_SQL = statements.register(
+    "morador.insert_morador",
+    "INSERT INTO MORADOR (cpf, nome, cod_local, endereco, data_nasc, senha) "
+    "VALUES (:cpf, :nome, :cod_local, :endereco, :data_nasc, :senha)",
+)
+_DELETE_MORADOR_SQL = statements.register("morador.delete_morador", "DELETE FROM MORADOR WHERE cpf = :cpf")
+_DELETE_EMAIL_SQL = statements.register("morador.delete_email", "DELETE FROM EMAIL WHERE cpf_morador = :cpf")
+_INSERT_EMAIL_SQL = statements.register(
+    "morador.insert_email",
+    "INSERT INTO EMAIL (cpf_morador, email) VALUES (:cpf, :email)",
+)
+_SELECT_TELEFONE_SQL = statements.register(
+    "morador.select_telefone",
+    "SELECT telefone, DDD FROM TELEFONE WHERE cpf_morador = :cpf LIMIT 1",
+)
+_DELETE_TELEFONE_SQL = statements.register(
+    "morador.delete_telefone",
+    "DELETE FROM TELEFONE WHERE cpf_morador = :cpf",
+)
+_INSERT_TELEFONE_SQL = statements.register(
+    "morador.insert_telefone",
+    "INSERT INTO TELEFONE (telefone, cpf_morador, DDD) "
+    "VALUES (:telefone, :cpf, :ddd)",
 )
 
+# Conferencia em lote dos blocos da importacao (listas expandidas no IN).
+_SELECT_CPFS_SQL = statements.register(
+    "morador.select_cpfs",
+    "SELECT cpf FROM MORADOR WHERE cpf IN :cpfs",
+).bindparams(bindparam("cpfs", expanding=True))
+_SELECT_TELEFONES_SQL = statements.register(
+    "morador.select_telefones",
+    "SELECT telefone FROM TELEFONE WHERE telefone IN :telefones",
+).bindparams(bindparam("telefones", expanding=True))
+_SELECT_COD_LOCAIS_SQL = statements.register(
+    "morador.select_cod_locais",
+    "SELECT cod_local FROM LOCALIDADE WHERE cod_local IN :cod_locais",
+).bindparams(bindparam("cod_locais", expanding=True))
 
+
+def _morador_columns(fields: Optional[Sequence[str]]) -> Optional[Sequence[str]]:
+    return person_columns(_MORADOR_PROJECTION.fields, fields, EMAIL_FIELDS + TELEFONE_FIELDS)
+
+
+@instrument_repository
 class MoradorRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._db_manager = db_manager
 
 
-    def list_moradores(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_MORADOR_BASE_QUERY}\nORDER BY m.nome"
-        return self._db_manager.execute_raw_query(sql)
+    def list_moradores(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        moradores = self._db_manager.execute_read_rows(_LIST_MORADORES_SQL.for_fields(_morador_columns(fields)))
+        contacts = []
+        if wants_contacts(fields, EMAIL_FIELDS):
+            contacts.append((self._db_manager.execute_read_rows(_LIST_EMAILS_SQL), email_values, EMAIL_FIELDS))
+        if wants_contacts(fields, TELEFONE_FIELDS):
+            contacts.append((self._db_manager.execute_read_rows(_LIST_TELEFONES_SQL), telefone_values, TELEFONE_FIELDS))
+        return attach_contacts(moradores, fields, contacts).as_dicts()
 
 
-    def get_morador_by_cpf(self, cpf: str) -> Optional[dict[str, Any]]:
-        sql = f"{_MORADOR_BASE_QUERY}\nWHERE m.cpf = :cpf"
-        result = self._db_manager.execute_raw_query(sql, {"cpf": cpf})
-        return result[0] if result else None
+    def get_morador_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._db_manager.run_read(_select_morador, cpf, fields)
 
 
     def get_auth_record(self, email: str) -> Optional[dict[str, Any]]:
-        sql = (
-            "SELECT "
-            "\tm.cpf, "
-            "\tm.nome, "
-            "\tm.senha "
-            "FROM MORADOR AS m "
-            "JOIN EMAIL AS em ON em.cpf_morador = m.cpf "
-            "WHERE em.email = :email"
-        )
-        result = self._db_manager.execute_raw_query(sql, {"email": email})
+        result = self._db_manager.execute_read_query(_GET_AUTH_RECORD_SQL, {"email": email})
         return result[0] if result else None
 
 
@@ -69,39 +151,20 @@ class MoradorRepository:
         email: Optional[str],
         telefone: Optional[str],
         ddd: Optional[str],
-    ) -> None:
-        with self._db_manager.engine.begin() as connection:
-            target_cod_local = self._resolve_localidade(
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_morador(
                 connection,
+                cpf=cpf,
+                nome=nome,
+                endereco=endereco,
+                data_nasc=data_nasc,
+                senha=senha,
                 cod_local=cod_local,
                 localidade=localidade,
-            )
-
-            payload = {
-                "cpf": cpf,
-                "nome": nome,
-                "cod_local": target_cod_local,
-                "endereco": endereco,
-                "data_nasc": data_nasc,
-                "senha": senha,
-            }
-
-            connection.execute(
-                text(
-                    "INSERT INTO MORADOR (cpf, nome, cod_local, endereco, data_nasc, senha) "
-                    "VALUES (:cpf, :nome, :cod_local, :endereco, :data_nasc, :senha)"
-                ),
-                payload,
-            )
-
-            self._sync_email(connection, cpf, email, update_email=True)
-            self._sync_telefone(
-                connection,
-                cpf,
-                telefone,
-                ddd,
-                update_telefone=True,
-                update_ddd=True,
+                email=email,
+                telefone=telefone,
+                ddd=ddd,
             )
 
 
@@ -120,150 +183,369 @@ class MoradorRepository:
         update_telefone: bool,
         ddd: Optional[str],
         update_ddd: bool,
-    ) -> None:
-        with self._db_manager.engine.begin() as connection:
-            updates = dict(fields_to_update)
-
-            if update_cod_local or update_localidade:
-                resolved_cod_local = self._resolve_localidade(
-                    connection,
-                    cod_local=cod_local if update_cod_local else None,
-                    localidade=localidade if update_localidade else None,
-                )
-                updates["cod_local"] = resolved_cod_local
-
-            if updates:
-                set_clause = ", ".join(f"{column} = :{column}" for column in updates)
-                params = {**updates, "cpf": cpf}
-                connection.execute(
-                    text(f"UPDATE MORADOR SET {set_clause} WHERE cpf = :cpf"),
-                    params,
-                )
-
-            self._sync_email(connection, cpf, email, update_email)
-            self._sync_telefone(
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _update_morador(
                 connection,
                 cpf,
-                telefone,
-                ddd,
-                update_telefone,
-                update_ddd,
+                fields_to_update=fields_to_update,
+                cod_local=cod_local,
+                update_cod_local=update_cod_local,
+                localidade=localidade,
+                update_localidade=update_localidade,
+                email=email,
+                update_email=update_email,
+                telefone=telefone,
+                update_telefone=update_telefone,
+                ddd=ddd,
+                update_ddd=update_ddd,
             )
 
 
     def delete_morador(self, cpf: str) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM MORADOR WHERE cpf = :cpf"),
-                {"cpf": cpf},
-            )
+        with self._db_manager.begin() as connection:
+            _delete_morador(connection, cpf)
+
+
+    def import_moradores(self, rows: Sequence[Mapping[str, Any]]) -> Dict[int, str]:
+        with self._db_manager.begin() as connection:
+            return _import_moradores(connection, rows)
+
+
+@instrument_repository
+class AsyncMoradorRepository:
 
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_moradores(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        moradores = await self._db_manager.execute_read_rows(_LIST_MORADORES_SQL.for_fields(_morador_columns(fields)))
+        contacts = []
+        if wants_contacts(fields, EMAIL_FIELDS):
+            contacts.append((await self._db_manager.execute_read_rows(_LIST_EMAILS_SQL), email_values, EMAIL_FIELDS))
+        if wants_contacts(fields, TELEFONE_FIELDS):
+            contacts.append((await self._db_manager.execute_read_rows(_LIST_TELEFONES_SQL), telefone_values, TELEFONE_FIELDS))
+        return attach_contacts(moradores, fields, contacts).as_dicts()
+
+
+    async def get_morador_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_read(_select_morador, cpf, fields)
 
-    def _resolve_localidade(
+
+    async def get_auth_record(self, email: str) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_AUTH_RECORD_SQL, {"email": email})
+        return result[0] if result else None
+
+
+    async def create_morador(
         self,
-        connection: Connection,
         *,
+        cpf: str,
+        nome: str,
+        endereco: str,
+        data_nasc: str,
+        senha: str,
         cod_local: Optional[int],
         localidade: Optional[Dict[str, str]],
-    ) -> int:
-        if cod_local is not None:
-            return cod_local
-
-        if not localidade:
-            raise ValueError("Localidade deve ser informada quando cod_local nao for fornecido")
-
-        required_keys = {"estado", "cidade", "bairro"}
-        missing = required_keys - set(localidade.keys())
-        if missing:
-            missing_fields = ", ".join(sorted(missing))
-            raise ValueError(f"Campos de localidade ausentes: {missing_fields}")
-
-        select_sql = text(
-            "SELECT cod_local FROM LOCALIDADE "
-            "WHERE estado = :estado AND cidade = :cidade AND bairro = :bairro "
-            "LIMIT 1"
-        )
-        params = {
-            "estado": localidade["estado"],
-            "cidade": localidade["cidade"],
-            "bairro": localidade["bairro"],
-        }
-
-        result = connection.execute(select_sql, params).first()
-        if result:
-            return int(result[0])
-
-        insert_sql = text(
-            "INSERT INTO LOCALIDADE (estado, cidade, bairro) "
-            "VALUES (:estado, :cidade, :bairro)"
+        email: Optional[str],
+        telefone: Optional[str],
+        ddd: Optional[str],
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _insert_morador,
+            cpf=cpf,
+            nome=nome,
+            endereco=endereco,
+            data_nasc=data_nasc,
+            senha=senha,
+            cod_local=cod_local,
+            localidade=localidade,
+            email=email,
+            telefone=telefone,
+            ddd=ddd,
         )
-        insert_result = connection.execute(insert_sql, params)
-        new_id = insert_result.lastrowid
-        if not new_id:
-            new_id = connection.execute(text("SELECT LAST_INSERT_ID()")).scalar_one()
-        return int(new_id)
 
 
-    def _sync_email(
+    async def update_morador(
         self,
-        connection: Connection,
         cpf: str,
+        *,
+        fields_to_update: Dict[str, Any],
+        cod_local: Optional[int],
+        update_cod_local: bool,
+        localidade: Optional[Dict[str, str]],
+        update_localidade: bool,
         email: Optional[str],
         update_email: bool,
-    ) -> None:
-        if not update_email:
-            return
-
-        connection.execute(
-            text("DELETE FROM EMAIL WHERE cpf_morador = :cpf"),
-            {"cpf": cpf},
+        telefone: Optional[str],
+        update_telefone: bool,
+        ddd: Optional[str],
+        update_ddd: bool,
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _update_morador,
+            cpf,
+            fields_to_update=fields_to_update,
+            cod_local=cod_local,
+            update_cod_local=update_cod_local,
+            localidade=localidade,
+            update_localidade=update_localidade,
+            email=email,
+            update_email=update_email,
+            telefone=telefone,
+            update_telefone=update_telefone,
+            ddd=ddd,
+            update_ddd=update_ddd,
         )
 
-        if email:
-            connection.execute(
-                text("INSERT INTO EMAIL (cpf_morador, email) VALUES (:cpf, :email)"),
-                {"cpf": cpf, "email": email},
-            )
 
+    async def delete_morador(self, cpf: str) -> None:
+        await self._db_manager.run_in_transaction(_delete_morador, cpf)
+
+
+    async def import_moradores(self, rows: Sequence[Mapping[str, Any]]) -> Dict[int, str]:
+        return await self._db_manager.run_in_transaction(_import_moradores, rows)
+
+
+@labelled_query("MoradorRepository")
+def _insert_morador(
+    connection: Connection,
+    *,
+    cpf: str,
+    nome: str,
+    endereco: str,
+    data_nasc: str,
+    senha: str,
+    cod_local: Optional[int],
+    localidade: Optional[Dict[str, str]],
+    email: Optional[str],
+    telefone: Optional[str],
+    ddd: Optional[str],
+) -> Optional[dict[str, Any]]:
+    target_cod_local = localidade_resolver.resolve_cod_local(connection, cod_local, localidade)
+
+    payload = {
+        "cpf": cpf,
+        "nome": nome,
+        "cod_local": target_cod_local,
+        "endereco": endereco,
+        "data_nasc": data_nasc,
+        "senha": senha,
+    }
+
+    connection.execute(
+        _INSERT_MORADOR_SQL,
+        payload,
+    )
+
+    _sync_email(connection, cpf, email, update_email=True)
+    _sync_telefone(
+        connection,
+        cpf,
+        telefone,
+        ddd,
+        update_telefone=True,
+        update_ddd=True,
+    )
+    return _select_morador(connection, cpf)
+
+
+@labelled_query("MoradorRepository")
+def _import_moradores(connection: Connection, rows: Sequence[Mapping[str, Any]]) -> Dict[int, str]:
+    """Grava um bloco da importacao; devolve o motivo de cada linha recusada, por posicao.
+
+    ``rows`` ja validadas, com ``cod_local`` ou ``localidade`` (estado, cidade, bairro).
+    CPFs e telefones repetidos (no bloco ou no banco) e ``cod_local`` inexistentes
+    sao recusados com uma consulta cada; o restante entra com um executemany por
+    tabela, na transacao de ``connection``.
+    """
+    def existing(statement: Any, name: str, values: Set[Any]) -> Set[Any]:
+        if not values:
+            return set()
+        return {row[0] for row in connection.execute(statement, {name: sorted(values)})}
+
+    cpfs = existing(_SELECT_CPFS_SQL, "cpfs", {row["cpf"] for row in rows})
+    telefones = existing(_SELECT_TELEFONES_SQL, "telefones", {row["telefone"] for row in rows if row.get("telefone")})
+    cod_locais = existing(
+        _SELECT_COD_LOCAIS_SQL,
+        "cod_locais",
+        {row["cod_local"] for row in rows if row.get("cod_local") is not None},
+    )
+
+    rejected: Dict[int, str] = {}
+    accepted = []
+    for position, row in enumerate(rows):
+        if row["cpf"] in cpfs:
+            rejected[position] = f"CPF {row['cpf']} ja cadastrado"
+        elif row.get("telefone") and row["telefone"] in telefones:
+            rejected[position] = f"Telefone {row['telefone']} ja cadastrado"
+        elif row.get("cod_local") is not None and row["cod_local"] not in cod_locais:
+            rejected[position] = f"Localidade {row['cod_local']} nao encontrada"
+        else:
+            accepted.append(row)
+            cpfs.add(row["cpf"])
+            if row.get("telefone"):
+                telefones.add(row["telefone"])
+    if not accepted:
+        return rejected
+
+    resolved = localidade_resolver.resolve(connection, {row["localidade"] for row in accepted if row.get("cod_local") is None})
+    connection.execute(
+        _INSERT_MORADOR_SQL,
+        [
+            {
+                "cpf": row["cpf"],
+                "nome": row["nome"],
+                "cod_local": row["cod_local"] if row.get("cod_local") is not None else resolved[row["localidade"]],
+                "endereco": row["endereco"],
+                "data_nasc": row["data_nasc"],
+                "senha": row["senha"],
+            }
+            for row in accepted
+        ],
+    )
+    emails = [{"cpf": row["cpf"], "email": row["email"]} for row in accepted if row.get("email")]
+    if emails:
+        connection.execute(_INSERT_EMAIL_SQL, emails)
+    telefone_rows = [
+        {"cpf": row["cpf"], "telefone": row["telefone"], "ddd": row.get("ddd")} for row in accepted if row.get("telefone")
+    ]
+    if telefone_rows:
+        connection.execute(_INSERT_TELEFONE_SQL, telefone_rows)
+    return rejected
+
+
+@labelled_query("MoradorRepository")
+def _update_morador(
+    connection: Connection,
+    cpf: str,
+    *,
+    fields_to_update: Dict[str, Any],
+    cod_local: Optional[int],
+    update_cod_local: bool,
+    localidade: Optional[Dict[str, str]],
+    update_localidade: bool,
+    email: Optional[str],
+    update_email: bool,
+    telefone: Optional[str],
+    update_telefone: bool,
+    ddd: Optional[str],
+    update_ddd: bool,
+) -> Optional[dict[str, Any]]:
+    updates = dict(fields_to_update)
+
+    if update_cod_local or update_localidade:
+        resolved_cod_local = localidade_resolver.resolve_cod_local(
+            connection,
+            cod_local if update_cod_local else None,
+            localidade if update_localidade else None,
+        )
+        updates["cod_local"] = resolved_cod_local
 
-    def _sync_telefone(
-        self,
-        connection: Connection,
-        cpf: str,
-        telefone: Optional[str],
-        ddd: Optional[str],
-        update_telefone: bool,
-        update_ddd: bool,
-    ) -> None:
-        if not update_telefone and not update_ddd:
-            return
-
-        existing: Optional[Dict[str, Any]] = None
-        if not update_telefone or not update_ddd:
-            row = connection.execute(
-                text(
-                    "SELECT telefone, DDD FROM TELEFONE WHERE cpf_morador = :cpf LIMIT 1"
-                ),
-                {"cpf": cpf},
-            ).first()
-            if row:
-                existing = {"telefone": row[0], "ddd": row[1]}
+    if updates:
+        params = {**updates, "cpf": cpf}
+        connection.execute(
+            statements.update("MORADOR", updates, key_column="cpf"),
+            params,
+        )
 
+    _sync_email(connection, cpf, email, update_email)
+    _sync_telefone(
+        connection,
+        cpf,
+        telefone,
+        ddd,
+        update_telefone,
+        update_ddd,
+    )
+    return _select_morador(connection, cpf)
+
+
+@labelled_query("MoradorRepository")
+def _select_morador(connection: Connection, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+    """Morador com os contatos, em consultas feitas todas em ``connection``."""
+    params = {"cpf": cpf}
+    morador = _read_rows(connection, _GET_MORADOR_BY_CPF_SQL.for_fields(_morador_columns(fields)), params)
+    if not morador.rows:
+        return None
+    contacts = []
+    if wants_contacts(fields, EMAIL_FIELDS):
+        contacts.append((_read_rows(connection, _GET_EMAILS_SQL, params), email_values, EMAIL_FIELDS))
+    if wants_contacts(fields, TELEFONE_FIELDS):
+        contacts.append((_read_rows(connection, _GET_TELEFONES_SQL, params), telefone_values, TELEFONE_FIELDS))
+    return attach_contacts(morador, fields, contacts).first_dict()
+
+
+def _read_rows(connection: Connection, statement: Any, params: Dict[str, Any]) -> RowSet:
+    result = connection.execute(statement, params)
+    return RowSet.from_result_rows(result.keys(), result)
+
+
+@labelled_query("MoradorRepository")
+def _delete_morador(connection: Connection, cpf: str) -> None:
+    connection.execute(
+        _DELETE_MORADOR_SQL,
+        {"cpf": cpf},
+    )
+
+
+
+@labelled_query("MoradorRepository")
+def _sync_email(
+    connection: Connection,
+    cpf: str,
+    email: Optional[str],
+    update_email: bool,
+) -> None:
+    if not update_email:
+        return
+
+    connection.execute(
+        _DELETE_EMAIL_SQL,
+        {"cpf": cpf},
+    )
+
+    if email:
         connection.execute(
-            text("DELETE FROM TELEFONE WHERE cpf_morador = :cpf"),
-            {"cpf": cpf},
+            _INSERT_EMAIL_SQL,
+            {"cpf": cpf, "email": email},
         )
 
-        telefone_value = (
-            telefone if update_telefone else (existing["telefone"] if existing else None)
+
+@labelled_query("MoradorRepository")
+def _sync_telefone(
+    connection: Connection,
+    cpf: str,
+    telefone: Optional[str],
+    ddd: Optional[str],
+    update_telefone: bool,
+    update_ddd: bool,
+) -> None:
+    if not update_telefone and not update_ddd:
+        return
+
+    existing: Optional[Dict[str, Any]] = None
+    if not update_telefone or not update_ddd:
+        row = connection.execute(
+            _SELECT_TELEFONE_SQL,
+            {"cpf": cpf},
+        ).first()
+        if row:
+            existing = {"telefone": row[0], "ddd": row[1]}
+
+    connection.execute(
+        _DELETE_TELEFONE_SQL,
+        {"cpf": cpf},
+    )
+
+    telefone_value = (
+        telefone if update_telefone else (existing["telefone"] if existing else None)
+    )
+    ddd_value = ddd if update_ddd else (existing["ddd"] if existing else None)
+
+    if telefone_value:
+        connection.execute(
+            _INSERT_TELEFONE_SQL,
+            {"telefone": telefone_value, "cpf": cpf, "ddd": ddd_value},
         )
-        ddd_value = ddd if update_ddd else (existing["ddd"] if existing else None)
-
-        if telefone_value:
-            connection.execute(
-                text(
-                    "INSERT INTO TELEFONE (telefone, cpf_morador, DDD) "
-                    "VALUES (:telefone, :cpf, :ddd)"
-                ),
-                {"telefone": telefone_value, "cpf": cpf, "ddd": ddd_value},
-            )
@@ -1,33 +1,123 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import bindparam
 from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
 
-from .databaseManager import DatabaseManager
-
-_OCORRENCIA_BASE_QUERY = (
-    "SELECT \n"
-    "\to.cod_oco,\n"
-    "\to.cod_tipo,\n"
-    "\ttipo.nome AS tipo_nome,\n"
-    "\ttipo.descr AS tipo_descr,\n"
-    "\to.cod_local,\n"
-    "\tloc.estado,\n"
-    "\tloc.cidade,\n"
-    "\tloc.bairro,\n"
-    "\to.endereco,\n"
-    "\to.cpf_morador,\n"
-    "\tmor.nome AS morador_nome,\n"
-    "\to.data,\n"
-    "\to.tipo_status,\n"
-    "\to.descr\n"
-    "FROM OCORRENCIA AS o\n"
-    "LEFT JOIN TIPO_OCORRENCIA AS tipo ON tipo.cod_tipo = o.cod_tipo\n"
-    "LEFT JOIN LOCALIDADE AS loc ON loc.cod_local = o.cod_local\n"
-    "LEFT JOIN MORADOR AS mor ON mor.cpf = o.cpf_morador"
+from .asyncDatabaseManager import AsyncDatabaseManager
+from .avaliacaoRepository import select_avaliacoes_by_ocorrencias
+from .databaseManager import DEFAULT_STREAM_CHUNK_SIZE, DatabaseManager
+from .localidades import LocalidadeKey, localidade_key, localidade_resolver
+from .projection import Projection
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .servicoRepository import select_servicos_by_ocorrencias
+from .statementRegistry import LAST_INSERT_ID_SQL, statements
+
+_OCORRENCIA_PROJECTION = Projection(
+    "FROM OCORRENCIA AS o",
+    (
+        ("cod_oco", "o.cod_oco", ()),
+        ("cod_tipo", "o.cod_tipo", ()),
+        ("tipo_nome", "tipo.nome", ("tipo",)),
+        ("tipo_descr", "tipo.descr", ("tipo",)),
+        ("cod_local", "o.cod_local", ()),
+        ("estado", "loc.estado", ("loc",)),
+        ("cidade", "loc.cidade", ("loc",)),
+        ("bairro", "loc.bairro", ("loc",)),
+        ("endereco", "o.endereco", ()),
+        ("cpf_morador", "o.cpf_morador", ()),
+        ("morador_nome", "mor.nome", ("mor",)),
+        ("data", "o.data", ()),
+        ("tipo_status", "o.tipo_status", ()),
+        ("descr", "o.descr", ()),
+    ),
+    (
+        ("tipo", "LEFT JOIN TIPO_OCORRENCIA AS tipo ON tipo.cod_tipo = o.cod_tipo"),
+        ("loc", "LEFT JOIN LOCALIDADE AS loc ON loc.cod_local = o.cod_local"),
+        ("mor", "LEFT JOIN MORADOR AS mor ON mor.cpf = o.cpf_morador"),
+    ),
+)
+OCORRENCIA_FIELDS = _OCORRENCIA_PROJECTION.fields
+
+_LIST_OCORRENCIAS_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.list_ocorrencias",
+    "\nORDER BY o.data DESC, o.cod_oco DESC",
+)
+_LIST_OCORRENCIAS_BY_MORADOR_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.list_ocorrencias_by_morador",
+    "\nWHERE o.cpf_morador = :cpf\nORDER BY o.data DESC, o.cod_oco DESC",
+)
+# Exportacao completa em ordem crescente de (data, cod_oco), a ordem de
+# idx_ocorrencia_data_cod: ``since`` vira uma faixa do indice, sem ordenacao extra.
+_EXPORT_OCORRENCIAS_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.export_ocorrencias",
+    "\nORDER BY o.data, o.cod_oco",
+)
+_EXPORT_OCORRENCIAS_SINCE_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.export_ocorrencias_since",
+    "\nWHERE o.data >= :since\nORDER BY o.data, o.cod_oco",
+)
+
+# Paginacao por chave (data, cod_oco): cada pagina e uma faixa de um dos indices
+# idx_ocorrencia_*_data_cod, sem OFFSET.
+_KEYSET_ORDER = "ORDER BY o.data DESC, o.cod_oco DESC\nLIMIT :limit"
+_KEYSET_AFTER = "o.data <= :after_data AND (o.data < :after_data OR o.cod_oco < :after_cod_oco)"
+
+# Filtros aceitos pela busca -> condicao SQL. Os valores seguem sempre como
+# parametros; apenas as condicoes escolhidas daqui entram no texto da consulta.
+OCORRENCIA_FILTERS: Dict[str, str] = {
+    "tipo_status": "o.tipo_status = :tipo_status",
+    "cod_tipo": "o.cod_tipo = :cod_tipo",
+    "cod_local": "o.cod_local = :cod_local",
+    "bairro": "loc.bairro = :bairro",
+    "cidade": "loc.cidade = :cidade",
+    "data_inicio": "o.data >= :data_inicio",
+    "data_fim": "o.data <= :data_fim",
+    "cpf_morador": "o.cpf_morador = :cpf_morador",
+    "orgao_pub": "tipo.orgao_pub = :orgao_pub",
+}
+# JOINs exigidos pelos filtros, mesmo quando as colunas da tabela nao sao pedidas.
+_FILTER_JOINS: Dict[str, str] = {"bairro": "loc", "cidade": "loc", "orgao_pub": "tipo"}
+
+_GET_OCORRENCIA_BY_ID_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.get_ocorrencia_by_id",
+    "\nWHERE o.cod_oco = :cod_oco",
+)
+_GET_OCORRENCIAS_BY_IDS_SQL = _OCORRENCIA_PROJECTION.register(
+    "ocorrencia.get_ocorrencias_by_ids",
+    "\nWHERE o.cod_oco IN :cod_ocos",
+).statement.bindparams(bindparam("cod_ocos", expanding=True))
+
+_INSERT_OCORRENCIA_SQL = statements.register(
+    "ocorrencia.insert_ocorrencia",
+    "INSERT INTO OCORRENCIA (cod_tipo, cpf_morador, cod_local, endereco, data, tipo_status, descr) "
+    "VALUES (:cod_tipo, :cpf_morador, :cod_local, :endereco, :data, :tipo_status, :descr)",
 )
+_DELETE_OCORRENCIA_SQL = statements.register(
+    "ocorrencia.delete_ocorrencia",
+    "DELETE FROM OCORRENCIA WHERE cod_oco = :cod_oco",
+)
+
+# Conferencia em lote das referencias de POST /ocorrencias/batch (listas expandidas no IN).
+_SELECT_TIPOS_SQL = statements.register(
+    "ocorrencia.select_tipos",
+    "SELECT cod_tipo FROM TIPO_OCORRENCIA WHERE cod_tipo IN :cod_tipos",
+).bindparams(bindparam("cod_tipos", expanding=True))
+_SELECT_MORADORES_SQL = statements.register(
+    "ocorrencia.select_moradores",
+    "SELECT cpf FROM MORADOR WHERE cpf IN :cpfs",
+).bindparams(bindparam("cpfs", expanding=True))
+_SELECT_COD_LOCAIS_SQL = statements.register(
+    "ocorrencia.select_cod_locais",
+    "SELECT cod_local FROM LOCALIDADE WHERE cod_local IN :cod_locais",
+).bindparams(bindparam("cod_locais", expanding=True))
 
+# Chave de paginacao: (data, cod_oco) da ultima ocorrencia da pagina anterior.
+OcorrenciaKey = Tuple[Any, int]
 
+
+@instrument_repository
 class OcorrenciaRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -35,21 +125,52 @@ class OcorrenciaRepository:
 
 
     def list_ocorrencias(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_OCORRENCIA_BASE_QUERY}\nORDER BY o.data DESC, o.cod_oco DESC"
-        return self._db_manager.execute_raw_query(sql)
+        return self._db_manager.execute_read_query(_LIST_OCORRENCIAS_SQL.statement)
 
 
-    def list_ocorrencias_by_morador(self, cpf: str) -> Sequence[dict[str, Any]]:
-        sql = f"{_OCORRENCIA_BASE_QUERY}\nWHERE o.cpf_morador = :cpf\nORDER BY o.data DESC, o.cod_oco DESC"
-        return self._db_manager.execute_raw_query(sql, {"cpf": cpf})
+    def stream_ocorrencias(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[RowSet]:
+        return self._db_manager.stream_raw_rows(_LIST_OCORRENCIAS_SQL.for_fields(fields), chunk_size=chunk_size)
+
+
+    def export_ocorrencias(
+        self,
+        since: Optional[str] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[RowSet]:
+        statement, params = _export_statement(since, fields)
+        return self._db_manager.stream_raw_rows(statement, params, chunk_size=chunk_size)
+
+
+    def list_ocorrencias_by_morador(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return self._db_manager.execute_read_query(_LIST_OCORRENCIAS_BY_MORADOR_SQL.for_fields(fields), {"cpf": cpf})
+
+
+    def search_ocorrencias(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[OcorrenciaKey] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        statement, params = _search_statement(filters, limit, after, fields)
+        return self._db_manager.execute_read_rows(statement, params)
 
 
     def get_ocorrencia_by_id(self, cod_oco: int) -> Optional[dict[str, Any]]:
-        sql = f"{_OCORRENCIA_BASE_QUERY}\nWHERE o.cod_oco = :cod_oco"
-        result = self._db_manager.execute_raw_query(sql, {"cod_oco": cod_oco})
+        result = self._db_manager.execute_read_query(_GET_OCORRENCIA_BY_ID_SQL.statement, {"cod_oco": cod_oco})
         return result[0] if result else None
 
 
+    def get_ocorrencias_full(self, cod_ocos: Sequence[int]) -> List[dict[str, Any]]:
+        return self._db_manager.run_read(_select_ocorrencias_full, cod_ocos)
+
+
     def create_ocorrencia(
         self,
         *,
@@ -61,37 +182,32 @@ class OcorrenciaRepository:
         tipo_status: str,
         descr: Optional[str],
         localidade: Optional[Dict[str, str]],
-    ) -> int:
-        with self._db_manager.engine.begin() as connection:
-            target_cod_local = self._resolve_localidade(
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_ocorrencia(
                 connection,
+                cod_tipo=cod_tipo,
+                cpf_morador=cpf_morador,
                 cod_local=cod_local,
+                endereco=endereco,
+                data=data,
+                tipo_status=tipo_status,
+                descr=descr,
                 localidade=localidade,
             )
 
-            insert_payload = {
-                "cod_tipo": cod_tipo,
-                "cpf_morador": cpf_morador,
-                "cod_local": target_cod_local,
-                "endereco": endereco,
-                "data": data,
-                "tipo_status": tipo_status,
-                "descr": descr,
-            }
-
-            result = connection.execute(
-                text(
-                    "INSERT INTO OCORRENCIA (cod_tipo, cpf_morador, cod_local, endereco, data, tipo_status, descr) "
-                    "VALUES (:cod_tipo, :cpf_morador, :cod_local, :endereco, :data, :tipo_status, :descr)"
-                ),
-                insert_payload,
-            )
 
-            cod_oco = result.lastrowid
-            if not cod_oco:
-                cod_oco = connection.execute(text("SELECT LAST_INSERT_ID()")).scalar_one()
+    def prepare_ocorrencias(
+        self,
+        items: Sequence[Mapping[str, Any]],
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, str]]:
+        with self._db_manager.begin() as connection:
+            return _prepare_ocorrencias(connection, items)
+
 
-        return int(cod_oco)
+    def insert_ocorrencias(self, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+        with self._db_manager.begin() as connection:
+            return _insert_ocorrencias(connection, rows)
 
 
     def update_ocorrencia(
@@ -103,75 +219,359 @@ class OcorrenciaRepository:
         update_cod_local: bool,
         localidade: Optional[Dict[str, str]],
         update_localidade: bool,
-    ) -> None:
-        with self._db_manager.engine.begin() as connection:
-            updates = dict(fields_to_update)
-
-            if update_cod_local or update_localidade:
-                resolved_cod_local = self._resolve_localidade(
-                    connection,
-                    cod_local=cod_local if update_cod_local else None,
-                    localidade=localidade if update_localidade else None,
-                )
-                updates["cod_local"] = resolved_cod_local
-
-            if updates:
-                set_clause = ", ".join(f"{column} = :{column}" for column in updates)
-                params = {**updates, "cod_oco": cod_oco}
-                connection.execute(
-                    text(f"UPDATE OCORRENCIA SET {set_clause} WHERE cod_oco = :cod_oco"),
-                    params,
-                )
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _update_ocorrencia(
+                connection,
+                cod_oco,
+                fields_to_update=fields_to_update,
+                cod_local=cod_local,
+                update_cod_local=update_cod_local,
+                localidade=localidade,
+                update_localidade=update_localidade,
+            )
 
 
     def delete_ocorrencia(self, cod_oco: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM OCORRENCIA WHERE cod_oco = :cod_oco"),
-                {"cod_oco": cod_oco},
-            )
+        with self._db_manager.begin() as connection:
+            _delete_ocorrencia(connection, cod_oco)
+
+
+@instrument_repository
+class AsyncOcorrenciaRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_ocorrencias(self) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_OCORRENCIAS_SQL.statement)
+
+
+    def stream_ocorrencias(
+        self,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[RowSet]:
+        return self._db_manager.stream_raw_rows(_LIST_OCORRENCIAS_SQL.for_fields(fields), chunk_size=chunk_size)
+
+
+    def export_ocorrencias(
+        self,
+        since: Optional[str] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[RowSet]:
+        statement, params = _export_statement(since, fields)
+        return self._db_manager.stream_raw_rows(statement, params, chunk_size=chunk_size)
+
+
+    async def list_ocorrencias_by_morador(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_OCORRENCIAS_BY_MORADOR_SQL.for_fields(fields), {"cpf": cpf})
+
+
+    async def search_ocorrencias(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[OcorrenciaKey] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        statement, params = _search_statement(filters, limit, after, fields)
+        return await self._db_manager.execute_read_rows(statement, params)
+
+
+    async def get_ocorrencia_by_id(self, cod_oco: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_OCORRENCIA_BY_ID_SQL.statement, {"cod_oco": cod_oco})
+        return result[0] if result else None
+
+
+    async def get_ocorrencias_full(self, cod_ocos: Sequence[int]) -> List[dict[str, Any]]:
+        return await self._db_manager.run_read(_select_ocorrencias_full, cod_ocos)
+
+
+    async def create_ocorrencia(
+        self,
+        *,
+        cod_tipo: int,
+        cpf_morador: str,
+        cod_local: Optional[int],
+        endereco: str,
+        data: str,
+        tipo_status: str,
+        descr: Optional[str],
+        localidade: Optional[Dict[str, str]],
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _insert_ocorrencia,
+            cod_tipo=cod_tipo,
+            cpf_morador=cpf_morador,
+            cod_local=cod_local,
+            endereco=endereco,
+            data=data,
+            tipo_status=tipo_status,
+            descr=descr,
+            localidade=localidade,
+        )
 
 
-    def _resolve_localidade(
+    async def prepare_ocorrencias(
         self,
-        connection: Connection,
+        items: Sequence[Mapping[str, Any]],
+    ) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, str]]:
+        return await self._db_manager.run_in_transaction(_prepare_ocorrencias, items)
+
+
+    async def insert_ocorrencias(self, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+        return await self._db_manager.run_in_transaction(_insert_ocorrencias, rows)
+
+
+    async def update_ocorrencia(
+        self,
+        cod_oco: int,
         *,
+        fields_to_update: Dict[str, Any],
         cod_local: Optional[int],
+        update_cod_local: bool,
         localidade: Optional[Dict[str, str]],
-    ) -> int:
-        if cod_local is not None:
-            return cod_local
-
-        if not localidade:
-            raise ValueError("Localidade deve ser informada quando cod_local nao for fornecido")
-
-        required_keys = {"estado", "cidade", "bairro"}
-        missing = required_keys - set(localidade.keys())
-        if missing:
-            missing_fields = ", ".join(sorted(missing))
-            raise ValueError(f"Campos de localidade ausentes: {missing_fields}")
-
-        select_sql = text(
-            "SELECT cod_local FROM LOCALIDADE "
-            "WHERE estado = :estado AND cidade = :cidade AND bairro = :bairro "
-            "LIMIT 1"
+        update_localidade: bool,
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _update_ocorrencia,
+            cod_oco,
+            fields_to_update=fields_to_update,
+            cod_local=cod_local,
+            update_cod_local=update_cod_local,
+            localidade=localidade,
+            update_localidade=update_localidade,
         )
-        params = {
-            "estado": localidade["estado"],
-            "cidade": localidade["cidade"],
-            "bairro": localidade["bairro"],
-        }
-
-        result = connection.execute(select_sql, params).first()
-        if result:
-            return int(result[0])
-
-        insert_sql = text(
-            "INSERT INTO LOCALIDADE (estado, cidade, bairro) "
-            "VALUES (:estado, :cidade, :bairro)"
+
+
+    async def delete_ocorrencia(self, cod_oco: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_ocorrencia, cod_oco)
+
+
+@labelled_query("OcorrenciaRepository")
+def _select_ocorrencias_full(connection: Connection, cod_ocos: Sequence[int]) -> List[dict[str, Any]]:
+    """Ocorrencias com ``servicos`` e ``avaliacao``, na ordem de ``cod_ocos``.
+
+    Sempre tres consultas (ocorrencias, servicos, avaliacoes) com ``IN``, na mesma
+    conexao, qualquer que seja a quantidade de codigos; os ausentes sao omitidos.
+    """
+    cod_ocos = list(dict.fromkeys(cod_ocos))
+    if not cod_ocos:
+        return []
+    result = connection.execute(_GET_OCORRENCIAS_BY_IDS_SQL, {"cod_ocos": cod_ocos})
+    ocorrencias = {row["cod_oco"]: row for row in RowSet.from_result_rows(result.keys(), result).as_dicts()}
+    if not ocorrencias:
+        return []
+
+    found = list(ocorrencias)
+    for ocorrencia in ocorrencias.values():
+        ocorrencia["servicos"] = []
+        ocorrencia["avaliacao"] = None
+    for servico in select_servicos_by_ocorrencias(connection, found).as_dicts():
+        ocorrencias[servico["cod_ocorrencia"]]["servicos"].append(servico)
+    # Como em GET /avaliacoes/ocorrencia/{cod}: uma avaliacao por ocorrencia, a primeira registrada.
+    for avaliacao in select_avaliacoes_by_ocorrencias(connection, found).as_dicts():
+        ocorrencia = ocorrencias[avaliacao["cod_ocorrencia"]]
+        if ocorrencia["avaliacao"] is None:
+            ocorrencia["avaliacao"] = avaliacao
+    return [ocorrencias[cod_oco] for cod_oco in cod_ocos if cod_oco in ocorrencias]
+
+
+def _export_statement(since: Optional[str], fields: Optional[Sequence[str]]) -> Tuple[TextClause, Dict[str, Any]]:
+    if since is None:
+        return _EXPORT_OCORRENCIAS_SQL.for_fields(fields), {}
+    return _EXPORT_OCORRENCIAS_SINCE_SQL.for_fields(fields), {"since": since}
+
+
+def _search_statement(
+    filters: Mapping[str, Any],
+    limit: int,
+    after: Optional[OcorrenciaKey],
+    fields: Optional[Sequence[str]] = None,
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """Busca com os filtros informados (``None`` e ignorado), ja paginada."""
+    active = sorted(name for name, value in filters.items() if value is not None)
+    unknown = [name for name in active if name not in OCORRENCIA_FILTERS]
+    if unknown:
+        raise ValueError(f"Filtros de ocorrencia desconhecidos: {', '.join(unknown)}")
+
+    params: Dict[str, Any] = {name: filters[name] for name in active}
+    params["limit"] = limit
+    conditions = [OCORRENCIA_FILTERS[name] for name in active]
+    if after:
+        params["after_data"], params["after_cod_oco"] = after
+        conditions.append(_KEYSET_AFTER)
+
+    # A combinacao de filtros e campos vem da query string: LRU limitado, sem registro.
+    select = _OCORRENCIA_PROJECTION.select(fields, joins={_FILTER_JOINS[name] for name in active if name in _FILTER_JOINS})
+    where = f"\nWHERE {' AND '.join(conditions)}" if conditions else ""
+    return statements.dynamic(f"{select}{where}\n{_KEYSET_ORDER}"), params
+
+
+@labelled_query("OcorrenciaRepository")
+def _insert_ocorrencia(
+    connection: Connection,
+    *,
+    cod_tipo: int,
+    cpf_morador: str,
+    cod_local: Optional[int],
+    endereco: str,
+    data: str,
+    tipo_status: str,
+    descr: Optional[str],
+    localidade: Optional[Dict[str, str]],
+) -> Optional[dict[str, Any]]:
+    target_cod_local = localidade_resolver.resolve_cod_local(connection, cod_local, localidade)
+
+    insert_payload = {
+        "cod_tipo": cod_tipo,
+        "cpf_morador": cpf_morador,
+        "cod_local": target_cod_local,
+        "endereco": endereco,
+        "data": data,
+        "tipo_status": tipo_status,
+        "descr": descr,
+    }
+
+    result = connection.execute(
+        _INSERT_OCORRENCIA_SQL,
+        insert_payload,
+    )
+
+    cod_oco = result.lastrowid
+    if not cod_oco:
+        cod_oco = connection.execute(LAST_INSERT_ID_SQL).scalar_one()
+
+    return _select_ocorrencia(connection, int(cod_oco))
+
+
+@labelled_query("OcorrenciaRepository")
+def _prepare_ocorrencias(
+    connection: Connection,
+    items: Sequence[Mapping[str, Any]],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], Dict[int, str]]:
+    """Linhas prontas para ``_insert_ocorrencias`` e erros, ambos por indice do item.
+
+    Tipos, moradores e ``cod_local`` informados sao conferidos com uma consulta
+    cada, e as localidades distintas sao resolvidas de uma vez (as que faltam sao
+    criadas com executemany), em vez de consultas por item.
+    """
+    errors: Dict[int, str] = {}
+    localidades: Dict[int, LocalidadeKey] = {}
+    for index, item in enumerate(items):
+        if item.get("cod_local") is not None:
+            continue
+        try:
+            localidades[index] = localidade_key(item.get("localidade"))
+        except ValueError as exc:
+            errors[index] = str(exc)
+
+    def existing(statement: TextClause, name: str, values: Iterable[Any]) -> Set[Any]:
+        values = sorted(set(values))
+        if not values:
+            return set()
+        return {row[0] for row in connection.execute(statement, {name: values})}
+
+    tipos = existing(_SELECT_TIPOS_SQL, "cod_tipos", (item["cod_tipo"] for item in items))
+    moradores = existing(_SELECT_MORADORES_SQL, "cpfs", (item["cpf_morador"] for item in items))
+    cod_locais = existing(
+        _SELECT_COD_LOCAIS_SQL,
+        "cod_locais",
+        (item["cod_local"] for item in items if item.get("cod_local") is not None),
+    )
+    resolved = localidade_resolver.resolve(connection, set(localidades.values()))
+
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        if item["cod_tipo"] not in tipos:
+            errors[index] = f"Tipo de ocorrencia {item['cod_tipo']} nao encontrado"
+        elif item["cpf_morador"] not in moradores:
+            errors[index] = f"Morador {item['cpf_morador']} nao encontrado"
+        elif index not in localidades and item["cod_local"] not in cod_locais:
+            errors[index] = f"Localidade {item['cod_local']} nao encontrada"
+        else:
+            cod_local = resolved[localidades[index]] if index in localidades else item["cod_local"]
+            rows.append(
+                (
+                    index,
+                    {
+                        "cod_tipo": item["cod_tipo"],
+                        "cpf_morador": item["cpf_morador"],
+                        "cod_local": cod_local,
+                        "endereco": item["endereco"],
+                        "data": item["data"],
+                        "tipo_status": item["tipo_status"],
+                        "descr": item.get("descr"),
+                    },
+                )
+            )
+    return rows, errors
+
+
+@labelled_query("OcorrenciaRepository")
+def _insert_ocorrencias(connection: Connection, rows: Sequence[Mapping[str, Any]]) -> List[int]:
+    """Grava as linhas na transacao de ``connection`` e devolve os cod_oco, na ordem.
+
+    Uma execucao por linha: o MySQL nao devolve os ids de um executemany (sem
+    RETURNING, e com innodb_autoinc_lock_mode=2 eles nem sao consecutivos).
+    """
+    cod_ocos = []
+    for row in rows:
+        result = connection.execute(_INSERT_OCORRENCIA_SQL, row)
+        cod_oco = result.lastrowid
+        if not cod_oco:
+            cod_oco = connection.execute(LAST_INSERT_ID_SQL).scalar_one()
+        cod_ocos.append(int(cod_oco))
+    return cod_ocos
+
+
+@labelled_query("OcorrenciaRepository")
+def _update_ocorrencia(
+    connection: Connection,
+    cod_oco: int,
+    *,
+    fields_to_update: Dict[str, Any],
+    cod_local: Optional[int],
+    update_cod_local: bool,
+    localidade: Optional[Dict[str, str]],
+    update_localidade: bool,
+) -> Optional[dict[str, Any]]:
+    updates = dict(fields_to_update)
+
+    if update_cod_local or update_localidade:
+        resolved_cod_local = localidade_resolver.resolve_cod_local(
+            connection,
+            cod_local if update_cod_local else None,
+            localidade if update_localidade else None,
         )
-        insert_result = connection.execute(insert_sql, params)
-        new_id = insert_result.lastrowid
-        if not new_id:
-            new_id = connection.execute(text("SELECT LAST_INSERT_ID()")).scalar_one()
-        return int(new_id)
+        updates["cod_local"] = resolved_cod_local
+
+    if updates:
+        params = {**updates, "cod_oco": cod_oco}
+        connection.execute(
+            statements.update("OCORRENCIA", updates, key_column="cod_oco"),
+            params,
+        )
+
+    return _select_ocorrencia(connection, cod_oco)
+
+
+@labelled_query("OcorrenciaRepository")
+def _select_ocorrencia(connection: Connection, cod_oco: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_OCORRENCIA_BY_ID_SQL.statement, {"cod_oco": cod_oco})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
+
+
+@labelled_query("OcorrenciaRepository")
+def _delete_ocorrencia(connection: Connection, cod_oco: int) -> None:
+    connection.execute(
+        _DELETE_OCORRENCIA_SQL,
+        {"cod_oco": cod_oco},
+    )
+
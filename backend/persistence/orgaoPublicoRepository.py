@@ -1,8 +1,12 @@
 from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
 from .databaseManager import DatabaseManager
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import LAST_INSERT_ID_SQL, statements
 
 _ORGAO_BASE_QUERY = (
     "SELECT \n"
@@ -15,7 +19,27 @@ _ORGAO_BASE_QUERY = (
     "FROM ORGAO_PUBLICO AS orgao"
 )
 
+_LIST_ORGAOS_SQL = statements.register(
+    "orgao_publico.list_orgaos",
+    f"{_ORGAO_BASE_QUERY}\nORDER BY orgao.nome",
+)
+_GET_ORGAO_BY_ID_SQL = statements.register(
+    "orgao_publico.get_orgao_by_id",
+    f"{_ORGAO_BASE_QUERY}\nWHERE orgao.cod_orgao = :cod_orgao",
+)
+
+_INSERT_ORGAO_SQL = statements.register(
+    "orgao_publico.insert_orgao",
+    "INSERT INTO ORGAO_PUBLICO (nome, estado, descr, data_ini, data_fim) "
+    "VALUES (:nome, :estado, :descr, :data_ini, :data_fim)",
+)
+_DELETE_ORGAO_SQL = statements.register(
+    "orgao_publico.delete_orgao",
+    "DELETE FROM ORGAO_PUBLICO WHERE cod_orgao = :cod_orgao",
+)
 
+
+@instrument_repository
 class OrgaoPublicoRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -23,13 +47,11 @@ class OrgaoPublicoRepository:
 
 
     def list_orgaos_publicos(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_ORGAO_BASE_QUERY}\nORDER BY orgao.nome"
-        return self._db_manager.execute_raw_query(sql)
+        return self._db_manager.execute_read_query(_LIST_ORGAOS_SQL)
 
 
     def get_orgao_by_id(self, cod_orgao: int) -> Optional[dict[str, Any]]:
-        sql = f"{_ORGAO_BASE_QUERY}\nWHERE orgao.cod_orgao = :cod_orgao"
-        result = self._db_manager.execute_raw_query(sql, {"cod_orgao": cod_orgao})
+        result = self._db_manager.execute_read_query(_GET_ORGAO_BY_ID_SQL, {"cod_orgao": cod_orgao})
         return result[0] if result else None
 
 
@@ -41,50 +63,124 @@ class OrgaoPublicoRepository:
         descr: Optional[str],
         data_ini: str,
         data_fim: Optional[str],
-    ) -> int:
-        insert_sql = (
-            "INSERT INTO ORGAO_PUBLICO (nome, estado, descr, data_ini, data_fim) "
-            "VALUES (:nome, :estado, :descr, :data_ini, :data_fim)"
-        )
-
-        with self._db_manager.engine.begin() as connection:
-            result = connection.execute(
-                text(insert_sql),
-                {
-                    "nome": nome,
-                    "estado": estado,
-                    "descr": descr,
-                    "data_ini": data_ini,
-                    "data_fim": data_fim,
-                },
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_orgao_publico(
+                connection,
+                nome=nome,
+                estado=estado,
+                descr=descr,
+                data_ini=data_ini,
+                data_fim=data_fim,
             )
-            cod_orgao = result.lastrowid
-            if not cod_orgao:
-                cod_orgao_result = connection.execute(text("SELECT LAST_INSERT_ID()"))
-                cod_orgao = cod_orgao_result.scalar_one()
-
-        return int(cod_orgao)
 
 
-    def update_orgao_publico(self, cod_orgao: int, fields_to_update: Dict[str, Any]) -> None:
+    def update_orgao_publico(self, cod_orgao: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
         if not fields_to_update:
-            return
-
-        with self._db_manager.engine.begin() as connection:
-            set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update)
-            params = {**fields_to_update, "cod_orgao": cod_orgao}
-            connection.execute(
-                text(
-                    f"UPDATE ORGAO_PUBLICO SET {set_clause} "
-                    "WHERE cod_orgao = :cod_orgao"
-                ),
-                params,
-            )
+            return self.get_orgao_by_id(cod_orgao)
+
+        with self._db_manager.begin() as connection:
+            return _update_orgao_publico(connection, cod_orgao, fields_to_update)
 
 
     def delete_orgao_publico(self, cod_orgao: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM ORGAO_PUBLICO WHERE cod_orgao = :cod_orgao"),
-                {"cod_orgao": cod_orgao},
-            )
+        with self._db_manager.begin() as connection:
+            _delete_orgao_publico(connection, cod_orgao)
+
+
+@instrument_repository
+class AsyncOrgaoPublicoRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_orgaos_publicos(self) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_ORGAOS_SQL)
+
+
+    async def get_orgao_by_id(self, cod_orgao: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_ORGAO_BY_ID_SQL, {"cod_orgao": cod_orgao})
+        return result[0] if result else None
+
+
+    async def create_orgao_publico(
+        self,
+        *,
+        nome: str,
+        estado: str,
+        descr: Optional[str],
+        data_ini: str,
+        data_fim: Optional[str],
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _insert_orgao_publico,
+            nome=nome,
+            estado=estado,
+            descr=descr,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+
+
+    async def update_orgao_publico(self, cod_orgao: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+        if not fields_to_update:
+            return await self.get_orgao_by_id(cod_orgao)
+
+        return await self._db_manager.run_in_transaction(_update_orgao_publico, cod_orgao, fields_to_update)
+
+
+    async def delete_orgao_publico(self, cod_orgao: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_orgao_publico, cod_orgao)
+
+
+@labelled_query("OrgaoPublicoRepository")
+def _insert_orgao_publico(
+    connection: Connection,
+    *,
+    nome: str,
+    estado: str,
+    descr: Optional[str],
+    data_ini: str,
+    data_fim: Optional[str],
+) -> Optional[dict[str, Any]]:
+    result = connection.execute(
+        _INSERT_ORGAO_SQL,
+        {
+            "nome": nome,
+            "estado": estado,
+            "descr": descr,
+            "data_ini": data_ini,
+            "data_fim": data_fim,
+        },
+    )
+    cod_orgao = result.lastrowid
+    if not cod_orgao:
+        cod_orgao_result = connection.execute(LAST_INSERT_ID_SQL)
+        cod_orgao = cod_orgao_result.scalar_one()
+
+    return _select_orgao(connection, int(cod_orgao))
+
+
+@labelled_query("OrgaoPublicoRepository")
+def _update_orgao_publico(connection: Connection, cod_orgao: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+    params = {**fields_to_update, "cod_orgao": cod_orgao}
+    connection.execute(
+        statements.update("ORGAO_PUBLICO", fields_to_update, key_column="cod_orgao"),
+        params,
+    )
+    return _select_orgao(connection, cod_orgao)
+
+
+@labelled_query("OrgaoPublicoRepository")
+def _delete_orgao_publico(connection: Connection, cod_orgao: int) -> None:
+    connection.execute(
+        _DELETE_ORGAO_SQL,
+        {"cod_orgao": cod_orgao},
+    )
+
+
+@labelled_query("OrgaoPublicoRepository")
+def _select_orgao(connection: Connection, cod_orgao: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_ORGAO_BY_ID_SQL, {"cod_orgao": cod_orgao})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
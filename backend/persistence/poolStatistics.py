@@ -0,0 +1,214 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+_DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# COMMIT apos o SELECT + ROLLBACK de reset quando a conexao volta ao pool.
+ROUND_TRIPS_SAVED_PER_READ = 2
+
+_request_round_trips_saved: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_round_trips_saved",
+    default=None,
+)
+
+
+class LatencyHistogram:
+
+    def __init__(self, buckets: Sequence[float] = _DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+
+    @property
+    def buckets(self) -> Sequence[float]:
+        return self._buckets
+
+
+    def observe(self, seconds: float) -> None:
+        index = len(self._buckets)
+        for position, upper_bound in enumerate(self._buckets):
+            if seconds <= upper_bound:
+                index = position
+                break
+
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+            maximum = self._max
+
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for upper_bound, count in zip(self._buckets, counts):
+            running += count
+            cumulative[str(upper_bound)] = running
+        cumulative["+Inf"] = total
+
+        return {
+            "count": total,
+            "sum": total_sum,
+            "avg": total_sum / total if total else 0.0,
+            "max": maximum,
+            "buckets": cumulative,
+        }
+
+
+class PoolStatistics:
+    """Coleta metricas do pool de conexoes de um Engine.
+
+    O tempo de espera e medido pelo DatabaseManager ao redor de ``engine.connect()``;
+    o tempo de uso de cada conexao e medido pelos eventos ``checkout``/``checkin``.
+    """
+
+    def __init__(self) -> None:
+        self.wait_time = LatencyHistogram()
+        self.hold_time = LatencyHistogram()
+        self._timeouts = 0
+        self._connections_created = 0
+        self._checkouts = 0
+        self._lock = threading.Lock()
+
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_time.observe(seconds)
+
+
+    def record_timeout(self, seconds: float) -> None:
+        self.wait_time.observe(seconds)
+        with self._lock:
+            self._timeouts += 1
+
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            timeouts = self._timeouts
+            connections_created = self._connections_created
+            checkouts = self._checkouts
+
+        return {
+            "pool_class": type(pool).__name__,
+            "size": _pool_metric(pool, "size"),
+            "checked_out": _pool_metric(pool, "checkedout"),
+            "checked_in": _pool_metric(pool, "checkedin"),
+            "overflow": _pool_metric(pool, "overflow"),
+            "checkouts": checkouts,
+            "connections_created": connections_created,
+            "timeouts": timeouts,
+            "wait_time_seconds": self.wait_time.snapshot(),
+            "hold_time_seconds": self.hold_time.snapshot(),
+        }
+
+
+    def _on_connect(self, _dbapi_connection: Any, _connection_record: Any) -> None:
+        with self._lock:
+            self._connections_created += 1
+
+
+    def _on_checkout(self, _dbapi_connection: Any, connection_record: Any, _proxy: Any) -> None:
+        connection_record.info["checkout_started"] = time.perf_counter()
+        with self._lock:
+            self._checkouts += 1
+
+
+    def _on_checkin(self, _dbapi_connection: Any, connection_record: Any) -> None:
+        started = connection_record.info.pop("checkout_started", None)
+        if started is not None:
+            self.hold_time.observe(time.perf_counter() - started)
+
+
+class ReadPathStatistics:
+    """Contabiliza as consultas feitas pelo caminho somente leitura.
+
+    Alem do total acumulado, soma as idas ao banco economizadas no contador da
+    requisicao corrente, quando houver um aberto por ``track_request_round_trips``.
+    """
+
+    def __init__(self) -> None:
+        self._reads = 0
+        self._round_trips_saved = 0
+        self._lock = threading.Lock()
+
+
+    def record_read(self) -> None:
+        with self._lock:
+            self._reads += 1
+            self._round_trips_saved += ROUND_TRIPS_SAVED_PER_READ
+
+        request_counter = _request_round_trips_saved.get()
+        if request_counter is not None:
+            request_counter[0] += ROUND_TRIPS_SAVED_PER_READ
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "reads": self._reads,
+                "round_trips_saved": self._round_trips_saved,
+                "round_trips_saved_per_read": ROUND_TRIPS_SAVED_PER_READ,
+            }
+
+
+@contextmanager
+def track_request_round_trips() -> Iterator[List[int]]:
+    counter = [0]
+    token = _request_round_trips_saved.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_round_trips_saved.reset(token)
+
+
+def prometheus_histogram(name: str, labels: Dict[str, str], snapshot: Dict[str, Any]) -> List[str]:
+    """Linhas no formato texto do Prometheus para um ``LatencyHistogram.snapshot()``."""
+    lines = []
+    for upper_bound, count in snapshot["buckets"].items():
+        bucket_labels = prometheus_labels({**labels, "le": upper_bound})
+        lines.append(f"{name}_bucket{bucket_labels} {count}")
+    label_text = prometheus_labels(labels)
+    lines.append(f"{name}_sum{label_text} {snapshot['sum']}")
+    lines.append(f"{name}_count{label_text} {snapshot['count']}")
+    return lines
+
+
+def prometheus_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{key}="{_escape_label(str(value))}"' for key, value in labels.items())
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _pool_metric(pool: Pool, name: str) -> Optional[int]:
+    metric = getattr(pool, name, None)
+    if not callable(metric):
+        return None
+    return int(metric())
@@ -0,0 +1,88 @@
+from typing import Collection, Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy.sql.elements import TextClause
+
+from .statementRegistry import statements
+
+# (nome na resposta, expressao SQL, aliases dos JOINs de que a coluna depende)
+ProjectionColumn = Tuple[str, str, Tuple[str, ...]]
+
+
+class Projection:
+    """Consulta base descrita coluna a coluna, para montar SELECTs parciais.
+
+    ``select`` emite apenas as colunas pedidas e os JOINs de que elas (ou o WHERE)
+    dependem; sem ``fields`` o texto e o mesmo da consulta base completa.
+    """
+
+    def __init__(
+        self,
+        from_clause: str,
+        columns: Sequence[ProjectionColumn],
+        joins: Sequence[Tuple[str, str]] = (),
+    ) -> None:
+        self._from_clause = from_clause
+        self._columns: Dict[str, ProjectionColumn] = {column[0]: column for column in columns}
+        self._joins = tuple(joins)
+        self.fields: Tuple[str, ...] = tuple(self._columns)
+
+
+    def validate(self, fields: Iterable[str]) -> Tuple[str, ...]:
+        """Campos na ordem da consulta base; ``ValueError`` para os desconhecidos."""
+        requested = set(fields)
+        unknown = sorted(requested - set(self._columns))
+        if unknown:
+            raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}")
+        if not requested:
+            raise ValueError("Informe ao menos um campo")
+        return tuple(field for field in self.fields if field in requested)
+
+
+    def select(self, fields: Optional[Iterable[str]] = None, *, joins: Collection[str] = ()) -> str:
+        selected = self.fields if fields is None else self.validate(fields)
+        needed = set(joins)
+        select_list = []
+        for field in selected:
+            _, expression, aliases = self._columns[field]
+            needed.update(aliases)
+            bare = expression == field or expression.endswith(f".{field}")
+            select_list.append(expression if bare else f"{expression} AS {field}")
+
+        lines = ["SELECT ", ",\n".join(f"\t{item}" for item in select_list), self._from_clause]
+        lines.extend(join for alias, join in self._joins if alias in needed)
+        return "\n".join(lines)
+
+
+    def statement(
+        self,
+        fields: Optional[Iterable[str]],
+        suffix: str = "",
+        *,
+        joins: Collection[str] = (),
+    ) -> TextClause:
+        """Instrucao parcial, no LRU limitado de ``statements.dynamic`` (os campos vem do cliente)."""
+        return statements.dynamic(f"{self.select(fields, joins=joins)}{suffix}")
+
+
+    def register(self, name: str, suffix: str = "", *, joins: Collection[str] = ()) -> "ProjectedStatement":
+        return ProjectedStatement(self, name, suffix, joins=joins)
+
+
+class ProjectedStatement:
+    """Instrucao da consulta base com um sufixo fixo (WHERE/ORDER BY).
+
+    A versao completa e registrada na importacao; as parciais sao montadas a
+    cada pedido e reaproveitadas pelo LRU limitado de ``statements.dynamic``.
+    """
+
+    def __init__(self, projection: Projection, name: str, suffix: str = "", *, joins: Collection[str] = ()) -> None:
+        self._projection = projection
+        self._suffix = suffix
+        self._joins = tuple(joins)
+        self.statement = statements.register(name, f"{projection.select(joins=self._joins)}{suffix}")
+
+
+    def for_fields(self, fields: Optional[Iterable[str]] = None) -> TextClause:
+        if fields is None:
+            return self.statement
+        return self._projection.statement(fields, self._suffix, joins=self._joins)
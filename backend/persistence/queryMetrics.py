@@ -0,0 +1,190 @@
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .poolStatistics import LatencyHistogram, prometheus_histogram, prometheus_labels
+
+QUERY_LABEL_OPTION = "query_label"
+UNLABELLED_QUERY = "unlabelled"
+
+_MAX_ROWCOUNT = 2 ** 63
+
+_current_query_label: ContextVar[Optional[str]] = ContextVar("current_query_label", default=None)
+
+F = TypeVar("F", bound=Callable[..., Any])
+C = TypeVar("C", bound=type)
+
+
+@contextmanager
+def query_label(label: str) -> Iterator[None]:
+    token = _current_query_label.set(label)
+    try:
+        yield
+    finally:
+        _current_query_label.reset(token)
+
+
+def current_query_label() -> Optional[str]:
+    return _current_query_label.get()
+
+
+def labelled_query(repository: str) -> Callable[[F], F]:
+    """Rotula as consultas de uma funcao de escrita como ``<repository>.<funcao>``."""
+    def decorator(fn: F) -> F:
+        return _with_label(fn, f"{repository}.{fn.__name__}")
+    return decorator
+
+
+def instrument_repository(cls: C) -> C:
+    """Rotula as consultas de cada metodo publico como ``<Repositorio>.<metodo>``.
+
+    As classes assincronas usam o mesmo rotulo da versao sincrona.
+    """
+    repository = cls.__name__.removeprefix("Async")
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attribute):
+            continue
+        setattr(cls, name, _with_label(attribute, f"{repository}.{name}"))
+    return cls
+
+
+def _with_label(fn: F, label: str) -> F:
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with query_label(label):
+                return await fn(*args, **kwargs)
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with query_label(label):
+            return fn(*args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+class _QuerySeries:
+
+    def __init__(self) -> None:
+        self.duration = LatencyHistogram()
+        self.rows = 0
+        self.errors = 0
+
+
+class QueryMetrics:
+    """Latencia, linhas e erros por consulta, a partir dos eventos de cursor do Engine.
+
+    O rotulo vem da opcao de execucao ``query_label`` (usada pelos cursores em
+    streaming, consumidos fora do metodo do repositorio) ou de ``query_label()``.
+    """
+
+    def __init__(self) -> None:
+        self._series: Dict[str, _QuerySeries] = {}
+        self._lock = threading.Lock()
+
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+
+    def record_rows(self, label: Optional[str], rows: int) -> None:
+        """Linhas lidas de um SELECT, contadas por quem consome o resultado."""
+        entry = self._series_for(label or UNLABELLED_QUERY)
+        with self._lock:
+            entry.rows += rows
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            series = dict(self._series)
+        return {
+            label: {
+                "duration_seconds": entry.duration.snapshot(),
+                "rows": entry.rows,
+                "errors": entry.errors,
+            }
+            for label, entry in sorted(series.items())
+        }
+
+
+    def render_prometheus(self) -> List[str]:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP db_query_duration_seconds Latencia das consultas por metodo de repositorio.",
+            "# TYPE db_query_duration_seconds histogram",
+        ]
+        for label, entry in snapshot.items():
+            lines.extend(prometheus_histogram("db_query_duration_seconds", {"query": label}, entry["duration_seconds"]))
+
+        lines.append("# HELP db_query_rows_total Linhas retornadas ou afetadas por metodo de repositorio.")
+        lines.append("# TYPE db_query_rows_total counter")
+        for label, entry in snapshot.items():
+            lines.append(f"db_query_rows_total{prometheus_labels({'query': label})} {entry['rows']}")
+
+        lines.append("# HELP db_query_errors_total Consultas que falharam por metodo de repositorio.")
+        lines.append("# TYPE db_query_errors_total counter")
+        for label, entry in snapshot.items():
+            lines.append(f"db_query_errors_total{prometheus_labels({'query': label})} {entry['errors']}")
+        return lines
+
+
+    def _series_for(self, label: str) -> _QuerySeries:
+        entry = self._series.get(label)
+        if entry is None:
+            with self._lock:
+                entry = self._series.setdefault(label, _QuerySeries())
+        return entry
+
+
+    def _before_cursor_execute(self, conn: Any, _cursor: Any, _statement: str, _parameters: Any, context: Any, _executemany: bool) -> None:
+        label = _label_for(context)
+        conn.info.setdefault("query_metrics_started", []).append((label, time.perf_counter()))
+
+
+    def _after_cursor_execute(self, conn: Any, cursor: Any, _statement: str, _parameters: Any, _context: Any, _executemany: bool) -> None:
+        started = conn.info.get("query_metrics_started")
+        if not started:
+            return
+        label, started_at = started.pop()
+        entry = self._series_for(label)
+        entry.duration.observe(time.perf_counter() - started_at)
+
+        # Em SELECT o rowcount depende do driver (e do cursor); as linhas lidas
+        # sao registradas pelo DatabaseManager via record_rows.
+        if cursor.description is not None:
+            return
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount is not None and 0 <= rowcount < _MAX_ROWCOUNT:
+            with self._lock:
+                entry.rows += rowcount
+
+
+    def _handle_error(self, exception_context: Any) -> None:
+        connection = exception_context.connection
+        started = connection.info.get("query_metrics_started") if connection is not None else None
+        if started:
+            label, started_at = started.pop()
+            self._series_for(label).duration.observe(time.perf_counter() - started_at)
+        else:
+            label = _label_for(exception_context.execution_context)
+
+        entry = self._series_for(label)
+        with self._lock:
+            entry.errors += 1
+
+
+def _label_for(context: Any) -> str:
+    if context is not None:
+        label = context.execution_options.get(QUERY_LABEL_OPTION)
+        if label:
+            return label
+    return current_query_label() or UNLABELLED_QUERY
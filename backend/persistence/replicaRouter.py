@@ -0,0 +1,79 @@
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Generic, Iterator, Optional, Sequence, TypeVar
+
+from sqlalchemy.engine import Engine
+
+from .poolStatistics import PoolStatistics
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+_BALANCING_STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+_reads_pinned_to_primary: ContextVar[bool] = ContextVar("reads_pinned_to_primary", default=False)
+
+E = TypeVar("E")
+
+
+@contextmanager
+def pin_reads_to_primary() -> Iterator[None]:
+    """Direciona ao primario as leituras feitas dentro do bloco (read-your-writes)."""
+    token = _reads_pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _reads_pinned_to_primary.reset(token)
+
+
+def reads_pinned_to_primary() -> bool:
+    return _reads_pinned_to_primary.get()
+
+
+class ReadReplica(Generic[E]):
+
+    def __init__(self, name: str, engine: E, sync_engine: Optional[Engine] = None) -> None:
+        self.name = name
+        self.engine = engine
+        self.sync_engine = sync_engine if sync_engine is not None else engine
+        self.statistics = PoolStatistics()
+        self.statistics.attach(self.sync_engine)
+
+
+    def checked_out(self) -> int:
+        return self.sync_engine.pool.checkedout()
+
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self.statistics.snapshot(self.sync_engine.pool)
+
+
+class ReplicaRouter(Generic[E]):
+    """Escolhe a replica de leitura por rodizio ou pela que tem menos conexoes em uso."""
+
+    def __init__(self, replicas: Sequence[ReadReplica[E]], balancing: str = ROUND_ROBIN) -> None:
+        if not replicas:
+            raise ValueError("Informe ao menos uma replica de leitura")
+        if balancing not in _BALANCING_STRATEGIES:
+            options = ", ".join(_BALANCING_STRATEGIES)
+            raise ValueError(f"Balanceamento {balancing} invalido; use um de: {options}")
+
+        self.replicas = tuple(replicas)
+        self.balancing = balancing
+        self._counter = itertools.count()
+
+
+    def choose(self) -> ReadReplica[E]:
+        if len(self.replicas) == 1:
+            return self.replicas[0]
+
+        if self.balancing == LEAST_CONNECTIONS:
+            return min(self.replicas, key=lambda replica: replica.checked_out())
+
+        return self.replicas[next(self._counter) % len(self.replicas)]
+
+
+def read_pool_status(primary_read: ReadReplica[Any], router: ReplicaRouter[Any]) -> Dict[str, Dict[str, Any]]:
+    replicas = [primary_read, *(replica for replica in router.replicas if replica is not primary_read)]
+    return {replica.name: replica.snapshot() for replica in replicas}
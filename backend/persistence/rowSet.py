@@ -0,0 +1,50 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def rows_as_dicts(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class RowSet:
+    """Resultado compacto: os nomes das colunas uma unica vez e uma tupla por linha.
+
+    Evita o dicionario por linha de ``execute_read_query``; quem precisar de
+    dicionarios pode usar ``as_dicts()``.
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: List[Tuple[Any, ...]]) -> None:
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.rows = rows
+
+
+    @classmethod
+    def from_result_rows(cls, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> "RowSet":
+        return cls(columns, [tuple(row) for row in rows])
+
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self.rows)
+
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return rows_as_dicts(self.columns, self.rows)
+
+
+    def first_dict(self) -> Optional[Dict[str, Any]]:
+        if not self.rows:
+            return None
+        return dict(zip(self.columns, self.rows[0]))
+
+
+    def group_by_first_column(self) -> Dict[Any, List[Tuple[Any, ...]]]:
+        """Demais colunas de cada linha, agrupadas pelo valor da primeira."""
+        groups: Dict[Any, List[Tuple[Any, ...]]] = {}
+        for row in self.rows:
+            groups.setdefault(row[0], []).append(tuple(row[1:]))
+        return groups
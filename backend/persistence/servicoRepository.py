@@ -1,47 +1,87 @@
 from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
 from .databaseManager import DatabaseManager
+from .projection import Projection
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import LAST_INSERT_ID_SQL, statements
+
+_SERVICO_PROJECTION = Projection(
+    "FROM SERVICO AS s",
+    (
+        ("cod_servico", "s.cod_servico", ()),
+        ("cod_orgao", "s.cod_orgao", ()),
+        ("orgao_nome", "org.nome", ("org",)),
+        ("cod_ocorrencia", "s.cod_ocorrencia", ()),
+        ("ocorrencia_status", "oco.tipo_status", ("oco",)),
+        ("nome", "s.nome", ()),
+        ("descr", "s.descr", ()),
+        ("inicio_servico", "s.inicio_servico", ()),
+        ("fim_servico", "s.fim_servico", ()),
+        ("nota_media_servico", "s.nota_media_servico", ()),
+    ),
+    (
+        ("org", "LEFT JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = s.cod_orgao"),
+        ("oco", "LEFT JOIN OCORRENCIA AS oco ON oco.cod_oco = s.cod_ocorrencia"),
+    ),
+)
+SERVICO_FIELDS = _SERVICO_PROJECTION.fields
 
-_SERVICO_BASE_QUERY = (
-    "SELECT \n"
-    "\ts.cod_servico,\n"
-    "\ts.cod_orgao,\n"
-    "\torg.nome AS orgao_nome,\n"
-    "\ts.cod_ocorrencia,\n"
-    "\toco.tipo_status AS ocorrencia_status,\n"
-    "\ts.nome,\n"
-    "\ts.descr,\n"
-    "\ts.inicio_servico,\n"
-    "\ts.fim_servico,\n"
-    "\ts.nota_media_servico\n"
-    "FROM SERVICO AS s\n"
-    "LEFT JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = s.cod_orgao\n"
-    "LEFT JOIN OCORRENCIA AS oco ON oco.cod_oco = s.cod_ocorrencia"
+_LIST_SERVICOS_SQL = _SERVICO_PROJECTION.register("servico.list_servicos", "\nORDER BY s.nome")
+_GET_SERVICO_BY_ID_SQL = _SERVICO_PROJECTION.register(
+    "servico.get_servico_by_id",
+    "\nWHERE s.cod_servico = :cod_servico",
+)
+_LIST_SERVICOS_BY_OCORRENCIA_SQL = _SERVICO_PROJECTION.register(
+    "servico.list_servicos_by_ocorrencia",
+    "\nWHERE s.cod_ocorrencia = :cod_ocorrencia\nORDER BY s.nome",
+)
+# Servicos de varias ocorrencias numa so consulta (lista expandida no IN).
+_LIST_SERVICOS_BY_OCORRENCIAS_SQL = _SERVICO_PROJECTION.register(
+    "servico.list_servicos_by_ocorrencias",
+    "\nWHERE s.cod_ocorrencia IN :cod_ocorrencias\nORDER BY s.cod_ocorrencia, s.nome",
+).statement.bindparams(bindparam("cod_ocorrencias", expanding=True))
+
+_INSERT_SERVICO_SQL = statements.register(
+    "servico.insert_servico",
+    "INSERT INTO SERVICO (cod_orgao, cod_ocorrencia, nome, descr, inicio_servico, fim_servico) "
+    "VALUES (:cod_orgao, :cod_ocorrencia, :nome, :descr, :inicio_servico, :fim_servico)",
+)
+_DELETE_SERVICO_SQL = statements.register(
+    "servico.delete_servico",
+    "DELETE FROM SERVICO WHERE cod_servico = :cod_servico",
 )
 
 
+@instrument_repository
 class ServicoRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._db_manager = db_manager
 
 
-    def list_servicos(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_SERVICO_BASE_QUERY}\nORDER BY s.nome"
-        return self._db_manager.execute_raw_query(sql)
+    def list_servicos(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return self._db_manager.execute_read_query(_LIST_SERVICOS_SQL.for_fields(fields))
 
 
     def get_servico_by_id(self, cod_servico: int) -> Optional[dict[str, Any]]:
-        sql = f"{_SERVICO_BASE_QUERY}\nWHERE s.cod_servico = :cod_servico"
-        result = self._db_manager.execute_raw_query(sql, {"cod_servico": cod_servico})
+        result = self._db_manager.execute_read_query(_GET_SERVICO_BY_ID_SQL.statement, {"cod_servico": cod_servico})
         return result[0] if result else None
 
 
-    def get_servicos_by_ocorrencia(self, cod_ocorrencia: int) -> Sequence[dict[str, Any]]:
-        sql = f"{_SERVICO_BASE_QUERY}\nWHERE s.cod_ocorrencia = :cod_ocorrencia\nORDER BY s.nome"
-        return self._db_manager.execute_raw_query(sql, {"cod_ocorrencia": cod_ocorrencia})
+    def get_servicos_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[dict[str, Any]]:
+        return self._db_manager.execute_read_query(
+            _LIST_SERVICOS_BY_OCORRENCIA_SQL.for_fields(fields),
+            {"cod_ocorrencia": cod_ocorrencia},
+        )
 
 
     def create_servico(
@@ -53,50 +93,145 @@ class ServicoRepository:
         descr: Optional[str],
         inicio_servico: Optional[str],
         fim_servico: Optional[str],
-    ) -> int:
-        insert_sql = (
-            "INSERT INTO SERVICO (cod_orgao, cod_ocorrencia, nome, descr, inicio_servico, fim_servico) "
-            "VALUES (:cod_orgao, :cod_ocorrencia, :nome, :descr, :inicio_servico, :fim_servico)"
-        )
-
-        with self._db_manager.engine.begin() as connection:
-            result = connection.execute(
-                text(insert_sql),
-                {
-                    "cod_orgao": cod_orgao,
-                    "cod_ocorrencia": cod_ocorrencia,
-                    "nome": nome,
-                    "descr": descr,
-                    "inicio_servico": inicio_servico,
-                    "fim_servico": fim_servico,
-                },
+    ) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_servico(
+                connection,
+                cod_orgao=cod_orgao,
+                cod_ocorrencia=cod_ocorrencia,
+                nome=nome,
+                descr=descr,
+                inicio_servico=inicio_servico,
+                fim_servico=fim_servico,
             )
-            cod_servico = result.lastrowid
-            if not cod_servico:
-                cod_servico = connection.execute(text("SELECT LAST_INSERT_ID()")).scalar_one()
 
-        return int(cod_servico)
 
-
-    def update_servico(self, cod_servico: int, fields_to_update: Dict[str, Any]) -> None:
+    def update_servico(self, cod_servico: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
         if not fields_to_update:
-            return
-
-        with self._db_manager.engine.begin() as connection:
-            set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update)
-            params = {**fields_to_update, "cod_servico": cod_servico}
-            connection.execute(
-                text(
-                    f"UPDATE SERVICO SET {set_clause} "
-                    "WHERE cod_servico = :cod_servico"
-                ),
-                params,
-            )
+            return self.get_servico_by_id(cod_servico)
+
+        with self._db_manager.begin() as connection:
+            return _update_servico(connection, cod_servico, fields_to_update)
 
 
     def delete_servico(self, cod_servico: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM SERVICO WHERE cod_servico = :cod_servico"),
-                {"cod_servico": cod_servico},
-            )
+        with self._db_manager.begin() as connection:
+            _delete_servico(connection, cod_servico)
+
+
+@instrument_repository
+class AsyncServicoRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
+
+
+    async def list_servicos(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_SERVICOS_SQL.for_fields(fields))
+
+
+    async def get_servico_by_id(self, cod_servico: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_SERVICO_BY_ID_SQL.statement, {"cod_servico": cod_servico})
+        return result[0] if result else None
+
+
+    async def get_servicos_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(
+            _LIST_SERVICOS_BY_OCORRENCIA_SQL.for_fields(fields),
+            {"cod_ocorrencia": cod_ocorrencia},
+        )
+
+
+    async def create_servico(
+        self,
+        *,
+        cod_orgao: int,
+        cod_ocorrencia: int,
+        nome: str,
+        descr: Optional[str],
+        inicio_servico: Optional[str],
+        fim_servico: Optional[str],
+    ) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _insert_servico,
+            cod_orgao=cod_orgao,
+            cod_ocorrencia=cod_ocorrencia,
+            nome=nome,
+            descr=descr,
+            inicio_servico=inicio_servico,
+            fim_servico=fim_servico,
+        )
+
+
+    async def update_servico(self, cod_servico: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+        if not fields_to_update:
+            return await self.get_servico_by_id(cod_servico)
+
+        return await self._db_manager.run_in_transaction(_update_servico, cod_servico, fields_to_update)
+
+
+    async def delete_servico(self, cod_servico: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_servico, cod_servico)
+
+
+@labelled_query("ServicoRepository")
+def select_servicos_by_ocorrencias(connection: Connection, cod_ocorrencias: Sequence[int]) -> RowSet:
+    result = connection.execute(_LIST_SERVICOS_BY_OCORRENCIAS_SQL, {"cod_ocorrencias": list(cod_ocorrencias)})
+    return RowSet.from_result_rows(result.keys(), result)
+
+
+@labelled_query("ServicoRepository")
+def _insert_servico(
+    connection: Connection,
+    *,
+    cod_orgao: int,
+    cod_ocorrencia: int,
+    nome: str,
+    descr: Optional[str],
+    inicio_servico: Optional[str],
+    fim_servico: Optional[str],
+) -> Optional[dict[str, Any]]:
+    result = connection.execute(
+        _INSERT_SERVICO_SQL,
+        {
+            "cod_orgao": cod_orgao,
+            "cod_ocorrencia": cod_ocorrencia,
+            "nome": nome,
+            "descr": descr,
+            "inicio_servico": inicio_servico,
+            "fim_servico": fim_servico,
+        },
+    )
+    cod_servico = result.lastrowid
+    if not cod_servico:
+        cod_servico = connection.execute(LAST_INSERT_ID_SQL).scalar_one()
+
+    return _select_servico(connection, int(cod_servico))
+
+
+@labelled_query("ServicoRepository")
+def _update_servico(connection: Connection, cod_servico: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+    params = {**fields_to_update, "cod_servico": cod_servico}
+    connection.execute(
+        statements.update("SERVICO", fields_to_update, key_column="cod_servico"),
+        params,
+    )
+    return _select_servico(connection, cod_servico)
+
+
+@labelled_query("ServicoRepository")
+def _delete_servico(connection: Connection, cod_servico: int) -> None:
+    connection.execute(
+        _DELETE_SERVICO_SQL,
+        {"cod_servico": cod_servico},
+    )
+
+
+@labelled_query("ServicoRepository")
+def _select_servico(connection: Connection, cod_servico: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_SERVICO_BY_ID_SQL.statement, {"cod_servico": cod_servico})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
@@ -0,0 +1,248 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, MutableMapping, Optional, Sequence, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .queryMetrics import QUERY_LABEL_OPTION, UNLABELLED_QUERY, current_query_label
+
+logger = logging.getLogger(__name__)
+
+# Marca as consultas EXPLAIN disparadas pelo proprio log, que nao devem ser registradas.
+EXPLAIN_OPTION = "slow_query_explain"
+EXPLAIN_QUERY_LABEL = "SlowQueryLog.explain"
+
+DEFAULT_SLOW_QUERY_CAPACITY = 100
+
+_EXPLAIN_PREFIXES = {
+    "mysql": "EXPLAIN FORMAT=JSON ",
+    "mariadb": "EXPLAIN FORMAT=JSON ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+_EXPLAINABLE_KEYWORDS = ("SELECT", "WITH")
+_NO_ROUTE = "fora_de_requisicao"
+
+_current_request_scope: ContextVar[Optional[MutableMapping[str, Any]]] = ContextVar(
+    "current_request_scope",
+    default=None,
+)
+
+
+@contextmanager
+def request_context(scope: MutableMapping[str, Any]) -> Iterator[None]:
+    """Associa as consultas executadas ate o fim do bloco ao escopo ASGI da requisicao.
+
+    O template da rota e lido do escopo apenas quando uma consulta lenta e
+    registrada, pois o roteamento preenche ``scope["route"]`` depois do middleware.
+    """
+    token = _current_request_scope.set(scope)
+    try:
+        yield
+    finally:
+        _current_request_scope.reset(token)
+
+
+def current_route() -> str:
+    scope = _current_request_scope.get()
+    if scope is None:
+        return _NO_ROUTE
+    path = getattr(scope.get("route"), "path", None) or "nao_mapeada"
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Troca cada valor pelo nome do seu tipo, preservando os nomes dos parametros."""
+    if isinstance(parameters, dict):
+        return {name: _redacted(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} conjuntos de parametros>"
+        return [_redacted(value) for value in parameters]
+    return _redacted(parameters)
+
+
+def _redacted(value: Any) -> str:
+    return "<null>" if value is None else f"<{type(value).__name__}>"
+
+
+def explain_statement(dialect_name: str, statement: str) -> Optional[str]:
+    prefix = _EXPLAIN_PREFIXES.get(dialect_name)
+    if prefix is None or not statement.lstrip().upper().startswith(_EXPLAINABLE_KEYWORDS):
+        return None
+    return prefix + statement
+
+
+def parse_plan(rows: Sequence[Sequence[Any]]) -> Any:
+    """``EXPLAIN FORMAT=JSON`` devolve uma unica celula com o plano em JSON."""
+    if len(rows) == 1 and len(rows[0]) == 1 and isinstance(rows[0][0], str):
+        try:
+            return json.loads(rows[0][0])
+        except ValueError:
+            return rows[0][0]
+    return [list(row) for row in rows]
+
+
+class SlowQuery:
+
+    __slots__ = ("statement", "parameters", "redacted_parameters", "label", "route", "duration", "recorded_at", "dialect", "plan", "explain_error")
+
+    def __init__(self, statement: str, parameters: Any, *, label: str, route: str, duration: float, dialect: str) -> None:
+        self.statement = statement
+        self.parameters = parameters
+        self.redacted_parameters = redact_parameters(parameters)
+        self.label = label
+        self.route = route
+        self.duration = duration
+        self.recorded_at = time.time()
+        self.dialect = dialect
+        self.plan: Any = None
+        self.explain_error: Optional[str] = None
+
+
+    def explain_sql(self) -> Optional[str]:
+        return explain_statement(self.dialect, self.statement)
+
+
+    def record_plan(self, rows: Sequence[Sequence[Any]]) -> None:
+        self.plan = parse_plan(rows)
+        self.parameters = None
+
+
+    def record_explain_error(self, error: BaseException) -> None:
+        self.explain_error = f"{type(error).__name__}: {error}"
+        self.parameters = None
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.label,
+            "route": self.route,
+            "duration_ms": round(self.duration * 1000, 3),
+            "recorded_at": self.recorded_at,
+            "statement": self.statement,
+            "parameters": self.redacted_parameters,
+            "plan": self.plan,
+            "explain_error": self.explain_error,
+        }
+
+
+class SlowQueryLog:
+    """Registra as consultas acima de ``threshold_seconds`` num buffer circular.
+
+    Cada consulta lenta vai para o log com os parametros mascarados e a rota da
+    requisicao; ``schedule_explain`` (definido pelo DatabaseManager) executa o
+    EXPLAIN fora da consulta original e grava o plano na propria entrada.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float,
+        capacity: int = DEFAULT_SLOW_QUERY_CAPACITY,
+        schedule_explain: Optional[Callable[[SlowQuery], None]] = None,
+    ) -> None:
+        if threshold_seconds < 0:
+            raise ValueError("threshold_seconds nao pode ser negativo")
+        if capacity < 1:
+            raise ValueError("capacity deve ser maior que zero")
+        self.threshold_seconds = threshold_seconds
+        self.capacity = capacity
+        self.schedule_explain = schedule_explain
+        self._entries: Deque[SlowQuery] = deque(maxlen=capacity)
+        self._pending_explains: Set[str] = set()
+        self._total = 0
+        self._lock = threading.Lock()
+
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(reversed(self._entries))
+            total = self._total
+        if limit is not None:
+            entries = entries[:limit]
+        return {
+            "threshold_ms": self.threshold_seconds * 1000,
+            "capacity": self.capacity,
+            "total": total,
+            "queries": [entry.to_dict() for entry in entries],
+        }
+
+
+    def finish_explain(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._pending_explains.discard(entry.statement)
+
+
+    def _before_cursor_execute(self, conn: Any, _cursor: Any, _statement: str, _parameters: Any, _context: Any, _executemany: bool) -> None:
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+
+    def _after_cursor_execute(self, conn: Any, _cursor: Any, statement: str, parameters: Any, context: Any, _executemany: bool) -> None:
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+        if duration < self.threshold_seconds:
+            return
+        if context is not None and context.execution_options.get(EXPLAIN_OPTION):
+            return
+        self._record(conn, statement, parameters, context, duration)
+
+
+    def _handle_error(self, exception_context: Any) -> None:
+        connection = exception_context.connection
+        started = connection.info.get("slow_query_started") if connection is not None else None
+        if started:
+            started.pop()
+
+
+    def _record(self, conn: Any, statement: str, parameters: Any, context: Any, duration: float) -> None:
+        label = None
+        if context is not None:
+            label = context.execution_options.get(QUERY_LABEL_OPTION)
+        entry = SlowQuery(
+            statement,
+            parameters,
+            label=label or current_query_label() or UNLABELLED_QUERY,
+            route=current_route(),
+            duration=duration,
+            dialect=conn.dialect.name,
+        )
+        logger.warning(
+            "Consulta lenta (%.1f ms) %s rota=%s parametros=%s: %s",
+            duration * 1000,
+            entry.label,
+            entry.route,
+            entry.redacted_parameters,
+            " ".join(statement.split()),
+        )
+
+        explain = self.schedule_explain is not None and entry.explain_sql() is not None
+        with self._lock:
+            self._entries.append(entry)
+            self._total += 1
+            if explain:
+                # Uma mesma instrucao lenta em rajada gera um unico EXPLAIN por vez.
+                explain = entry.statement not in self._pending_explains
+                self._pending_explains.add(entry.statement)
+        if not explain:
+            entry.parameters = None
+            return
+
+        try:
+            self.schedule_explain(entry)
+        except Exception as exc:
+            logger.warning("Nao foi possivel agendar o EXPLAIN da consulta lenta: %s", exc)
+            entry.record_explain_error(exc)
+            self.finish_explain(entry)
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Sequence, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+# Instrucoes montadas por requisicao (filtros, campos pedidos) mantidas em memoria.
+DYNAMIC_STATEMENT_CAPACITY = 256
+
+
+class StatementRegistry:
+    """Guarda as instrucoes SQL dos repositorios ja convertidas em ``TextClause``.
+
+    As consultas fixas sao registradas na importacao de cada repositorio; os
+    ``UPDATE`` dinamicos sao montados uma vez por tabela e conjunto de colunas.
+    O SQL que depende da query string (``dynamic``) fica num LRU limitado, ja
+    que as combinacoes possiveis sao escolhidas pelo cliente.
+    """
+
+    def __init__(self, dynamic_capacity: int = DYNAMIC_STATEMENT_CAPACITY) -> None:
+        self._statements: Dict[str, TextClause] = {}
+        self._updates: Dict[Tuple[str, str, FrozenSet[str]], TextClause] = {}
+        self._dynamic: "OrderedDict[str, TextClause]" = OrderedDict()
+        self._dynamic_capacity = dynamic_capacity
+        self._lock = threading.Lock()
+
+
+    def register(self, name: str, sql: str) -> TextClause:
+        with self._lock:
+            existing = self._statements.get(name)
+            if existing is not None:
+                if existing.text != sql:
+                    raise ValueError(f"Instrucao {name} ja registrada com outro SQL")
+                return existing
+
+            statement = text(sql)
+            self._statements[name] = statement
+            return statement
+
+
+    def get(self, name: str) -> TextClause:
+        try:
+            return self._statements[name]
+        except KeyError as exc:
+            raise KeyError(f"Instrucao {name} nao registrada") from exc
+
+
+    def dynamic(self, sql: str) -> TextClause:
+        with self._lock:
+            statement = self._dynamic.get(sql)
+            if statement is not None:
+                self._dynamic.move_to_end(sql)
+                return statement
+
+        statement = text(sql)
+        with self._lock:
+            statement = self._dynamic.setdefault(sql, statement)
+            self._dynamic.move_to_end(sql)
+            while len(self._dynamic) > self._dynamic_capacity:
+                self._dynamic.popitem(last=False)
+        return statement
+
+
+    def names(self) -> Sequence[str]:
+        return sorted(self._statements)
+
+
+    def update(self, table: str, columns: Iterable[str], *, key_column: str) -> TextClause:
+        cache_key = (table, key_column, frozenset(columns))
+        statement = self._updates.get(cache_key)
+        if statement is not None:
+            return statement
+
+        set_clause = ", ".join(f"{column} = :{column}" for column in sorted(cache_key[2]))
+        statement = text(f"UPDATE {table} SET {set_clause} WHERE {key_column} = :{key_column}")
+        with self._lock:
+            return self._updates.setdefault(cache_key, statement)
+
+
+def as_statement(statement: Union[str, TextClause]) -> TextClause:
+    if isinstance(statement, TextClause):
+        return statement
+    return text(statement)
+
+
+statements = StatementRegistry()
+
+LAST_INSERT_ID_SQL = statements.register("last_insert_id", "SELECT LAST_INSERT_ID()")
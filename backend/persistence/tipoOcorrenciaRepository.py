@@ -1,8 +1,12 @@
 from typing import Any, Dict, Optional, Sequence
 
-from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
+from .asyncDatabaseManager import AsyncDatabaseManager
 from .databaseManager import DatabaseManager
+from .queryMetrics import instrument_repository, labelled_query
+from .rowSet import RowSet
+from .statementRegistry import LAST_INSERT_ID_SQL, statements
 
 _TIPO_BASE_QUERY = (
     "SELECT \n"
@@ -16,7 +20,24 @@ _TIPO_BASE_QUERY = (
     "LEFT JOIN ORGAO_PUBLICO AS org ON org.cod_orgao = tipo.orgao_pub"
 )
 
+_LIST_TIPOS_SQL = statements.register("tipo_ocorrencia.list_tipos", f"{_TIPO_BASE_QUERY}\nORDER BY tipo.nome")
+_GET_TIPO_BY_ID_SQL = statements.register(
+    "tipo_ocorrencia.get_tipo_by_id",
+    f"{_TIPO_BASE_QUERY}\nWHERE tipo.cod_tipo = :cod_tipo",
+)
+
+_INSERT_TIPO_SQL = statements.register(
+    "tipo_ocorrencia.insert_tipo",
+    "INSERT INTO TIPO_OCORRENCIA (nome, descr, orgao_pub) "
+    "VALUES (:nome, :descr, :orgao_pub)",
+)
+_DELETE_TIPO_SQL = statements.register(
+    "tipo_ocorrencia.delete_tipo",
+    "DELETE FROM TIPO_OCORRENCIA WHERE cod_tipo = :cod_tipo",
+)
+
 
+@instrument_repository
 class TipoOcorrenciaRepository:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -24,54 +45,101 @@ class TipoOcorrenciaRepository:
 
 
     def list_tipos_ocorrencia(self) -> Sequence[dict[str, Any]]:
-        sql = f"{_TIPO_BASE_QUERY}\nORDER BY tipo.nome"
-        return self._db_manager.execute_raw_query(sql)
+        return self._db_manager.execute_read_query(_LIST_TIPOS_SQL)
 
 
     def get_tipo_by_id(self, cod_tipo: int) -> Optional[dict[str, Any]]:
-        sql = f"{_TIPO_BASE_QUERY}\nWHERE tipo.cod_tipo = :cod_tipo"
-        result = self._db_manager.execute_raw_query(sql, {"cod_tipo": cod_tipo})
+        result = self._db_manager.execute_read_query(_GET_TIPO_BY_ID_SQL, {"cod_tipo": cod_tipo})
         return result[0] if result else None
 
 
-    def create_tipo_ocorrencia(self, *, nome: str, descr: Optional[str], orgao_pub: int) -> int:
-        insert_sql = (
-            "INSERT INTO TIPO_OCORRENCIA (nome, descr, orgao_pub) "
-            "VALUES (:nome, :descr, :orgao_pub)"
-        )
+    def create_tipo_ocorrencia(self, *, nome: str, descr: Optional[str], orgao_pub: int) -> Optional[dict[str, Any]]:
+        with self._db_manager.begin() as connection:
+            return _insert_tipo_ocorrencia(connection, nome=nome, descr=descr, orgao_pub=orgao_pub)
+
+
+    def update_tipo_ocorrencia(self, cod_tipo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+        if not fields_to_update:
+            return self.get_tipo_by_id(cod_tipo)
+
+        with self._db_manager.begin() as connection:
+            return _update_tipo_ocorrencia(connection, cod_tipo, fields_to_update)
+
+
+    def delete_tipo_ocorrencia(self, cod_tipo: int) -> None:
+        with self._db_manager.begin() as connection:
+            _delete_tipo_ocorrencia(connection, cod_tipo)
+
+
+@instrument_repository
+class AsyncTipoOcorrenciaRepository:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._db_manager = db_manager
 
-        with self._db_manager.engine.begin() as connection:
-            result = connection.execute(
-                text(insert_sql),
-                {"nome": nome, "descr": descr, "orgao_pub": orgao_pub},
-            )
-            cod_tipo = result.lastrowid
-            if not cod_tipo:
-                cod_tipo_result = connection.execute(text("SELECT LAST_INSERT_ID()"))
-                cod_tipo = cod_tipo_result.scalar_one()
 
-        return int(cod_tipo)
+    async def list_tipos_ocorrencia(self) -> Sequence[dict[str, Any]]:
+        return await self._db_manager.execute_read_query(_LIST_TIPOS_SQL)
 
 
-    def update_tipo_ocorrencia(self, cod_tipo: int, fields_to_update: Dict[str, Any]) -> None:
+    async def get_tipo_by_id(self, cod_tipo: int) -> Optional[dict[str, Any]]:
+        result = await self._db_manager.execute_read_query(_GET_TIPO_BY_ID_SQL, {"cod_tipo": cod_tipo})
+        return result[0] if result else None
+
+
+    async def create_tipo_ocorrencia(self, *, nome: str, descr: Optional[str], orgao_pub: int) -> Optional[dict[str, Any]]:
+        return await self._db_manager.run_in_transaction(
+            _insert_tipo_ocorrencia,
+            nome=nome,
+            descr=descr,
+            orgao_pub=orgao_pub,
+        )
+
+
+    async def update_tipo_ocorrencia(self, cod_tipo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
         if not fields_to_update:
-            return
+            return await self.get_tipo_by_id(cod_tipo)
 
-        with self._db_manager.engine.begin() as connection:
-            set_clause = ", ".join(f"{column} = :{column}" for column in fields_to_update)
-            params = {**fields_to_update, "cod_tipo": cod_tipo}
-            connection.execute(
-                text(
-                    f"UPDATE TIPO_OCORRENCIA SET {set_clause} "
-                    "WHERE cod_tipo = :cod_tipo"
-                ),
-                params,
-            )
+        return await self._db_manager.run_in_transaction(_update_tipo_ocorrencia, cod_tipo, fields_to_update)
 
 
-    def delete_tipo_ocorrencia(self, cod_tipo: int) -> None:
-        with self._db_manager.engine.begin() as connection:
-            connection.execute(
-                text("DELETE FROM TIPO_OCORRENCIA WHERE cod_tipo = :cod_tipo"),
-                {"cod_tipo": cod_tipo},
-            )
+    async def delete_tipo_ocorrencia(self, cod_tipo: int) -> None:
+        await self._db_manager.run_in_transaction(_delete_tipo_ocorrencia, cod_tipo)
+
+
+@labelled_query("TipoOcorrenciaRepository")
+def _insert_tipo_ocorrencia(connection: Connection, *, nome: str, descr: Optional[str], orgao_pub: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(
+        _INSERT_TIPO_SQL,
+        {"nome": nome, "descr": descr, "orgao_pub": orgao_pub},
+    )
+    cod_tipo = result.lastrowid
+    if not cod_tipo:
+        cod_tipo_result = connection.execute(LAST_INSERT_ID_SQL)
+        cod_tipo = cod_tipo_result.scalar_one()
+
+    return _select_tipo(connection, int(cod_tipo))
+
+
+@labelled_query("TipoOcorrenciaRepository")
+def _update_tipo_ocorrencia(connection: Connection, cod_tipo: int, fields_to_update: Dict[str, Any]) -> Optional[dict[str, Any]]:
+    params = {**fields_to_update, "cod_tipo": cod_tipo}
+    connection.execute(
+        statements.update("TIPO_OCORRENCIA", fields_to_update, key_column="cod_tipo"),
+        params,
+    )
+    return _select_tipo(connection, cod_tipo)
+
+
+@labelled_query("TipoOcorrenciaRepository")
+def _delete_tipo_ocorrencia(connection: Connection, cod_tipo: int) -> None:
+    connection.execute(
+        _DELETE_TIPO_SQL,
+        {"cod_tipo": cod_tipo},
+    )
+
+
+@labelled_query("TipoOcorrenciaRepository")
+def _select_tipo(connection: Connection, cod_tipo: int) -> Optional[dict[str, Any]]:
+    result = connection.execute(_GET_TIPO_BY_ID_SQL, {"cod_tipo": cod_tipo})
+    return RowSet.from_result_rows(result.keys(), result).first_dict()
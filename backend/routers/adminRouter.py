@@ -0,0 +1,34 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+_db_manager: Optional[AsyncDatabaseManager] = None
+
+
+def set_database_manager(db_manager: AsyncDatabaseManager) -> None:
+    global _db_manager
+    _db_manager = db_manager
+
+
+def _get_database_manager() -> AsyncDatabaseManager:
+    if _db_manager is None:
+        raise HTTPException(status_code=500, detail="Gerenciador de banco nao inicializado")
+    return _db_manager
+
+
+@router.get("/pool")
+async def obter_estatisticas_pool() -> Dict[str, Any]:
+    db_manager = _get_database_manager()
+    return db_manager.get_pool_status()
+
+
+@router.get("/slow-queries")
+async def obter_consultas_lentas(limit: Optional[int] = Query(default=None, ge=1)) -> Dict[str, Any]:
+    db_manager = _get_database_manager()
+    if db_manager.slow_query_log is None:
+        raise HTTPException(status_code=404, detail="Log de consultas lentas desabilitado")
+    return db_manager.slow_query_log.snapshot(limit)
@@ -1,21 +1,25 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
-from ..service.avaliacaoService import AvaliacaoService
+from ..persistence.avaliacaoRepository import AVALIACAO_FIELDS
+from ..service.avaliacaoService import AsyncAvaliacaoService
+from .fieldSelection import FIELDS_DESCRIPTION, parse_fields
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, page_response
+from .streamingResponses import json_array_response, ndjson_response
 
 router = APIRouter(prefix="/avaliacoes")
 
-_service: Optional[AvaliacaoService] = None
+_service: Optional[AsyncAvaliacaoService] = None
 
 
-def set_avaliacao_service(service: AvaliacaoService) -> None:
+def set_avaliacao_service(service: AsyncAvaliacaoService) -> None:
     global _service
     _service = service
 
 
-def _get_service() -> AvaliacaoService:
+def _get_service() -> AsyncAvaliacaoService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de avaliacao nao inicializado")
     return _service
@@ -39,25 +43,73 @@ class AvaliacaoUpdate(BaseModel):
     opiniao: Optional[str] = None
 
 
-@router.get("/")
-def listar_avaliacoes() -> Sequence[Dict[str, Any]]:
+# Chave da paginacao: cod_aval, do mais recente para o mais antigo.
+_PAGE_KEY = ("cod_aval",)
+_PAGE_KEY_TYPES = (int,)
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_avaliacoes(
+    busca: Optional[str] = Query(default=None, min_length=1, description="Trecho do nome do servico"),
+    cod_orgao: Optional[int] = None,
+    cod_servico: Optional[int] = None,
+    nota_min: Optional[int] = None,
+    nota_max: Optional[int] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    service = _get_service()
+    filters = {
+        "servico_nome": busca,
+        "cod_orgao": cod_orgao,
+        "cod_servico": cod_servico,
+        "nota_min": nota_min,
+        "nota_max": nota_max,
+    }
+    filters = {name: value for name, value in filters.items() if value is not None}
+
+    # Sem filtros nem paginacao, a lista completa continua disponivel.
+    if not filters and limit is None and cursor is None:
+        return json_array_response(service.stream_avaliacoes(parse_fields(fields, AVALIACAO_FIELDS)))
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    after = decode_cursor(cursor, _PAGE_KEY_TYPES)
+    page = await service.search_avaliacoes(
+        filters,
+        limit=page_size + 1,
+        after=after[0] if after else None,
+        fields=parse_fields(fields, AVALIACAO_FIELDS, required=_PAGE_KEY),
+    )
+    return page_response(page, page_size, _PAGE_KEY)
+
+
+@router.get("/export.ndjson")
+async def exportar_avaliacoes(
+    since: Optional[int] = Query(default=None, ge=0, description="Apenas avaliacoes com cod_aval maior que este"),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    # Uma avaliacao por linha, em ordem crescente de cod_aval, lida de um cursor no servidor.
     service = _get_service()
-    return service.list_avaliacoes()
+    return ndjson_response(service.export_avaliacoes(since, parse_fields(fields, AVALIACAO_FIELDS)))
 
 
 @router.get("/ocorrencia/{cod_ocorrencia}")
-def obter_avaliacao_por_ocorrencia(cod_ocorrencia: int) -> Dict[str, Any]:
+async def obter_avaliacao_por_ocorrencia(
+    cod_ocorrencia: int,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Dict[str, Any]:
     service = _get_service()
-    avaliacao = service.get_avaliacao_by_ocorrencia(cod_ocorrencia)
+    avaliacao = await service.get_avaliacao_by_ocorrencia(cod_ocorrencia, parse_fields(fields, AVALIACAO_FIELDS))
     if not avaliacao:
         raise HTTPException(status_code=404, detail="Avaliacao nao encontrada")
     return avaliacao
 
 
 @router.post("/")
-def criar_avaliacao(payload: AvaliacaoCreate) -> Dict[str, Any]:
+async def criar_avaliacao(payload: AvaliacaoCreate) -> Dict[str, Any]:
     service = _get_service()
-    created = service.create_avaliacao(
+    created = await service.create_avaliacao(
         cod_ocorrencia=payload.cod_ocorrencia,
         cod_servico=payload.cod_servico,
         cpf_morador=payload.cpf_morador,
@@ -69,22 +121,22 @@ def criar_avaliacao(payload: AvaliacaoCreate) -> Dict[str, Any]:
 
 
 @router.put("/{cod_aval}")
-def atualizar_avaliacao(cod_aval: int, payload: AvaliacaoUpdate) -> Dict[str, Any]:
+async def atualizar_avaliacao(cod_aval: int, payload: AvaliacaoUpdate) -> Dict[str, Any]:
     service = _get_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
-    updated = service.update_avaliacao(cod_aval, **update_fields)
+    updated = await service.update_avaliacao(cod_aval, **update_fields)
     if not updated:
         raise HTTPException(status_code=404, detail="Avaliacao nao encontrada")
     return updated
 
 
 @router.delete("/{cod_aval}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_avaliacao(cod_aval: int) -> Response:
+async def deletar_avaliacao(cod_aval: int) -> Response:
     service = _get_service()
-    avaliacao = service.get_avaliacao_by_id(cod_aval)
+    avaliacao = await service.get_avaliacao_by_id(cod_aval)
     if not avaliacao:
         raise HTTPException(status_code=404, detail="Avaliacao nao encontrada")
 
-    service.delete_avaliacao(cod_aval)
+    await service.delete_avaliacao(cod_aval)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,21 +1,22 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel, Field
 
-from ..service.cargoService import CargoService
+from ..service.cargoService import AsyncCargoService
+from .jsonResponses import OrjsonResponse
 
 router = APIRouter(prefix="/cargos")
 
-_service: Optional[CargoService] = None
+_service: Optional[AsyncCargoService] = None
 
 
-def set_cargo_service(service: CargoService) -> None:
+def set_cargo_service(service: AsyncCargoService) -> None:
     global _service
     _service = service
 
 
-def _get_cargo_service() -> CargoService:
+def _get_cargo_service() -> AsyncCargoService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de cargo nao inicializado")
     return _service
@@ -31,44 +32,44 @@ class CargoUpdate(BaseModel):
     descricao: Optional[str] = None
 
 
-@router.get("/")
-def listar_cargos() -> Sequence[Dict[str, Any]]:
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_cargos() -> OrjsonResponse:
     service = _get_cargo_service()
-    return service.list_cargos()
+    return OrjsonResponse(await service.list_cargos())
 
 
 @router.get("/{cod_cargo}")
-def obter_cargo(cod_cargo: int) -> Dict[str, Any]:
+async def obter_cargo(cod_cargo: int) -> Dict[str, Any]:
     service = _get_cargo_service()
-    cargo = service.get_cargo_by_id(cod_cargo)
+    cargo = await service.get_cargo_by_id(cod_cargo)
     if not cargo:
         raise HTTPException(status_code=404, detail="Cargo nao encontrado")
     return cargo
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def criar_cargo(payload: CargoCreate) -> Dict[str, Any]:
+async def criar_cargo(payload: CargoCreate) -> Dict[str, Any]:
     service = _get_cargo_service()
-    return service.create_cargo(nome=payload.nome, descricao=payload.descricao)
+    return await service.create_cargo(nome=payload.nome, descricao=payload.descricao)
 
 
 @router.put("/{cod_cargo}")
-def atualizar_cargo(cod_cargo: int, payload: CargoUpdate) -> Dict[str, Any]:
+async def atualizar_cargo(cod_cargo: int, payload: CargoUpdate) -> Dict[str, Any]:
     service = _get_cargo_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
-    updated = service.update_cargo(cod_cargo, **update_fields)
+    updated = await service.update_cargo(cod_cargo, **update_fields)
     if not updated:
         raise HTTPException(status_code=404, detail="Cargo nao encontrado")
     return updated
 
 
 @router.delete("/{cod_cargo}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_cargo(cod_cargo: int) -> Response:
+async def deletar_cargo(cod_cargo: int) -> Response:
     service = _get_cargo_service()
-    cargo = service.get_cargo_by_id(cod_cargo)
+    cargo = await service.get_cargo_by_id(cod_cargo)
     if not cargo:
         raise HTTPException(status_code=404, detail="Cargo nao encontrado")
 
-    service.delete_cargo(cod_cargo)
+    await service.delete_cargo(cod_cargo)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,29 @@
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+FIELDS_DESCRIPTION = "Campos da resposta, separados por virgula (ex.: cpf,nome)"
+
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Sequence[str],
+    *,
+    required: Sequence[str] = (),
+) -> Optional[Tuple[str, ...]]:
+    """Campos pedidos em ``?fields=``, ou ``None`` para todas as colunas.
+
+    ``required`` acrescenta colunas de que a rota depende (ex.: a chave de paginacao).
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Campos desconhecidos: {', '.join(unknown)}")
+    if not requested:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo em fields")
+
+    requested.update(required)
+    return tuple(name for name in allowed if name in requested)
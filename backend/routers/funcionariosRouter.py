@@ -1,24 +1,29 @@
 import base64
 import binascii
 from datetime import date
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, EmailStr
 
-from ..service.funcionarioService import FuncionarioService
+from ..persistence.funcionarioRepository import FUNCIONARIO_FIELDS
+from ..service.funcionarioService import AsyncFuncionarioService
+from ..service.thumbnailPool import THUMBNAIL_SIZES
+from .fieldSelection import FIELDS_DESCRIPTION, parse_fields
+from .rowSerializer import row_set_response
 
 router = APIRouter(prefix="/funcionarios")
 
-_service: Optional[FuncionarioService] = None
+_service: Optional[AsyncFuncionarioService] = None
 
 
-def set_funcionario_service(service: FuncionarioService) -> None:
+def set_funcionario_service(service: AsyncFuncionarioService) -> None:
     global _service
     _service = service
 
 
-def _get_funcionario_service() -> FuncionarioService:
+def _get_funcionario_service() -> AsyncFuncionarioService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de funcionario nao inicializado")
     return _service
@@ -63,59 +68,130 @@ def _decode_foto(encoded: Optional[str]) -> Optional[bytes]:
         raise HTTPException(status_code=400, detail="Foto deve estar em base64 valido") from exc
 
 
-def _serialize_funcionario(record: Dict[str, Any]) -> Dict[str, Any]:
-    serialized = dict(record)
-    foto = serialized.get("foto")
-    if isinstance(foto, (bytes, bytearray)):
-        serialized["foto"] = base64.b64encode(foto).decode("ascii")
-    return serialized
+# A URL versionada (?v=<foto_hash>) muda junto com a foto; a sem versao revalida pelo ETag.
+_FOTO_CACHE_VERSIONED = "public, max-age=31536000, immutable"
+_FOTO_CACHE_UNVERSIONED = "no-cache"
 
 
-@router.get("/")
-def listar_funcionarios() -> Sequence[Dict[str, Any]]:
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_funcionarios(
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
     service = _get_funcionario_service()
-    funcionarios = service.list_funcionarios()
-    return [_serialize_funcionario(funcionario) for funcionario in funcionarios]
+    funcionarios = await service.list_funcionario_rows(parse_fields(fields, FUNCIONARIO_FIELDS))
+    return row_set_response(funcionarios)
 
 
 @router.get("/cpf/{cpf}")
-def obter_funcionario_por_cpf(cpf: str) -> Dict[str, Any]:
+async def obter_funcionario_por_cpf(
+    cpf: str,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Dict[str, Any]:
     service = _get_funcionario_service()
-    funcionario = service.get_funcionario_by_cpf(cpf)
+    funcionario = await service.get_funcionario_by_cpf(cpf, parse_fields(fields, FUNCIONARIO_FIELDS))
     if not funcionario:
         raise HTTPException(status_code=404, detail="Funcionario nao encontrado")
-    return _serialize_funcionario(funcionario)
+    return funcionario
 
 
 @router.get("/email/{email}")
-def obter_funcionario_por_email(email: str) -> Dict[str, Any]:
+async def obter_funcionario_por_email(
+    email: str,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Dict[str, Any]:
     service = _get_funcionario_service()
-    funcionario = service.get_funcionario_by_email(email)
+    funcionario = await service.get_funcionario_by_email(email, parse_fields(fields, FUNCIONARIO_FIELDS))
     if not funcionario:
         raise HTTPException(status_code=404, detail="Funcionario nao encontrado")
-    return _serialize_funcionario(funcionario)
+    return funcionario
+
+
+@router.get("/{cpf}/foto")
+async def obter_foto_funcionario(
+    cpf: str,
+    v: Optional[str] = Query(default=None, description="Hash da foto (foto_hash), para cache de longa duracao"),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    return await _serve_foto(cpf, v, if_none_match)
+
+
+@router.get("/{cpf}/foto/{tamanho}")
+async def obter_miniatura_funcionario(
+    cpf: str,
+    tamanho: int,
+    v: Optional[str] = Query(default=None, description="Hash da foto (foto_hash), para cache de longa duracao"),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    if tamanho not in THUMBNAIL_SIZES:
+        sizes = ", ".join(str(size) for size in THUMBNAIL_SIZES)
+        raise HTTPException(status_code=404, detail=f"Tamanho de miniatura indisponivel; use um de: {sizes}")
+    return await _serve_foto(cpf, v, if_none_match, tamanho)
+
+
+async def _serve_foto(
+    cpf: str,
+    version: Optional[str],
+    if_none_match: Optional[str],
+    tamanho: Optional[int] = None,
+) -> Response:
+    """Foto (ou miniatura) com ETag; o arquivo so e aberto se o 304 nao se aplicar."""
+    service = _get_funcionario_service()
+    foto = await service.get_foto(cpf) if tamanho is None else await service.get_foto_miniatura(cpf, tamanho)
+    if foto is None or foto["hash"] is None:
+        raise HTTPException(status_code=404, detail="Foto nao encontrada")
+
+    headers = {
+        "ETag": _foto_etag(foto["foto_hash"], tamanho),
+        "Cache-Control": _FOTO_CACHE_VERSIONED if version == foto["foto_hash"] else _FOTO_CACHE_UNVERSIONED,
+    }
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # FileResponse usa http.response.pathsend (sendfile no servidor) quando o servidor ASGI oferece.
+    path = await service.foto_path(foto["hash"])
+    if path is not None:
+        return FileResponse(path, media_type=foto["content_type"], headers=headers)
+
+    content = await service.read_foto(foto["hash"])
+    if content is None:
+        raise HTTPException(status_code=404, detail="Foto nao encontrada")
+    return Response(content=content, media_type=foto["content_type"], headers=headers)
+
+
+def _foto_etag(digest: str, tamanho: Optional[int]) -> str:
+    return f'"{digest}"' if tamanho is None else f'"{digest}-{tamanho}"'
 
 
 @router.post("/")
-def criar_funcionario(payload: FuncionarioCreate) -> Dict[str, Any]:
+async def criar_funcionario(payload: FuncionarioCreate) -> Dict[str, Any]:
     service = _get_funcionario_service()
-    created = service.create_funcionario(
-        cpf=payload.cpf,
-        nome=payload.nome,
-        orgao_pub=payload.orgao_pub,
-        cargo=payload.cargo,
-        data_nasc=payload.data_nasc.isoformat(),
-        inicio_contrato=payload.inicio_contrato.isoformat(),
-        fim_contrato=_date_to_iso(payload.fim_contrato),
-        senha=payload.senha,
-        foto=_decode_foto(payload.foto),
-        email=payload.email,
-    )
-    return _serialize_funcionario(created)
+    try:
+        created = await service.create_funcionario(
+            cpf=payload.cpf,
+            nome=payload.nome,
+            orgao_pub=payload.orgao_pub,
+            cargo=payload.cargo,
+            data_nasc=payload.data_nasc.isoformat(),
+            inicio_contrato=payload.inicio_contrato.isoformat(),
+            fim_contrato=_date_to_iso(payload.fim_contrato),
+            senha=payload.senha,
+            foto=_decode_foto(payload.foto),
+            email=payload.email,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return created
 
 
 @router.put("/{cpf}")
-def atualizar_funcionario(cpf: str, payload: FuncionarioUpdate) -> Dict[str, Any]:
+async def atualizar_funcionario(cpf: str, payload: FuncionarioUpdate) -> Dict[str, Any]:
     service = _get_funcionario_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
@@ -132,19 +208,23 @@ def atualizar_funcionario(cpf: str, payload: FuncionarioUpdate) -> Dict[str, Any
             else None
         )
 
-    updated = service.update_funcionario(cpf, **update_fields)
+    try:
+        updated = await service.update_funcionario(cpf, **update_fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
     if not updated:
         raise HTTPException(status_code=404, detail="Funcionario nao encontrado")
-    return _serialize_funcionario(updated)
+    return updated
 
 
 @router.delete("/{cpf}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_funcionario(cpf: str) -> Response:
+async def deletar_funcionario(cpf: str) -> Response:
     service = _get_funcionario_service()
-    funcionario = service.get_funcionario_by_cpf(cpf)
+    funcionario = await service.get_funcionario_by_cpf(cpf)
     if not funcionario:
         raise HTTPException(status_code=404, detail="Funcionario nao encontrado")
 
-    service.delete_funcionario(cpf)
+    await service.delete_funcionario(cpf)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
     
\ No newline at end of file
@@ -0,0 +1,33 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # date/datetime/time sao nativos no orjson; o restante segue o jsonable_encoder.
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"Tipo {type(value).__name__} nao serializavel em JSON")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class OrjsonResponse(JSONResponse):
+    """Resposta JSON padrao da API, serializada com orjson.
+
+    Rotas que devolvem esta classe diretamente nao passam pelo ``jsonable_encoder``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -3,25 +3,25 @@ from typing import Dict, Optional, Tuple
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr, Field
 
-from ..service.funcionarioService import FuncionarioService
-from ..service.moradorService import MoradorService
+from ..service.funcionarioService import AsyncFuncionarioService
+from ..service.moradorService import AsyncMoradorService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-_morador_service: Optional[MoradorService] = None
-_funcionario_service: Optional[FuncionarioService] = None
+_morador_service: Optional[AsyncMoradorService] = None
+_funcionario_service: Optional[AsyncFuncionarioService] = None
 
 
 def set_login_services(
-	morador_service: MoradorService,
-	funcionario_service: FuncionarioService,
+	morador_service: AsyncMoradorService,
+	funcionario_service: AsyncFuncionarioService,
 ) -> None:
 	global _morador_service, _funcionario_service
 	_morador_service = morador_service
 	_funcionario_service = funcionario_service
 
 
-def _get_services() -> Tuple[MoradorService, FuncionarioService]:
+def _get_services() -> Tuple[AsyncMoradorService, AsyncFuncionarioService]:
 	if _morador_service is None or _funcionario_service is None:
 		raise HTTPException(
 			status_code=500,
@@ -36,12 +36,12 @@ class LoginPayload(BaseModel):
 
 
 @router.post("/login")
-def login(payload: LoginPayload) -> Dict[str, object]:
+async def login(payload: LoginPayload) -> Dict[str, object]:
 	morador_service, funcionario_service = _get_services()
 	email = payload.email.strip()
 	senha = payload.senha
 
-	funcionario = funcionario_service.authenticate(email, senha)
+	funcionario = await funcionario_service.authenticate(email, senha)
 	if funcionario:
 		response: Dict[str, object] = {
 			"tipo": "funcionario",
@@ -58,7 +58,7 @@ def login(payload: LoginPayload) -> Dict[str, object]:
 			response["cargo"] = cargo
 		return response
 
-	morador = morador_service.authenticate(email, senha)
+	morador = await morador_service.authenticate(email, senha)
 	if morador:
 		return {
 			"tipo": "morador",
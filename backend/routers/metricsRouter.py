@@ -0,0 +1,75 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+from ..persistence.poolStatistics import LatencyHistogram, prometheus_histogram, prometheus_labels
+
+router = APIRouter(tags=["admin"])
+
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_db_manager: Optional[AsyncDatabaseManager] = None
+
+
+class RouteMetrics:
+    """Latencia das requisicoes HTTP por metodo, rota (template) e status."""
+
+    def __init__(self) -> None:
+        self._series: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route, str(status_code))
+        histogram = self._series.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._series.setdefault(key, LatencyHistogram())
+        histogram.observe(seconds)
+
+
+    def render_prometheus(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+
+        lines = [
+            "# HELP http_request_duration_seconds Latencia das requisicoes HTTP por rota.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status_code), histogram in series:
+            labels = {"method": method, "route": route, "status": status_code}
+            lines.extend(prometheus_histogram("http_request_duration_seconds", labels, histogram.snapshot()))
+        return lines
+
+
+route_metrics = RouteMetrics()
+
+
+def set_database_manager(db_manager: AsyncDatabaseManager) -> None:
+    global _db_manager
+    _db_manager = db_manager
+
+
+def route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "nao_mapeada"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def obter_metricas() -> PlainTextResponse:
+    if _db_manager is None:
+        raise HTTPException(status_code=500, detail="Gerenciador de banco nao inicializado")
+
+    lines = _db_manager.query_metrics.render_prometheus()
+    lines.append("# HELP db_pool_checked_out Conexoes em uso por pool.")
+    lines.append("# TYPE db_pool_checked_out gauge")
+    pools = _db_manager.get_pool_status()
+    lines.append(f"db_pool_checked_out{prometheus_labels({'pool': 'primary'})} {pools['primary']['checked_out']}")
+    for name, status in pools["read"].items():
+        lines.append(f"db_pool_checked_out{prometheus_labels({'pool': f'read_{name}'})} {status['checked_out']}")
+    lines.extend(route_metrics.render_prometheus())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=_PROMETHEUS_CONTENT_TYPE)
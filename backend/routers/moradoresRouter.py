@@ -1,22 +1,30 @@
+import asyncio
+import io
+import tempfile
 from datetime import date
-from typing import Any, Dict, Optional, Sequence
+from typing import IO, Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, EmailStr, Field
 
-from ..service.moradorService import MoradorService
+from ..persistence.moradorRepository import MORADOR_FIELDS
+from ..service.moradorService import AsyncMoradorService
+from .fieldSelection import FIELDS_DESCRIPTION, parse_fields
+from ..service.moradorImport import IMPORT_READERS, ImportEvent, import_event
+from .jsonResponses import OrjsonResponse, dumps
 
 router = APIRouter(prefix="/moradores")
 
-_service: Optional[MoradorService] = None
+_service: Optional[AsyncMoradorService] = None
 
 
-def set_morador_service(service: MoradorService) -> None:
+def set_morador_service(service: AsyncMoradorService) -> None:
     global _service
     _service = service
 
 
-def _get_morador_service() -> MoradorService:
+def _get_morador_service() -> AsyncMoradorService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de morador nao inicializado")
     return _service
@@ -53,30 +61,35 @@ class MoradorUpdate(BaseModel):
     ddd: Optional[str] = None
 
 
-@router.get("/")
-def listar_moradores() -> Sequence[Dict[str, Any]]:
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_moradores(
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> OrjsonResponse:
     service = _get_morador_service()
-    return service.list_moradores()
+    return OrjsonResponse(await service.list_moradores(parse_fields(fields, MORADOR_FIELDS)))
 
 
 @router.get("/cpf/{cpf}")
-def obter_morador_por_cpf(cpf: str) -> Dict[str, Any]:
+async def obter_morador_por_cpf(
+    cpf: str,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Dict[str, Any]:
     service = _get_morador_service()
-    morador = service.get_morador_by_cpf(cpf)
+    morador = await service.get_morador_by_cpf(cpf, parse_fields(fields, MORADOR_FIELDS))
     if not morador:
         raise HTTPException(status_code=404, detail="Morador nao encontrado")
     return morador
 
 
 @router.post("/")
-def criar_morador(payload: MoradorCreate) -> Dict[str, Any]:
+async def criar_morador(payload: MoradorCreate) -> Dict[str, Any]:
     service = _get_morador_service()
 
     if payload.cod_local is None and payload.localidade is None:
         raise HTTPException(status_code=400, detail="Informe cod_local ou dados de localidade")
 
     try:
-        created = service.create_morador(
+        created = await service.create_morador(
             cpf=payload.cpf,
             nome=payload.nome,
             endereco=payload.endereco,
@@ -93,8 +106,57 @@ def criar_morador(payload: MoradorCreate) -> Dict[str, Any]:
     return created
 
 
+# Content-Type aceito por POST /moradores/import -> formato do arquivo.
+_IMPORT_CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+# Acima disso o corpo recebido vai para um arquivo temporario em disco.
+_IMPORT_SPOOL_BYTES = 1024 * 1024
+
+
+async def _spool_body(request: Request) -> IO[bytes]:
+    spool = tempfile.SpooledTemporaryFile(max_size=_IMPORT_SPOOL_BYTES)
+    try:
+        async for part in request.stream():
+            await asyncio.to_thread(spool.write, part)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def _import_lines(events: AsyncIterator[ImportEvent], source: IO[str]) -> AsyncIterator[bytes]:
+    try:
+        async for event in events:
+            yield dumps(import_event(event)) + b"\n"
+    finally:
+        source.close()
+
+
+@router.post("/import")
+async def importar_moradores(request: Request) -> Response:
+    """Importa moradores de um CSV (``text/csv``) ou NDJSON (``application/x-ndjson``) no corpo.
+
+    A resposta e NDJSON: uma linha por registro recusado (``tipo`` ``rejeitada``, com
+    ``linha``, ``motivo`` e ``registro``) e uma de ``progresso`` por bloco gravado.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    formato = _IMPORT_CONTENT_TYPES.get(content_type)
+    if formato is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Envie o arquivo como text/csv ou application/x-ndjson",
+        )
+
+    service = _get_morador_service()
+    # O corpo inteiro e recebido antes de gravar (em disco se for grande), e a leitura
+    # segue um bloco por vez a partir dele, com memoria limitada.
+    source = io.TextIOWrapper(await _spool_body(request), encoding="utf-8-sig", newline="")
+    events = service.import_moradores(IMPORT_READERS[formato](source))
+    return StreamingResponse(_import_lines(events, source), media_type="application/x-ndjson")
+
+
 @router.put("/{cpf}")
-def atualizar_morador(cpf: str, payload: MoradorUpdate) -> Dict[str, Any]:
+async def atualizar_morador(cpf: str, payload: MoradorUpdate) -> Dict[str, Any]:
     service = _get_morador_service()
 
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
@@ -106,7 +168,7 @@ def atualizar_morador(cpf: str, payload: MoradorUpdate) -> Dict[str, Any]:
             update_fields["localidade"] = localidade.model_dump()
 
     try:
-        updated = service.update_morador(cpf, **update_fields)
+        updated = await service.update_morador(cpf, **update_fields)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -116,11 +178,11 @@ def atualizar_morador(cpf: str, payload: MoradorUpdate) -> Dict[str, Any]:
 
 
 @router.delete("/{cpf}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_morador(cpf: str) -> Response:
+async def deletar_morador(cpf: str) -> Response:
     service = _get_morador_service()
-    morador = service.get_morador_by_cpf(cpf)
+    morador = await service.get_morador_by_cpf(cpf)
     if not morador:
         raise HTTPException(status_code=404, detail="Morador nao encontrado")
 
-    service.delete_morador(cpf)
+    await service.delete_morador(cpf)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,22 +1,28 @@
 from datetime import date
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Body, HTTPException, Query, Response, status
+from pydantic import BaseModel, Field, ValidationError
 
-from ..service.ocorrenciaService import OcorrenciaService
+from ..persistence.ocorrenciaRepository import OCORRENCIA_FIELDS
+from ..service.ocorrenciaService import AsyncOcorrenciaService
+from ..service.validation import validation_message
+from .fieldSelection import FIELDS_DESCRIPTION, parse_fields
+from .jsonResponses import OrjsonResponse
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, page_response
+from .streamingResponses import json_array_response, ndjson_response
 
 router = APIRouter(prefix="/ocorrencias")
 
-_service: Optional[OcorrenciaService] = None
+_service: Optional[AsyncOcorrenciaService] = None
 
 
-def set_ocorrencia_service(service: OcorrenciaService) -> None:
+def set_ocorrencia_service(service: AsyncOcorrenciaService) -> None:
     global _service
     _service = service
 
 
-def _get_ocorrencia_service() -> OcorrenciaService:
+def _get_ocorrencia_service() -> AsyncOcorrenciaService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de ocorrencia nao inicializado")
     return _service
@@ -48,27 +54,123 @@ class OcorrenciaUpdate(BaseModel):
     localidade: Optional[LocalidadePayload] = None
 
 
-@router.get("/")
-def listar_ocorrencias() -> Sequence[Dict[str, Any]]:
+# Itens aceitos por POST /ocorrencias/batch.
+MAX_BATCH_SIZE = 5000
+
+
+# Chave da paginacao: (data, cod_oco), na ordem de listagem.
+_PAGE_KEY = ("data", "cod_oco")
+_PAGE_KEY_TYPES = (str, int)
+
+
+async def _search_page(
+    filters: Dict[str, Any],
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+) -> Response:
+    page_size = limit or DEFAULT_PAGE_SIZE
+    page = await _get_ocorrencia_service().search_ocorrencias(
+        filters,
+        limit=page_size + 1,
+        after=decode_cursor(cursor, _PAGE_KEY_TYPES),
+        fields=parse_fields(fields, OCORRENCIA_FIELDS, required=_PAGE_KEY),
+    )
+    return page_response(page, page_size, _PAGE_KEY)
+
+
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_ocorrencias(
+    tipo_status: Optional[str] = None,
+    cod_tipo: Optional[int] = None,
+    cod_local: Optional[int] = None,
+    bairro: Optional[str] = None,
+    cidade: Optional[str] = None,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    cpf_morador: Optional[str] = None,
+    orgao_pub: Optional[int] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    filters = {
+        "tipo_status": tipo_status,
+        "cod_tipo": cod_tipo,
+        "cod_local": cod_local,
+        "bairro": bairro,
+        "cidade": cidade,
+        "data_inicio": data_inicio.isoformat() if data_inicio else None,
+        "data_fim": data_fim.isoformat() if data_fim else None,
+        "cpf_morador": cpf_morador,
+        "orgao_pub": orgao_pub,
+    }
+    filters = {name: value for name, value in filters.items() if value is not None}
+
+    # Sem filtros nem paginacao, a lista completa continua disponivel.
+    if not filters and limit is None and cursor is None:
+        service = _get_ocorrencia_service()
+        return json_array_response(service.stream_ocorrencias(parse_fields(fields, OCORRENCIA_FIELDS)))
+    return await _search_page(filters, limit, cursor, fields)
+
+
+@router.get("/export.ndjson")
+async def exportar_ocorrencias(
+    since: Optional[date] = Query(default=None, description="Apenas ocorrencias com data a partir deste dia"),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    # Uma ocorrencia por linha, em ordem crescente de (data, cod_oco), lida de um cursor no servidor.
+    service = _get_ocorrencia_service()
+    return ndjson_response(
+        service.export_ocorrencias(since.isoformat() if since else None, parse_fields(fields, OCORRENCIA_FIELDS))
+    )
+
+
+@router.get("/full", response_model=List[Dict[str, Any]])
+async def obter_ocorrencias_completas(
+    cod_oco: List[int] = Query(
+        ...,
+        min_length=1,
+        max_length=MAX_PAGE_SIZE,
+        description="Codigos das ocorrencias (repita o parametro: ?cod_oco=1&cod_oco=2)",
+    ),
+) -> Response:
+    # Ocorrencias com servicos e avaliacao em tres consultas, qualquer que seja a quantidade.
     service = _get_ocorrencia_service()
-    return service.list_ocorrencias()
+    return OrjsonResponse(await service.get_ocorrencias_full(cod_oco))
 
 
-@router.get("/cpf/{cpf}")
-def listar_ocorrencias_por_cpf(cpf: str) -> Sequence[Dict[str, Any]]:
+@router.get("/{cod_oco}/full")
+async def obter_ocorrencia_completa(cod_oco: int) -> Response:
     service = _get_ocorrencia_service()
-    return service.list_ocorrencias_by_morador(cpf)
+    ocorrencia = await service.get_ocorrencia_full(cod_oco)
+    if not ocorrencia:
+        raise HTTPException(status_code=404, detail="Ocorrencia nao encontrada")
+    return OrjsonResponse(ocorrencia)
+
+
+@router.get("/cpf/{cpf}", response_model=List[Dict[str, Any]])
+async def listar_ocorrencias_por_cpf(
+    cpf: str,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> Response:
+    if limit is None and cursor is None:
+        service = _get_ocorrencia_service()
+        return OrjsonResponse(await service.list_ocorrencias_by_morador(cpf, parse_fields(fields, OCORRENCIA_FIELDS)))
+    return await _search_page({"cpf_morador": cpf}, limit, cursor, fields)
 
 
 @router.post("/")
-def criar_ocorrencia(payload: OcorrenciaCreate) -> Dict[str, Any]:
+async def criar_ocorrencia(payload: OcorrenciaCreate) -> Dict[str, Any]:
     service = _get_ocorrencia_service()
 
     if payload.cod_local is None and payload.localidade is None:
         raise HTTPException(status_code=400, detail="Informe cod_local ou dados de localidade")
 
     try:
-        created = service.create_ocorrencia(
+        created = await service.create_ocorrencia(
             cod_tipo=payload.cod_tipo,
             cpf_morador=payload.cpf_morador,
             endereco=payload.endereco,
@@ -83,8 +185,47 @@ def criar_ocorrencia(payload: OcorrenciaCreate) -> Dict[str, Any]:
     return created
 
 
+@router.post("/batch")
+async def criar_ocorrencias_em_lote(
+    payload: List[Any] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE),
+) -> Response:
+    # Cada item e validado sozinho: um item invalido vira um erro no resultado, sem recusar o lote.
+    service = _get_ocorrencia_service()
+    items: List[Dict[str, Any]] = []
+    invalid: Dict[int, str] = {}
+    for index, raw in enumerate(payload):
+        try:
+            item = OcorrenciaCreate.model_validate(raw)
+        except ValidationError as exc:
+            invalid[index] = validation_message(exc)
+            continue
+        items.append(
+            {
+                "cod_tipo": item.cod_tipo,
+                "cpf_morador": item.cpf_morador,
+                "endereco": item.endereco,
+                "data": item.data.isoformat(),
+                "tipo_status": "NAO INICIADA",
+                "descr": item.descr,
+                "cod_local": item.cod_local,
+                "localidade": item.localidade.model_dump() if item.localidade else None,
+            }
+        )
+
+    valid_indexes = [index for index in range(len(payload)) if index not in invalid]
+    results = [{"indice": index, "erro": message} for index, message in invalid.items()]
+    if items:
+        for result in await service.create_ocorrencias(items):
+            result["indice"] = valid_indexes[result["indice"]]
+            results.append(result)
+    results.sort(key=lambda result: result["indice"])
+
+    inseridas = sum(1 for result in results if "cod_oco" in result)
+    return OrjsonResponse({"inseridas": inseridas, "erros": len(results) - inseridas, "resultados": results})
+
+
 @router.put("/{cod_oco}")
-def atualizar_ocorrencia(cod_oco: int, payload: OcorrenciaUpdate) -> Dict[str, Any]:
+async def atualizar_ocorrencia(cod_oco: int, payload: OcorrenciaUpdate) -> Dict[str, Any]:
     service = _get_ocorrencia_service()
 
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
@@ -96,7 +237,7 @@ def atualizar_ocorrencia(cod_oco: int, payload: OcorrenciaUpdate) -> Dict[str, A
             update_fields["localidade"] = localidade.model_dump()
 
     try:
-        updated = service.update_ocorrencia(cod_oco, **update_fields)
+        updated = await service.update_ocorrencia(cod_oco, **update_fields)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -106,11 +247,11 @@ def atualizar_ocorrencia(cod_oco: int, payload: OcorrenciaUpdate) -> Dict[str, A
 
 
 @router.delete("/{cod_oco}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_ocorrencia(cod_oco: int) -> Response:
+async def deletar_ocorrencia(cod_oco: int) -> Response:
     service = _get_ocorrencia_service()
-    ocorrencia = service.get_ocorrencia_by_id(cod_oco)
+    ocorrencia = await service.get_ocorrencia_by_id(cod_oco)
     if not ocorrencia:
         raise HTTPException(status_code=404, detail="Ocorrencia nao encontrada")
 
-    service.delete_ocorrencia(cod_oco)
+    await service.delete_ocorrencia(cod_oco)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
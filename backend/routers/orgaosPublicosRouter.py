@@ -1,22 +1,23 @@
 from datetime import date
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel, Field
 
-from ..service.orgaoPublicoService import OrgaoPublicoService
+from ..service.orgaoPublicoService import AsyncOrgaoPublicoService
+from .jsonResponses import OrjsonResponse
 
 router = APIRouter(prefix="/orgaos-publicos")
 
-_service: Optional[OrgaoPublicoService] = None
+_service: Optional[AsyncOrgaoPublicoService] = None
 
 
-def set_orgao_publico_service(service: OrgaoPublicoService) -> None:
+def set_orgao_publico_service(service: AsyncOrgaoPublicoService) -> None:
     global _service
     _service = service
 
 
-def _get_service() -> OrgaoPublicoService:
+def _get_service() -> AsyncOrgaoPublicoService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de orgao publico nao inicializado")
     return _service
@@ -42,25 +43,25 @@ def _date_to_iso(value: Optional[date]) -> Optional[str]:
     return value.isoformat() if value else None
 
 
-@router.get("/")
-def listar_orgaos_publicos() -> Sequence[Dict[str, Any]]:
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_orgaos_publicos() -> OrjsonResponse:
     service = _get_service()
-    return service.list_orgaos_publicos()
+    return OrjsonResponse(await service.list_orgaos_publicos())
 
 
 @router.get("/{cod_orgao}")
-def obter_orgao_publico(cod_orgao: int) -> Dict[str, Any]:
+async def obter_orgao_publico(cod_orgao: int) -> Dict[str, Any]:
     service = _get_service()
-    orgao = service.get_orgao_by_id(cod_orgao)
+    orgao = await service.get_orgao_by_id(cod_orgao)
     if not orgao:
         raise HTTPException(status_code=404, detail="Orgao publico nao encontrado")
     return orgao
 
 
 @router.post("/")
-def criar_orgao_publico(payload: OrgaoPublicoCreate) -> Dict[str, Any]:
+async def criar_orgao_publico(payload: OrgaoPublicoCreate) -> Dict[str, Any]:
     service = _get_service()
-    created = service.create_orgao_publico(
+    created = await service.create_orgao_publico(
         nome=payload.nome,
         estado=payload.estado,
         descr=payload.descr,
@@ -71,7 +72,7 @@ def criar_orgao_publico(payload: OrgaoPublicoCreate) -> Dict[str, Any]:
 
 
 @router.put("/{cod_orgao}")
-def atualizar_orgao_publico(cod_orgao: int, payload: OrgaoPublicoUpdate) -> Dict[str, Any]:
+async def atualizar_orgao_publico(cod_orgao: int, payload: OrgaoPublicoUpdate) -> Dict[str, Any]:
     service = _get_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
@@ -80,18 +81,18 @@ def atualizar_orgao_publico(cod_orgao: int, payload: OrgaoPublicoUpdate) -> Dict
     if "data_fim" in update_fields and update_fields["data_fim"] is not None:
         update_fields["data_fim"] = update_fields["data_fim"].isoformat()
 
-    updated = service.update_orgao_publico(cod_orgao, **update_fields)
+    updated = await service.update_orgao_publico(cod_orgao, **update_fields)
     if not updated:
         raise HTTPException(status_code=404, detail="Orgao publico nao encontrado")
     return updated
 
 
 @router.delete("/{cod_orgao}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_orgao_publico(cod_orgao: int) -> Response:
+async def deletar_orgao_publico(cod_orgao: int) -> Response:
     service = _get_service()
-    orgao = service.get_orgao_by_id(cod_orgao)
+    orgao = await service.get_orgao_by_id(cod_orgao)
     if not orgao:
         raise HTTPException(status_code=404, detail="Orgao publico nao encontrado")
 
-    service.delete_orgao_publico(cod_orgao)
+    await service.delete_orgao_publico(cod_orgao)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from ..persistence.rowSet import RowSet
+from .jsonResponses import dumps
+from .rowSerializer import ColumnEncoders, row_set_response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Cursor da proxima pagina; ausente na ultima pagina.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(dumps(list(values))).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: Optional[str], key_types: Sequence[type]) -> Optional[Tuple[Any, ...]]:
+    """Valores da chave gravados no cursor, ou ``None`` para a primeira pagina."""
+    if token is None:
+        return None
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor invalido") from None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(key_types)
+        or not all(isinstance(value, key_type) for value, key_type in zip(values, key_types))
+    ):
+        raise HTTPException(status_code=400, detail="Cursor invalido")
+    return tuple(values)
+
+
+def page_response(
+    page: RowSet,
+    limit: int,
+    key_columns: Sequence[str],
+    encoders: Optional[ColumnEncoders] = None,
+) -> Response:
+    """Resposta de uma pagina lida com ``limit + 1`` linhas.
+
+    A linha excedente so indica que existe proxima pagina; o cursor aponta para a
+    ultima linha devolvida.
+    """
+    rows = page.rows
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = dict(zip(page.columns, rows[-1]))
+        next_cursor = encode_cursor([last[column] for column in key_columns])
+
+    response = row_set_response(RowSet(page.columns, rows), encoders)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
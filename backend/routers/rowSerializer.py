@@ -0,0 +1,61 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from fastapi.responses import Response
+
+from ..persistence.rowSet import RowSet
+from .jsonResponses import dumps
+
+ColumnEncoders = Mapping[str, Callable[[Any], Any]]
+
+# Linhas convertidas em dicionarios por vez ao serializar um RowSet inteiro.
+_SERIALIZE_BATCH_SIZE = 1000
+
+
+class RowSetSerializer:
+    """Escreve objetos JSON a partir das tuplas de um ``RowSet``.
+
+    Os dicionarios existem apenas durante a chamada ao orjson, um bloco por vez;
+    ``encoders`` permite ajustar colunas especificas (ex.: bytes em base64).
+    """
+
+    def __init__(self, columns: Sequence[str], encoders: Optional[ColumnEncoders] = None) -> None:
+        self.columns = tuple(columns)
+        encoders = encoders or {}
+        self._column_encoders = tuple(
+            (column, encoders[column]) for column in self.columns if column in encoders
+        )
+
+
+    def encode_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        """Objetos separados por virgula, sem os colchetes do array."""
+        return dumps(self._records(rows))[1:-1]
+
+
+    def encode_lines(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        """Um objeto por linha, cada um terminado em ``\\n`` (NDJSON)."""
+        return b"".join(dumps(record) + b"\n" for record in self._records(rows))
+
+
+    def _records(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        columns = self.columns
+        records = [dict(zip(columns, row)) for row in rows]
+        for column, encoder in self._column_encoders:
+            for record in records:
+                record[column] = encoder(record[column])
+        return records
+
+
+def row_set_json(row_set: RowSet, encoders: Optional[ColumnEncoders] = None) -> bytes:
+    serializer = RowSetSerializer(row_set.columns, encoders)
+    rows = row_set.rows
+    parts = [b"["]
+    for start in range(0, len(rows), _SERIALIZE_BATCH_SIZE):
+        if start:
+            parts.append(b",")
+        parts.append(serializer.encode_rows(rows[start:start + _SERIALIZE_BATCH_SIZE]))
+    parts.append(b"]")
+    return b"".join(parts)
+
+
+def row_set_response(row_set: RowSet, encoders: Optional[ColumnEncoders] = None) -> Response:
+    return Response(content=row_set_json(row_set, encoders), media_type="application/json")
@@ -1,22 +1,25 @@
 from datetime import date
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from pydantic import BaseModel
 
-from ..service.servicoService import ServicoService
+from ..persistence.servicoRepository import SERVICO_FIELDS
+from ..service.servicoService import AsyncServicoService
+from .fieldSelection import FIELDS_DESCRIPTION, parse_fields
+from .jsonResponses import OrjsonResponse
 
 router = APIRouter(prefix="/servicos")
 
-_service: Optional[ServicoService] = None
+_service: Optional[AsyncServicoService] = None
 
 
-def set_servico_service(service: ServicoService) -> None:
+def set_servico_service(service: AsyncServicoService) -> None:
     global _service
     _service = service
 
 
-def _get_service() -> ServicoService:
+def _get_service() -> AsyncServicoService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de servico nao inicializado")
     return _service
@@ -44,22 +47,29 @@ def _date_to_iso(value: Optional[date]) -> Optional[str]:
     return value.isoformat() if value else None
 
 
-@router.get("/")
-def listar_servicos() -> Sequence[Dict[str, Any]]:
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_servicos(
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> OrjsonResponse:
     service = _get_service()
-    return service.list_servicos()
+    return OrjsonResponse(await service.list_servicos(parse_fields(fields, SERVICO_FIELDS)))
 
 
-@router.get("/ocorrencia/{cod_ocorrencia}")
-def obter_servicos_por_ocorrencia(cod_ocorrencia: int) -> Sequence[Dict[str, Any]]:
+@router.get("/ocorrencia/{cod_ocorrencia}", response_model=List[Dict[str, Any]])
+async def obter_servicos_por_ocorrencia(
+    cod_ocorrencia: int,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+) -> OrjsonResponse:
     service = _get_service()
-    return service.get_servicos_by_ocorrencia(cod_ocorrencia)
+    return OrjsonResponse(
+        await service.get_servicos_by_ocorrencia(cod_ocorrencia, parse_fields(fields, SERVICO_FIELDS))
+    )
 
 
 @router.post("/")
-def criar_servico(payload: ServicoCreate) -> Dict[str, Any]:
+async def criar_servico(payload: ServicoCreate) -> Dict[str, Any]:
     service = _get_service()
-    created = service.create_servico(
+    created = await service.create_servico(
         cod_orgao=payload.cod_orgao,
         cod_ocorrencia=payload.cod_ocorrencia,
         nome=payload.nome,
@@ -71,7 +81,7 @@ def criar_servico(payload: ServicoCreate) -> Dict[str, Any]:
 
 
 @router.put("/{cod_servico}")
-def atualizar_servico(cod_servico: int, payload: ServicoUpdate) -> Dict[str, Any]:
+async def atualizar_servico(cod_servico: int, payload: ServicoUpdate) -> Dict[str, Any]:
     service = _get_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
@@ -80,18 +90,18 @@ def atualizar_servico(cod_servico: int, payload: ServicoUpdate) -> Dict[str, Any
     if "fim_servico" in update_fields and update_fields["fim_servico"] is not None:
         update_fields["fim_servico"] = update_fields["fim_servico"].isoformat()
 
-    updated = service.update_servico(cod_servico, **update_fields)
+    updated = await service.update_servico(cod_servico, **update_fields)
     if not updated:
         raise HTTPException(status_code=404, detail="Servico nao encontrado")
     return updated
 
 
 @router.delete("/{cod_servico}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_servico(cod_servico: int) -> Response:
+async def deletar_servico(cod_servico: int) -> Response:
     service = _get_service()
-    servico = service.get_servico_by_id(cod_servico)
+    servico = await service.get_servico_by_id(cod_servico)
     if not servico:
         raise HTTPException(status_code=404, detail="Servico nao encontrado")
 
-    service.delete_servico(cod_servico)
+    await service.delete_servico(cod_servico)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,44 @@
+from typing import AsyncIterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+from ..persistence.rowSet import RowSet
+from .rowSerializer import ColumnEncoders, RowSetSerializer
+
+
+async def _json_array_chunks(chunks: AsyncIterator[RowSet], encoders: Optional[ColumnEncoders]) -> AsyncIterator[bytes]:
+    yield b"["
+    serializer: Optional[RowSetSerializer] = None
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if serializer is None:
+            serializer = RowSetSerializer(chunk.columns, encoders)
+            yield serializer.encode_rows(chunk.rows)
+        else:
+            yield b"," + serializer.encode_rows(chunk.rows)
+    yield b"]"
+
+
+async def _ndjson_chunks(chunks: AsyncIterator[RowSet], encoders: Optional[ColumnEncoders]) -> AsyncIterator[bytes]:
+    serializer: Optional[RowSetSerializer] = None
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if serializer is None:
+            serializer = RowSetSerializer(chunk.columns, encoders)
+        yield serializer.encode_lines(chunk.rows)
+
+
+def json_array_response(chunks: AsyncIterator[RowSet], encoders: Optional[ColumnEncoders] = None) -> StreamingResponse:
+    """Serializa blocos de linhas como um unico array JSON, sem materializar a lista inteira."""
+    return StreamingResponse(_json_array_chunks(chunks, encoders), media_type="application/json")
+
+
+def ndjson_response(chunks: AsyncIterator[RowSet], encoders: Optional[ColumnEncoders] = None) -> StreamingResponse:
+    """Serializa blocos de linhas como JSON delimitado por linhas (``application/x-ndjson``).
+
+    Cada bloco vai para o cliente assim que e lido do cursor, entao a memoria
+    fica limitada ao tamanho do bloco qualquer que seja o total exportado.
+    """
+    return StreamingResponse(_ndjson_chunks(chunks, encoders), media_type="application/x-ndjson")
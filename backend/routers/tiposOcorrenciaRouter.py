@@ -1,21 +1,22 @@
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel
 
-from ..service.tipoOcorrenciaService import TipoOcorrenciaService
+from ..service.tipoOcorrenciaService import AsyncTipoOcorrenciaService
+from .jsonResponses import OrjsonResponse
 
 router = APIRouter(prefix="/tipos-ocorrencias")
 
-_service: Optional[TipoOcorrenciaService] = None
+_service: Optional[AsyncTipoOcorrenciaService] = None
 
 
-def set_tipos_ocorrencia_service(service: TipoOcorrenciaService) -> None:
+def set_tipos_ocorrencia_service(service: AsyncTipoOcorrenciaService) -> None:
     global _service
     _service = service
 
 
-def _get_service() -> TipoOcorrenciaService:
+def _get_service() -> AsyncTipoOcorrenciaService:
     if _service is None:
         raise HTTPException(status_code=500, detail="Servico de tipos nao inicializado")
     return _service
@@ -33,25 +34,25 @@ class TipoOcorrenciaUpdate(BaseModel):
     orgao_pub: Optional[int] = None
 
 
-@router.get("/")
-def listar_tipos() -> Sequence[Dict[str, Any]]:
+@router.get("/", response_model=List[Dict[str, Any]])
+async def listar_tipos() -> OrjsonResponse:
     service = _get_service()
-    return service.list_tipos_ocorrencia()
+    return OrjsonResponse(await service.list_tipos_ocorrencia())
 
 
 @router.get("/{cod_tipo}")
-def obter_tipo(cod_tipo: int) -> Dict[str, Any]:
+async def obter_tipo(cod_tipo: int) -> Dict[str, Any]:
     service = _get_service()
-    tipo = service.get_tipo_by_id(cod_tipo)
+    tipo = await service.get_tipo_by_id(cod_tipo)
     if not tipo:
         raise HTTPException(status_code=404, detail="Tipo de ocorrencia nao encontrado")
     return tipo
 
 
 @router.post("/")
-def criar_tipo(payload: TipoOcorrenciaCreate) -> Dict[str, Any]:
+async def criar_tipo(payload: TipoOcorrenciaCreate) -> Dict[str, Any]:
     service = _get_service()
-    created = service.create_tipo_ocorrencia(
+    created = await service.create_tipo_ocorrencia(
         nome=payload.nome,
         descr=payload.descr,
         orgao_pub=payload.orgao_pub,
@@ -60,22 +61,22 @@ def criar_tipo(payload: TipoOcorrenciaCreate) -> Dict[str, Any]:
 
 
 @router.put("/{cod_tipo}")
-def atualizar_tipo(cod_tipo: int, payload: TipoOcorrenciaUpdate) -> Dict[str, Any]:
+async def atualizar_tipo(cod_tipo: int, payload: TipoOcorrenciaUpdate) -> Dict[str, Any]:
     service = _get_service()
     update_fields: Dict[str, Any] = payload.model_dump(exclude_unset=True)
 
-    updated = service.update_tipo_ocorrencia(cod_tipo, **update_fields)
+    updated = await service.update_tipo_ocorrencia(cod_tipo, **update_fields)
     if not updated:
         raise HTTPException(status_code=404, detail="Tipo de ocorrencia nao encontrado")
     return updated
 
 
 @router.delete("/{cod_tipo}", status_code=status.HTTP_204_NO_CONTENT)
-def deletar_tipo(cod_tipo: int) -> Response:
+async def deletar_tipo(cod_tipo: int) -> Response:
     service = _get_service()
-    tipo = service.get_tipo_by_id(cod_tipo)
+    tipo = await service.get_tipo_by_id(cod_tipo)
     if not tipo:
         raise HTTPException(status_code=404, detail="Tipo de ocorrencia nao encontrado")
 
-    service.delete_tipo_ocorrencia(cod_tipo)
+    await service.delete_tipo_ocorrencia(cod_tipo)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,16 +1,22 @@
 import logging
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..persistence.avaliacaoRepository import AvaliacaoRepository
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+from ..persistence.avaliacaoRepository import AsyncAvaliacaoRepository, AvaliacaoRepository
 from ..persistence.databaseManager import DatabaseManager
+from ..persistence.rowSet import RowSet
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
 
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
 class AvaliacaoService:
 
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -21,12 +27,35 @@ class AvaliacaoService:
         return self._repository.list_avaliacoes()
 
 
+    def stream_avaliacoes(self, fields: Optional[Sequence[str]] = None) -> Iterator[RowSet]:
+        return self._repository.stream_avaliacoes(fields=fields)
+
+
+    def export_avaliacoes(self, since: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> Iterator[RowSet]:
+        return self._repository.export_avaliacoes(since, fields=fields)
+
+
+    def search_avaliacoes(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        return self._repository.search_avaliacoes(filters, limit=limit, after=after, fields=fields)
+
+
     def get_avaliacao_by_id(self, cod_aval: int) -> Optional[dict[str, Any]]:
         return self._repository.get_avaliacao_by_id(cod_aval)
 
 
-    def get_avaliacao_by_ocorrencia(self, cod_ocorrencia: int) -> Optional[dict[str, Any]]:
-        return self._repository.get_avaliacao_by_ocorrencia(cod_ocorrencia)
+    def get_avaliacao_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[dict[str, Any]]:
+        return self._repository.get_avaliacao_by_ocorrencia(cod_ocorrencia, fields)
 
 
     def create_avaliacao(
@@ -40,7 +69,7 @@ class AvaliacaoService:
         opiniao: Optional[str],
     ) -> dict[str, Any]:
         try:
-            cod_aval = self._repository.create_avaliacao(
+            created = self._repository.create_avaliacao(
                 cod_ocorrencia=cod_ocorrencia,
                 cod_servico=cod_servico,
                 cpf_morador=cpf_morador,
@@ -52,7 +81,6 @@ class AvaliacaoService:
             logger.exception("Erro ao registrar avaliacao")
             raise
 
-        created = self.get_avaliacao_by_id(cod_aval)
         if created is None:
             raise RuntimeError("Avaliacao recem criada nao encontrada")
         return created
@@ -69,28 +97,20 @@ class AvaliacaoService:
         nota_tempo: Any = _UNSET,
         opiniao: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-        if cod_ocorrencia is not _UNSET:
-            fields_to_update["cod_ocorrencia"] = cod_ocorrencia
-        if cod_servico is not _UNSET:
-            fields_to_update["cod_servico"] = cod_servico
-        if cpf_morador is not _UNSET:
-            fields_to_update["cpf_morador"] = cpf_morador
-        if nota_serv is not _UNSET:
-            fields_to_update["nota_serv"] = nota_serv
-        if nota_tempo is not _UNSET:
-            fields_to_update["nota_tempo"] = nota_tempo
-        if opiniao is not _UNSET:
-            fields_to_update["opiniao"] = opiniao
-
-        if fields_to_update:
-            try:
-                self._repository.update_avaliacao(cod_aval, fields_to_update)
-            except SQLAlchemyError:
-                logger.exception("Erro ao atualizar avaliacao %s", cod_aval)
-                raise
-
-        return self.get_avaliacao_by_id(cod_aval)
+        fields_to_update = _changed_fields(
+            cod_ocorrencia=cod_ocorrencia,
+            cod_servico=cod_servico,
+            cpf_morador=cpf_morador,
+            nota_serv=nota_serv,
+            nota_tempo=nota_tempo,
+            opiniao=opiniao,
+        )
+
+        try:
+            return self._repository.update_avaliacao(cod_aval, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar avaliacao %s", cod_aval)
+            raise
 
 
     def delete_avaliacao(self, cod_aval: int) -> None:
@@ -99,3 +119,107 @@ class AvaliacaoService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar avaliacao %s", cod_aval)
             raise
+
+
+class AsyncAvaliacaoService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncAvaliacaoRepository(db_manager)
+
+
+    async def list_avaliacoes(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_avaliacoes()
+
+
+    def stream_avaliacoes(self, fields: Optional[Sequence[str]] = None) -> AsyncIterator[RowSet]:
+        return self._repository.stream_avaliacoes(fields=fields)
+
+
+    def export_avaliacoes(self, since: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> AsyncIterator[RowSet]:
+        return self._repository.export_avaliacoes(since, fields=fields)
+
+
+    async def search_avaliacoes(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        return await self._repository.search_avaliacoes(filters, limit=limit, after=after, fields=fields)
+
+
+    async def get_avaliacao_by_id(self, cod_aval: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_avaliacao_by_id(cod_aval)
+
+
+    async def get_avaliacao_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Optional[dict[str, Any]]:
+        return await self._repository.get_avaliacao_by_ocorrencia(cod_ocorrencia, fields)
+
+
+    async def create_avaliacao(
+        self,
+        *,
+        cod_ocorrencia: int,
+        cod_servico: int,
+        cpf_morador: str,
+        nota_serv: int,
+        nota_tempo: int,
+        opiniao: Optional[str],
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_avaliacao(
+                cod_ocorrencia=cod_ocorrencia,
+                cod_servico=cod_servico,
+                cpf_morador=cpf_morador,
+                nota_serv=nota_serv,
+                nota_tempo=nota_tempo,
+                opiniao=opiniao,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao registrar avaliacao")
+            raise
+
+        if created is None:
+            raise RuntimeError("Avaliacao recem criada nao encontrada")
+        return created
+
+
+    async def update_avaliacao(
+        self,
+        cod_aval: int,
+        *,
+        cod_ocorrencia: Any = _UNSET,
+        cod_servico: Any = _UNSET,
+        cpf_morador: Any = _UNSET,
+        nota_serv: Any = _UNSET,
+        nota_tempo: Any = _UNSET,
+        opiniao: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        fields_to_update = _changed_fields(
+            cod_ocorrencia=cod_ocorrencia,
+            cod_servico=cod_servico,
+            cpf_morador=cpf_morador,
+            nota_serv=nota_serv,
+            nota_tempo=nota_tempo,
+            opiniao=opiniao,
+        )
+
+        try:
+            return await self._repository.update_avaliacao(cod_aval, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar avaliacao %s", cod_aval)
+            raise
+
+
+    async def delete_avaliacao(self, cod_aval: int) -> None:
+        try:
+            await self._repository.delete_avaliacao(cod_aval)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar avaliacao %s", cod_aval)
+            raise
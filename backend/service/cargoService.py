@@ -3,13 +3,19 @@ from typing import Any, Dict, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
-from ..persistence.cargoRepository import CargoRepository
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+from ..persistence.cargoRepository import AsyncCargoRepository, CargoRepository
 from ..persistence.databaseManager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
 class CargoService:
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._repository = CargoRepository(db_manager)
@@ -25,12 +31,11 @@ class CargoService:
 
     def create_cargo(self, *, nome: str, descricao: Optional[str]) -> dict[str, Any]:
         try:
-            cod_cargo = self._repository.create_cargo(nome=nome, descricao=descricao)
+            created = self._repository.create_cargo(nome=nome, descricao=descricao)
         except SQLAlchemyError:
             logger.exception("Erro ao criar cargo")
             raise
 
-        created = self.get_cargo_by_id(int(cod_cargo))
         if created is None:
             raise RuntimeError("Cargo recem criado nao encontrado")
         return created
@@ -43,20 +48,13 @@ class CargoService:
         nome: Any = _UNSET,
         descricao: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if descricao is not _UNSET:
-            fields_to_update["descricao"] = descricao
+        fields_to_update = _changed_fields(nome=nome, descricao=descricao)
 
-        if fields_to_update:
-            try:
-                self._repository.update_cargo(cod_cargo, fields_to_update)
-            except SQLAlchemyError:
-                logger.exception("Erro ao atualizar cargo %s", cod_cargo)
-                raise
-
-        return self.get_cargo_by_id(cod_cargo)
+        try:
+            return self._repository.update_cargo(cod_cargo, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar cargo %s", cod_cargo)
+            raise
 
 
     def delete_cargo(self, cod_cargo: int) -> None:
@@ -65,3 +63,52 @@ class CargoService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar cargo %s", cod_cargo)
             raise
+
+
+class AsyncCargoService:
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncCargoRepository(db_manager)
+
+
+    async def list_cargos(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_cargos()
+
+
+    async def get_cargo_by_id(self, cod_cargo: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_cargo_by_id(cod_cargo)
+
+
+    async def create_cargo(self, *, nome: str, descricao: Optional[str]) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_cargo(nome=nome, descricao=descricao)
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar cargo")
+            raise
+
+        if created is None:
+            raise RuntimeError("Cargo recem criado nao encontrado")
+        return created
+
+
+    async def update_cargo(
+        self,
+        cod_cargo: int,
+        *,
+        nome: Any = _UNSET,
+        descricao: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        fields_to_update = _changed_fields(nome=nome, descricao=descricao)
+
+        try:
+            return await self._repository.update_cargo(cod_cargo, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar cargo %s", cod_cargo)
+            raise
+
+
+    async def delete_cargo(self, cod_cargo: int) -> None:
+        try:
+            await self._repository.delete_cargo(cod_cargo)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar cargo %s", cod_cargo)
+            raise
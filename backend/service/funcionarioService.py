@@ -1,49 +1,124 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Sequence
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
+from ..persistence.blobStore import BlobStore, blob_store_from_env
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.funcionarioRepository import FuncionarioRepository
+from ..persistence.funcionarioRepository import AsyncFuncionarioRepository, FuncionarioRepository
+from ..persistence.rowSet import RowSet
+from .thumbnailPool import THUMBNAIL_CONTENT_TYPE, ThumbnailPool
 
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+# (assinatura no inicio do arquivo, content type)
+_FOTO_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
+def foto_media_type(foto: bytes) -> str:
+    for signature, media_type in _FOTO_SIGNATURES:
+        if foto.startswith(signature):
+            return media_type
+    if foto[:4] == b"RIFF" and foto[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def _store_foto(blob_store: BlobStore, foto: bytes, thumbnails: Mapping[int, bytes]) -> Dict[str, Any]:
+    """Grava a foto e as miniaturas no BlobStore; devolve os metadados da tabela FOTO.
+
+    A gravacao antecede a transacao do cadastro; arquivos que ficam sem
+    referencia sao removidos por ``backend.commands.sweepFotoBlobs``.
+    """
+    return {
+        "hash": blob_store.put(foto),
+        "content_type": foto_media_type(foto),
+        "tamanho_bytes": len(foto),
+        "miniaturas": {
+            tamanho: {"hash": blob_store.put(miniatura), "content_type": THUMBNAIL_CONTENT_TYPE}
+            for tamanho, miniatura in thumbnails.items()
+        },
+    }
+
+
+def _auth_response(record: Optional[Dict[str, Any]], email: str, senha: str) -> Optional[dict[str, Any]]:
+    if not record:
+        return None
+    if record.get("senha") != senha:
+        return None
+
+    return {
+        "cpf": record["cpf"],
+        "nome": record["nome"],
+        "email": email,
+        "orgao_pub": record["orgao_pub"],
+        "cargo": record["cargo"],
+    }
+
 
 class FuncionarioService:
 
-    def __init__(self, db_manager: DatabaseManager) -> None:
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        thumbnail_pool: Optional[ThumbnailPool] = None,
+        blob_store: Optional[BlobStore] = None,
+    ) -> None:
         self._repository = FuncionarioRepository(db_manager)
+        self._thumbnails = thumbnail_pool or ThumbnailPool()
+        self._blob_store = blob_store or blob_store_from_env()
 
 
     def list_funcionarios(self) -> Sequence[dict[str, Any]]:
         return self._repository.list_funcionarios()
 
 
-    def get_funcionario_by_cpf(self, cpf: str) -> Optional[dict[str, Any]]:
-        return self._repository.get_funcionario_by_cpf(cpf)
+    def list_funcionario_rows(self, fields: Optional[Sequence[str]] = None) -> RowSet:
+        return self._repository.list_funcionario_rows(fields)
 
 
-    def get_funcionario_by_email(self, email: str) -> Optional[dict[str, Any]]:
-        return self._repository.get_funcionario_by_email(email)
+    def get_funcionario_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._repository.get_funcionario_by_cpf(cpf, fields)
+
+
+    def get_funcionario_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._repository.get_funcionario_by_email(email, fields)
 
 
     def authenticate(self, email: str, senha: str) -> Optional[dict[str, Any]]:
         record = self._repository.get_auth_record(email)
-        if not record:
-            return None
-        if record.get("senha") != senha:
-            return None
-
-        return {
-            "cpf": record["cpf"],
-            "nome": record["nome"],
-            "email": email,
-            "orgao_pub": record["orgao_pub"],
-            "cargo": record["cargo"],
-        }
+        return _auth_response(record, email, senha)
+
+
+    def get_foto(self, cpf: str) -> Optional[dict[str, Any]]:
+        return self._repository.get_foto(cpf)
+
+
+    def get_foto_miniatura(self, cpf: str, tamanho: int) -> Optional[dict[str, Any]]:
+        return self._repository.get_foto_miniatura(cpf, tamanho)
+
+
+    def foto_path(self, key: str) -> Optional[Path]:
+        return self._blob_store.local_path(key)
+
+
+    def read_foto(self, key: str) -> Optional[bytes]:
+        return self._blob_store.read(key)
 
 
     def create_funcionario(
@@ -70,14 +145,14 @@ class FuncionarioService:
             "fim_contrato": fim_contrato,
             "senha": senha,
         }
+        stored_foto = self._store_foto(foto) if foto is not None else None
 
         try:
-            self._repository.create_funcionario(payload, email=email, foto=foto)
+            created = self._repository.create_funcionario(payload, email=email, foto=stored_foto)
         except SQLAlchemyError:
             logger.exception("Erro ao criar funcionario")
             raise
 
-        created = self.get_funcionario_by_cpf(cpf)
         if created is None:
             raise RuntimeError("Funcionario recem criado nao encontrado")
         return created
@@ -97,40 +172,33 @@ class FuncionarioService:
         foto: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
 
-        fields_to_update: Dict[str, Any] = {}
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if orgao_pub is not _UNSET:
-            fields_to_update["orgao_pub"] = orgao_pub
-        if cargo is not _UNSET:
-            fields_to_update["cargo"] = cargo
-        if data_nasc is not _UNSET:
-            fields_to_update["data_nasc"] = data_nasc
-        if inicio_contrato is not _UNSET:
-            fields_to_update["inicio_contrato"] = inicio_contrato
-        if fim_contrato is not _UNSET:
-            fields_to_update["fim_contrato"] = fim_contrato
-        if senha is not _UNSET:
-            fields_to_update["senha"] = senha
+        fields_to_update = _changed_fields(
+            nome=nome,
+            orgao_pub=orgao_pub,
+            cargo=cargo,
+            data_nasc=data_nasc,
+            inicio_contrato=inicio_contrato,
+            fim_contrato=fim_contrato,
+            senha=senha,
+        )
 
         email_update = email is not _UNSET
         foto_update = foto is not _UNSET
+        stored_foto = self._store_foto(foto) if foto_update and foto is not None else None
 
         try:
-            self._repository.update_funcionario(
+            return self._repository.update_funcionario(
                 cpf,
                 fields_to_update,
                 email=email if email_update else None,
                 update_email=email_update,
-                foto=foto if foto_update else None,
+                foto=stored_foto,
                 update_foto=foto_update,
             )
         except SQLAlchemyError:
             logger.exception("Erro ao atualizar funcionario %s", cpf)
             raise
 
-        return self.get_funcionario_by_cpf(cpf)
-
 
     def delete_funcionario(self, cpf: str) -> None:
         try:
@@ -138,3 +206,149 @@ class FuncionarioService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar funcionario %s", cpf)
             raise
+
+
+    def _store_foto(self, foto: bytes) -> Dict[str, Any]:
+        return _store_foto(self._blob_store, foto, self._thumbnails.render(foto))
+
+
+class AsyncFuncionarioService:
+
+    def __init__(
+        self,
+        db_manager: AsyncDatabaseManager,
+        thumbnail_pool: Optional[ThumbnailPool] = None,
+        blob_store: Optional[BlobStore] = None,
+    ) -> None:
+        self._repository = AsyncFuncionarioRepository(db_manager)
+        self._thumbnails = thumbnail_pool or ThumbnailPool()
+        self._blob_store = blob_store or blob_store_from_env()
+
+
+    async def list_funcionarios(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_funcionarios()
+
+
+    async def list_funcionario_rows(self, fields: Optional[Sequence[str]] = None) -> RowSet:
+        return await self._repository.list_funcionario_rows(fields)
+
+
+    async def get_funcionario_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._repository.get_funcionario_by_cpf(cpf, fields)
+
+
+    async def get_funcionario_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._repository.get_funcionario_by_email(email, fields)
+
+
+    async def authenticate(self, email: str, senha: str) -> Optional[dict[str, Any]]:
+        record = await self._repository.get_auth_record(email)
+        return _auth_response(record, email, senha)
+
+
+    async def get_foto(self, cpf: str) -> Optional[dict[str, Any]]:
+        return await self._repository.get_foto(cpf)
+
+
+    async def get_foto_miniatura(self, cpf: str, tamanho: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_foto_miniatura(cpf, tamanho)
+
+
+    async def foto_path(self, key: str) -> Optional[Path]:
+        return await asyncio.to_thread(self._blob_store.local_path, key)
+
+
+    async def read_foto(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._blob_store.read, key)
+
+
+    async def create_funcionario(
+        self,
+        cpf: str,
+        nome: str,
+        orgao_pub: int,
+        cargo: int,
+        data_nasc: str,
+        inicio_contrato: str,
+        senha: str,
+        foto: Optional[bytes],
+        email: Optional[str],
+        fim_contrato: Optional[str] = None,
+    ) -> dict[str, Any]:
+
+        payload = {
+            "cpf": cpf,
+            "nome": nome,
+            "orgao_pub": orgao_pub,
+            "cargo": cargo,
+            "data_nasc": data_nasc,
+            "inicio_contrato": inicio_contrato,
+            "fim_contrato": fim_contrato,
+            "senha": senha,
+        }
+        stored_foto = await self._store_foto(foto) if foto is not None else None
+
+        try:
+            created = await self._repository.create_funcionario(payload, email=email, foto=stored_foto)
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar funcionario")
+            raise
+
+        if created is None:
+            raise RuntimeError("Funcionario recem criado nao encontrado")
+        return created
+
+
+    async def update_funcionario(
+        self,
+        cpf: str,
+        nome: Any = _UNSET,
+        orgao_pub: Any = _UNSET,
+        cargo: Any = _UNSET,
+        data_nasc: Any = _UNSET,
+        inicio_contrato: Any = _UNSET,
+        fim_contrato: Any = _UNSET,
+        senha: Any = _UNSET,
+        email: Any = _UNSET,
+        foto: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+
+        fields_to_update = _changed_fields(
+            nome=nome,
+            orgao_pub=orgao_pub,
+            cargo=cargo,
+            data_nasc=data_nasc,
+            inicio_contrato=inicio_contrato,
+            fim_contrato=fim_contrato,
+            senha=senha,
+        )
+
+        email_update = email is not _UNSET
+        foto_update = foto is not _UNSET
+        stored_foto = await self._store_foto(foto) if foto_update and foto is not None else None
+
+        try:
+            return await self._repository.update_funcionario(
+                cpf,
+                fields_to_update,
+                email=email if email_update else None,
+                update_email=email_update,
+                foto=stored_foto,
+                update_foto=foto_update,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar funcionario %s", cpf)
+            raise
+
+
+    async def delete_funcionario(self, cpf: str) -> None:
+        try:
+            await self._repository.delete_funcionario(cpf)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar funcionario %s", cpf)
+            raise
+
+
+    async def _store_foto(self, foto: bytes) -> Dict[str, Any]:
+        thumbnails = await self._thumbnails.render_async(foto)
+        return await asyncio.to_thread(_store_foto, self._blob_store, foto, thumbnails)
@@ -0,0 +1,131 @@
+import csv
+from datetime import date
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+import orjson
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, ValidationError
+
+from ..persistence.localidades import localidade_key
+from .validation import validation_message
+
+# Linhas lidas, validadas e gravadas por transacao.
+IMPORT_CHUNK_SIZE = 1000
+
+# (numero da linha no arquivo, registro lido)
+ImportRecord = Tuple[int, Any]
+
+
+class ImportRejection(NamedTuple):
+    linha: int
+    motivo: str
+    registro: Any
+
+
+class ImportProgress(NamedTuple):
+    lidas: int
+    importadas: int
+    rejeitadas: int
+
+
+ImportEvent = Union[ImportRejection, ImportProgress]
+
+
+class MoradorImportRow(BaseModel):
+    """Uma linha da importacao, com a localidade em colunas (``estado``, ``cidade``, ``bairro``)."""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    cpf: str = Field(..., min_length=1, max_length=11)
+    nome: str = Field(..., min_length=1, max_length=100)
+    endereco: str = Field(..., min_length=1, max_length=200)
+    data_nasc: date
+    senha: str = Field(..., min_length=1, max_length=100)
+    cod_local: Optional[int] = None
+    estado: Optional[str] = Field(default=None, max_length=30)
+    cidade: Optional[str] = Field(default=None, max_length=100)
+    bairro: Optional[str] = Field(default=None, max_length=100)
+    email: Optional[EmailStr] = None
+    telefone: Optional[str] = Field(default=None, max_length=9)
+    ddd: Optional[str] = Field(default=None, max_length=2)
+
+
+def read_csv_records(source: IO[str]) -> Iterator[ImportRecord]:
+    """Registros de um CSV com cabecalho; ``source`` deve ser aberto com ``newline=""``."""
+    reader = csv.DictReader(source)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def read_ndjson_records(source: IO[str]) -> Iterator[ImportRecord]:
+    """Um objeto JSON por linha; linhas em branco sao ignoradas e as invalidas seguem como texto."""
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield number, orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield number, line.rstrip("\r\n")
+
+
+IMPORT_READERS: Dict[str, Callable[[IO[str]], Iterator[ImportRecord]]] = {
+    "csv": read_csv_records,
+    "ndjson": read_ndjson_records,
+}
+
+
+def validate_record(record: Any) -> Dict[str, Any]:
+    """Linha pronta para ``MoradorRepository.import_moradores``; ``ValueError`` com o motivo."""
+    if not isinstance(record, Mapping):
+        raise ValueError("Registro deve ser um objeto JSON")
+
+    values = {name: value for name, value in record.items() if value != "" and value is not None}
+    nested = values.pop("localidade", None)
+    if isinstance(nested, Mapping):
+        values.update({name: value for name, value in nested.items() if value != "" and value is not None})
+    try:
+        row = MoradorImportRow.model_validate(values)
+    except ValidationError as exc:
+        raise ValueError(validation_message(exc)) from exc
+
+    localidade = None
+    if row.cod_local is None:
+        named = {name: getattr(row, name) for name in ("estado", "cidade", "bairro") if getattr(row, name)}
+        localidade = localidade_key(named)
+    return {
+        "cpf": row.cpf,
+        "nome": row.nome,
+        "endereco": row.endereco,
+        "data_nasc": row.data_nasc.isoformat(),
+        "senha": row.senha,
+        "cod_local": row.cod_local,
+        "localidade": localidade,
+        "email": row.email,
+        "telefone": row.telefone,
+        "ddd": row.ddd,
+    }
+
+
+def take_chunk(records: Iterator[ImportRecord], size: int) -> List[ImportRecord]:
+    return list(islice(records, size))
+
+
+def validate_chunk(chunk: Iterable[ImportRecord]) -> Tuple[List[Dict[str, Any]], List[ImportRecord], List[ImportRejection]]:
+    """Separa o bloco em linhas validas (com a origem de cada uma) e recusadas."""
+    rows: List[Dict[str, Any]] = []
+    sources: List[ImportRecord] = []
+    rejections: List[ImportRejection] = []
+    for number, record in chunk:
+        try:
+            rows.append(validate_record(record))
+        except ValueError as exc:
+            rejections.append(ImportRejection(number, str(exc), record))
+        else:
+            sources.append((number, record))
+    return rows, sources, rejections
+
+
+def import_event(event: ImportEvent) -> Dict[str, Any]:
+    """Evento como objeto JSON: ``tipo`` e ``rejeitada`` ou ``progresso``."""
+    tipo = "rejeitada" if isinstance(event, ImportRejection) else "progresso"
+    return {"tipo": tipo, **event._asdict()}
@@ -1,42 +1,100 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.moradorRepository import MoradorRepository
+from ..persistence.moradorRepository import AsyncMoradorRepository, MoradorRepository
+from .moradorImport import (
+    IMPORT_CHUNK_SIZE,
+    ImportEvent,
+    ImportProgress,
+    ImportRecord,
+    ImportRejection,
+    take_chunk,
+    validate_chunk,
+)
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+_IMPORT_CHUNK_ERROR = "Erro ao gravar o bloco desta linha"
+
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
+def _auth_response(record: Optional[Dict[str, Any]], email: str, senha: str) -> Optional[dict[str, Any]]:
+    if not record:
+        return None
+
+    if record.get("senha") != senha:
+        return None
+
+    return {
+        "cpf": record["cpf"],
+        "nome": record["nome"],
+        "email": email,
+    }
+
+
+def _update_arguments(
+    *,
+    nome: Any,
+    endereco: Any,
+    data_nasc: Any,
+    senha: Any,
+    cod_local: Any,
+    localidade: Any,
+    email: Any,
+    telefone: Any,
+    ddd: Any,
+) -> Dict[str, Any]:
+    return {
+        "fields_to_update": _changed_fields(
+            nome=nome,
+            endereco=endereco,
+            data_nasc=data_nasc,
+            senha=senha,
+        ),
+        "cod_local": cod_local if cod_local is not _UNSET else None,
+        "update_cod_local": cod_local is not _UNSET,
+        "localidade": localidade if localidade is not _UNSET else None,
+        "update_localidade": localidade is not _UNSET,
+        "email": email if email is not _UNSET else None,
+        "update_email": email is not _UNSET,
+        "telefone": telefone if telefone is not _UNSET else None,
+        "update_telefone": telefone is not _UNSET,
+        "ddd": ddd if ddd is not _UNSET else None,
+        "update_ddd": ddd is not _UNSET,
+    }
+
+
+def _chunk_rejections(sources: List[ImportRecord], rejected: Mapping[int, str]) -> List[ImportRejection]:
+    return [ImportRejection(sources[position][0], motivo, sources[position][1]) for position, motivo in sorted(rejected.items())]
+
+
 class MoradorService:
     
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._repository = MoradorRepository(db_manager)
 
 
-    def list_moradores(self) -> Sequence[dict[str, Any]]:
-        return self._repository.list_moradores()
+    def list_moradores(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return self._repository.list_moradores(fields)
 
 
-    def get_morador_by_cpf(self, cpf: str) -> Optional[dict[str, Any]]:
-        return self._repository.get_morador_by_cpf(cpf)
+    def get_morador_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return self._repository.get_morador_by_cpf(cpf, fields)
 
 
     def authenticate(self, email: str, senha: str) -> Optional[dict[str, Any]]:
         record = self._repository.get_auth_record(email)
-        if not record:
-            return None
-
-        if record.get("senha") != senha:
-            return None
-
-        return {
-            "cpf": record["cpf"],
-            "nome": record["nome"],
-            "email": email,
-        }
+        return _auth_response(record, email, senha)
 
 
     def create_morador(
@@ -54,7 +112,7 @@ class MoradorService:
         ddd: Optional[str] = None,
     ) -> dict[str, Any]:
         try:
-            self._repository.create_morador(
+            created = self._repository.create_morador(
                 cpf=cpf,
                 nome=nome,
                 endereco=endereco,
@@ -70,7 +128,6 @@ class MoradorService:
             logger.exception("Erro ao criar morador %s", cpf)
             raise
 
-        created = self.get_morador_by_cpf(cpf)
         if created is None:
             raise RuntimeError("Morador recem criado nao encontrado")
         return created
@@ -90,38 +147,25 @@ class MoradorService:
         telefone: Any = _UNSET,
         ddd: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if endereco is not _UNSET:
-            fields_to_update["endereco"] = endereco
-        if data_nasc is not _UNSET:
-            fields_to_update["data_nasc"] = data_nasc
-        if senha is not _UNSET:
-            fields_to_update["senha"] = senha
-
         try:
-            self._repository.update_morador(
+            return self._repository.update_morador(
                 cpf,
-                fields_to_update=fields_to_update,
-                cod_local=cod_local if cod_local is not _UNSET else None,
-                update_cod_local=cod_local is not _UNSET,
-                localidade=localidade if localidade is not _UNSET else None,
-                update_localidade=localidade is not _UNSET,
-                email=email if email is not _UNSET else None,
-                update_email=email is not _UNSET,
-                telefone=telefone if telefone is not _UNSET else None,
-                update_telefone=telefone is not _UNSET,
-                ddd=ddd if ddd is not _UNSET else None,
-                update_ddd=ddd is not _UNSET,
+                **_update_arguments(
+                    nome=nome,
+                    endereco=endereco,
+                    data_nasc=data_nasc,
+                    senha=senha,
+                    cod_local=cod_local,
+                    localidade=localidade,
+                    email=email,
+                    telefone=telefone,
+                    ddd=ddd,
+                ),
             )
         except SQLAlchemyError:
             logger.exception("Erro ao atualizar morador %s", cpf)
             raise
 
-        return self.get_morador_by_cpf(cpf)
-
 
     def delete_morador(self, cpf: str) -> None:
         try:
@@ -129,3 +173,165 @@ class MoradorService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar morador %s", cpf)
             raise
+
+
+    def import_moradores(
+        self,
+        records: Iterable[ImportRecord],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> Iterator[ImportEvent]:
+        """Importa os registros bloco a bloco, gerando as recusas e o progresso de cada bloco.
+
+        So um bloco fica em memoria; cada um e gravado na sua transacao, entao uma
+        importacao interrompida mantem os blocos anteriores.
+        """
+        records = iter(records)
+        lidas = importadas = rejeitadas = 0
+        while True:
+            chunk = take_chunk(records, chunk_size)
+            if not chunk:
+                break
+            rows, sources, rejections = validate_chunk(chunk)
+            if rows:
+                try:
+                    rejected = self._repository.import_moradores(rows)
+                except SQLAlchemyError:
+                    logger.exception("Erro ao importar bloco de moradores")
+                    rejected = {position: _IMPORT_CHUNK_ERROR for position in range(len(rows))}
+                rejections.extend(_chunk_rejections(sources, rejected))
+                rejections.sort(key=lambda rejection: rejection.linha)
+            yield from rejections
+            lidas += len(chunk)
+            rejeitadas += len(rejections)
+            importadas = lidas - rejeitadas
+            yield ImportProgress(lidas, importadas, rejeitadas)
+        if not lidas:
+            yield ImportProgress(0, 0, 0)
+
+
+class AsyncMoradorService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncMoradorRepository(db_manager)
+
+
+    async def list_moradores(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_moradores(fields)
+
+
+    async def get_morador_by_cpf(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Optional[dict[str, Any]]:
+        return await self._repository.get_morador_by_cpf(cpf, fields)
+
+
+    async def authenticate(self, email: str, senha: str) -> Optional[dict[str, Any]]:
+        record = await self._repository.get_auth_record(email)
+        return _auth_response(record, email, senha)
+
+
+    async def create_morador(
+        self,
+        *,
+        cpf: str,
+        nome: str,
+        endereco: str,
+        data_nasc: str,
+        senha: str,
+        cod_local: Optional[int] = None,
+        localidade: Optional[Dict[str, str]] = None,
+        email: Optional[str] = None,
+        telefone: Optional[str] = None,
+        ddd: Optional[str] = None,
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_morador(
+                cpf=cpf,
+                nome=nome,
+                endereco=endereco,
+                data_nasc=data_nasc,
+                senha=senha,
+                cod_local=cod_local,
+                localidade=localidade,
+                email=email,
+                telefone=telefone,
+                ddd=ddd,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar morador %s", cpf)
+            raise
+
+        if created is None:
+            raise RuntimeError("Morador recem criado nao encontrado")
+        return created
+
+
+    async def update_morador(
+        self,
+        cpf: str,
+        *,
+        nome: Any = _UNSET,
+        endereco: Any = _UNSET,
+        data_nasc: Any = _UNSET,
+        senha: Any = _UNSET,
+        cod_local: Any = _UNSET,
+        localidade: Any = _UNSET,
+        email: Any = _UNSET,
+        telefone: Any = _UNSET,
+        ddd: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        try:
+            return await self._repository.update_morador(
+                cpf,
+                **_update_arguments(
+                    nome=nome,
+                    endereco=endereco,
+                    data_nasc=data_nasc,
+                    senha=senha,
+                    cod_local=cod_local,
+                    localidade=localidade,
+                    email=email,
+                    telefone=telefone,
+                    ddd=ddd,
+                ),
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar morador %s", cpf)
+            raise
+
+
+    async def delete_morador(self, cpf: str) -> None:
+        try:
+            await self._repository.delete_morador(cpf)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar morador %s", cpf)
+            raise
+
+
+    async def import_moradores(
+        self,
+        records: Iterable[ImportRecord],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[ImportEvent]:
+        # A leitura (arquivo local) e a validacao de cada bloco rodam fora do event loop.
+        records = iter(records)
+        lidas = importadas = rejeitadas = 0
+        while True:
+            chunk = await asyncio.to_thread(take_chunk, records, chunk_size)
+            if not chunk:
+                break
+            rows, sources, rejections = await asyncio.to_thread(validate_chunk, chunk)
+            if rows:
+                try:
+                    rejected = await self._repository.import_moradores(rows)
+                except SQLAlchemyError:
+                    logger.exception("Erro ao importar bloco de moradores")
+                    rejected = {position: _IMPORT_CHUNK_ERROR for position in range(len(rows))}
+                rejections.extend(_chunk_rejections(sources, rejected))
+                rejections.sort(key=lambda rejection: rejection.linha)
+            for rejection in rejections:
+                yield rejection
+            lidas += len(chunk)
+            rejeitadas += len(rejections)
+            importadas = lidas - rejeitadas
+            yield ImportProgress(lidas, importadas, rejeitadas)
+        if not lidas:
+            yield ImportProgress(0, 0, 0)
@@ -1,15 +1,56 @@
 import logging
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.ocorrenciaRepository import OcorrenciaRepository
+from ..persistence.ocorrenciaRepository import AsyncOcorrenciaRepository, OcorrenciaKey, OcorrenciaRepository
+from ..persistence.rowSet import RowSet
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+# Ocorrencias gravadas por transacao em create_ocorrencias.
+BATCH_CHUNK_SIZE = 500
+_BATCH_CHUNK_ERROR = "Erro ao gravar o lote desta ocorrencia"
+
+
+def _update_arguments(
+    *,
+    cod_tipo: Any,
+    cpf_morador: Any,
+    endereco: Any,
+    data: Any,
+    tipo_status: Any,
+    descr: Any,
+    cod_local: Any,
+    localidade: Any,
+) -> Dict[str, Any]:
+    candidates = {
+        "cod_tipo": cod_tipo,
+        "cpf_morador": cpf_morador,
+        "endereco": endereco,
+        "data": data,
+        "tipo_status": tipo_status,
+        "descr": descr,
+    }
+    return {
+        "fields_to_update": {
+            column: value for column, value in candidates.items() if value is not _UNSET
+        },
+        "cod_local": cod_local if cod_local is not _UNSET else None,
+        "update_cod_local": cod_local is not _UNSET,
+        "localidade": localidade if localidade is not _UNSET else None,
+        "update_localidade": localidade is not _UNSET,
+    }
+
+
+def _batch_results(count: int, errors: Mapping[int, str]) -> List[Dict[str, Any]]:
+    return [{"indice": index, "erro": errors[index]} if index in errors else {"indice": index} for index in range(count)]
+
+
 class OcorrenciaService:
     
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -20,14 +61,42 @@ class OcorrenciaService:
         return self._repository.list_ocorrencias()
 
 
-    def list_ocorrencias_by_morador(self, cpf: str) -> Sequence[dict[str, Any]]:
-        return self._repository.list_ocorrencias_by_morador(cpf)
+    def stream_ocorrencias(self, fields: Optional[Sequence[str]] = None) -> Iterator[RowSet]:
+        return self._repository.stream_ocorrencias(fields=fields)
+
+
+    def export_ocorrencias(self, since: Optional[str] = None, fields: Optional[Sequence[str]] = None) -> Iterator[RowSet]:
+        return self._repository.export_ocorrencias(since, fields=fields)
+
+
+    def list_ocorrencias_by_morador(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return self._repository.list_ocorrencias_by_morador(cpf, fields)
+
+
+    def search_ocorrencias(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[OcorrenciaKey] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        return self._repository.search_ocorrencias(filters, limit=limit, after=after, fields=fields)
 
 
     def get_ocorrencia_by_id(self, cod_oco: int) -> Optional[dict[str, Any]]:
         return self._repository.get_ocorrencia_by_id(cod_oco)
 
 
+    def get_ocorrencia_full(self, cod_oco: int) -> Optional[dict[str, Any]]:
+        result = self._repository.get_ocorrencias_full([cod_oco])
+        return result[0] if result else None
+
+
+    def get_ocorrencias_full(self, cod_ocos: Sequence[int]) -> List[dict[str, Any]]:
+        return self._repository.get_ocorrencias_full(cod_ocos)
+
+
     def create_ocorrencia(
         self,
         *,
@@ -41,7 +110,7 @@ class OcorrenciaService:
         localidade: Optional[Dict[str, str]] = None,
     ) -> dict[str, Any]:
         try:
-            cod_oco = self._repository.create_ocorrencia(
+            created = self._repository.create_ocorrencia(
                 cod_tipo=cod_tipo,
                 cpf_morador=cpf_morador,
                 cod_local=cod_local,
@@ -55,12 +124,38 @@ class OcorrenciaService:
             logger.exception("Erro ao criar ocorrencia")
             raise
 
-        created = self.get_ocorrencia_by_id(int(cod_oco))
         if created is None:
             raise RuntimeError("Ocorrencia recem criada nao encontrada")
         return created
 
 
+    def create_ocorrencias(
+        self,
+        items: Sequence[Mapping[str, Any]],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Grava varias ocorrencias; um resultado por item, com ``cod_oco`` ou ``erro``.
+
+        Referencias e localidades sao resolvidas uma vez para o lote inteiro e as
+        linhas sao gravadas em transacoes de ``chunk_size``; a falha de um bloco
+        nao desfaz os anteriores.
+        """
+        rows, errors = self._repository.prepare_ocorrencias(items)
+        results = _batch_results(len(items), errors)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                cod_ocos = self._repository.insert_ocorrencias([row for _, row in chunk])
+            except SQLAlchemyError:
+                logger.exception("Erro ao gravar lote de ocorrencias")
+                for index, _ in chunk:
+                    results[index]["erro"] = _BATCH_CHUNK_ERROR
+                continue
+            for (index, _), cod_oco in zip(chunk, cod_ocos):
+                results[index]["cod_oco"] = cod_oco
+        return results
+
+
     def update_ocorrencia(
         self,
         cod_oco: int,
@@ -74,36 +169,24 @@ class OcorrenciaService:
         cod_local: Any = _UNSET,
         localidade: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-
-        if cod_tipo is not _UNSET:
-            fields_to_update["cod_tipo"] = cod_tipo
-        if cpf_morador is not _UNSET:
-            fields_to_update["cpf_morador"] = cpf_morador
-        if endereco is not _UNSET:
-            fields_to_update["endereco"] = endereco
-        if data is not _UNSET:
-            fields_to_update["data"] = data
-        if tipo_status is not _UNSET:
-            fields_to_update["tipo_status"] = tipo_status
-        if descr is not _UNSET:
-            fields_to_update["descr"] = descr
-
         try:
-            self._repository.update_ocorrencia(
+            return self._repository.update_ocorrencia(
                 cod_oco,
-                fields_to_update=fields_to_update,
-                cod_local=cod_local if cod_local is not _UNSET else None,
-                update_cod_local=cod_local is not _UNSET,
-                localidade=localidade if localidade is not _UNSET else None,
-                update_localidade=localidade is not _UNSET,
+                **_update_arguments(
+                    cod_tipo=cod_tipo,
+                    cpf_morador=cpf_morador,
+                    endereco=endereco,
+                    data=data,
+                    tipo_status=tipo_status,
+                    descr=descr,
+                    cod_local=cod_local,
+                    localidade=localidade,
+                ),
             )
         except SQLAlchemyError:
             logger.exception("Erro ao atualizar ocorrencia %s", cod_oco)
             raise
 
-        return self.get_ocorrencia_by_id(cod_oco)
-
 
     def delete_ocorrencia(self, cod_oco: int) -> None:
         try:
@@ -111,3 +194,146 @@ class OcorrenciaService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar ocorrencia %s", cod_oco)
             raise
+
+
+class AsyncOcorrenciaService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncOcorrenciaRepository(db_manager)
+
+
+    async def list_ocorrencias(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_ocorrencias()
+
+
+    def stream_ocorrencias(self, fields: Optional[Sequence[str]] = None) -> AsyncIterator[RowSet]:
+        return self._repository.stream_ocorrencias(fields=fields)
+
+
+    def export_ocorrencias(
+        self,
+        since: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[RowSet]:
+        return self._repository.export_ocorrencias(since, fields=fields)
+
+
+    async def list_ocorrencias_by_morador(self, cpf: str, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_ocorrencias_by_morador(cpf, fields)
+
+
+    async def search_ocorrencias(
+        self,
+        filters: Mapping[str, Any],
+        *,
+        limit: int,
+        after: Optional[OcorrenciaKey] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> RowSet:
+        return await self._repository.search_ocorrencias(filters, limit=limit, after=after, fields=fields)
+
+
+    async def get_ocorrencia_by_id(self, cod_oco: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_ocorrencia_by_id(cod_oco)
+
+
+    async def get_ocorrencia_full(self, cod_oco: int) -> Optional[dict[str, Any]]:
+        result = await self._repository.get_ocorrencias_full([cod_oco])
+        return result[0] if result else None
+
+
+    async def get_ocorrencias_full(self, cod_ocos: Sequence[int]) -> List[dict[str, Any]]:
+        return await self._repository.get_ocorrencias_full(cod_ocos)
+
+
+    async def create_ocorrencia(
+        self,
+        *,
+        cod_tipo: int,
+        cpf_morador: str,
+        endereco: str,
+        data: str,
+        tipo_status: str,
+        descr: Optional[str],
+        cod_local: Optional[int] = None,
+        localidade: Optional[Dict[str, str]] = None,
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_ocorrencia(
+                cod_tipo=cod_tipo,
+                cpf_morador=cpf_morador,
+                cod_local=cod_local,
+                endereco=endereco,
+                data=data,
+                tipo_status=tipo_status,
+                descr=descr,
+                localidade=localidade,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar ocorrencia")
+            raise
+
+        if created is None:
+            raise RuntimeError("Ocorrencia recem criada nao encontrada")
+        return created
+
+
+    async def create_ocorrencias(
+        self,
+        items: Sequence[Mapping[str, Any]],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> List[Dict[str, Any]]:
+        rows, errors = await self._repository.prepare_ocorrencias(items)
+        results = _batch_results(len(items), errors)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                cod_ocos = await self._repository.insert_ocorrencias([row for _, row in chunk])
+            except SQLAlchemyError:
+                logger.exception("Erro ao gravar lote de ocorrencias")
+                for index, _ in chunk:
+                    results[index]["erro"] = _BATCH_CHUNK_ERROR
+                continue
+            for (index, _), cod_oco in zip(chunk, cod_ocos):
+                results[index]["cod_oco"] = cod_oco
+        return results
+
+
+    async def update_ocorrencia(
+        self,
+        cod_oco: int,
+        *,
+        cod_tipo: Any = _UNSET,
+        cpf_morador: Any = _UNSET,
+        endereco: Any = _UNSET,
+        data: Any = _UNSET,
+        tipo_status: Any = _UNSET,
+        descr: Any = _UNSET,
+        cod_local: Any = _UNSET,
+        localidade: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        try:
+            return await self._repository.update_ocorrencia(
+                cod_oco,
+                **_update_arguments(
+                    cod_tipo=cod_tipo,
+                    cpf_morador=cpf_morador,
+                    endereco=endereco,
+                    data=data,
+                    tipo_status=tipo_status,
+                    descr=descr,
+                    cod_local=cod_local,
+                    localidade=localidade,
+                ),
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar ocorrencia %s", cod_oco)
+            raise
+
+
+    async def delete_ocorrencia(self, cod_oco: int) -> None:
+        try:
+            await self._repository.delete_ocorrencia(cod_oco)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar ocorrencia %s", cod_oco)
+            raise
@@ -3,13 +3,19 @@ from typing import Any, Dict, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.orgaoPublicoRepository import OrgaoPublicoRepository
+from ..persistence.orgaoPublicoRepository import AsyncOrgaoPublicoRepository, OrgaoPublicoRepository
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
 class OrgaoPublicoService:
     
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -34,7 +40,7 @@ class OrgaoPublicoService:
         data_fim: Optional[str],
     ) -> dict[str, Any]:
         try:
-            cod_orgao = self._repository.create_orgao_publico(
+            created = self._repository.create_orgao_publico(
                 nome=nome,
                 estado=estado,
                 descr=descr,
@@ -45,7 +51,6 @@ class OrgaoPublicoService:
             logger.exception("Erro ao criar orgao publico")
             raise
 
-        created = self.get_orgao_by_id(int(cod_orgao))
         if created is None:
             raise RuntimeError("Orgao publico recem criado nao encontrado")
         return created
@@ -61,26 +66,19 @@ class OrgaoPublicoService:
         data_ini: Any = _UNSET,
         data_fim: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if estado is not _UNSET:
-            fields_to_update["estado"] = estado
-        if descr is not _UNSET:
-            fields_to_update["descr"] = descr
-        if data_ini is not _UNSET:
-            fields_to_update["data_ini"] = data_ini
-        if data_fim is not _UNSET:
-            fields_to_update["data_fim"] = data_fim
-
-        if fields_to_update:
-            try:
-                self._repository.update_orgao_publico(cod_orgao, fields_to_update)
-            except SQLAlchemyError:
-                logger.exception("Erro ao atualizar orgao publico %s", cod_orgao)
-                raise
-
-        return self.get_orgao_by_id(cod_orgao)
+        fields_to_update = _changed_fields(
+            nome=nome,
+            estado=estado,
+            descr=descr,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+
+        try:
+            return self._repository.update_orgao_publico(cod_orgao, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar orgao publico %s", cod_orgao)
+            raise
 
 
     def delete_orgao_publico(self, cod_orgao: int) -> None:
@@ -89,3 +87,76 @@ class OrgaoPublicoService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar orgao publico %s", cod_orgao)
             raise
+
+
+class AsyncOrgaoPublicoService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncOrgaoPublicoRepository(db_manager)
+
+
+    async def list_orgaos_publicos(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_orgaos_publicos()
+
+
+    async def get_orgao_by_id(self, cod_orgao: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_orgao_by_id(cod_orgao)
+
+
+    async def create_orgao_publico(
+        self,
+        *,
+        nome: str,
+        estado: str,
+        data_ini: str,
+        descr: Optional[str],
+        data_fim: Optional[str],
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_orgao_publico(
+                nome=nome,
+                estado=estado,
+                descr=descr,
+                data_ini=data_ini,
+                data_fim=data_fim,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar orgao publico")
+            raise
+
+        if created is None:
+            raise RuntimeError("Orgao publico recem criado nao encontrado")
+        return created
+
+
+    async def update_orgao_publico(
+        self,
+        cod_orgao: int,
+        *,
+        nome: Any = _UNSET,
+        estado: Any = _UNSET,
+        descr: Any = _UNSET,
+        data_ini: Any = _UNSET,
+        data_fim: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        fields_to_update = _changed_fields(
+            nome=nome,
+            estado=estado,
+            descr=descr,
+            data_ini=data_ini,
+            data_fim=data_fim,
+        )
+
+        try:
+            return await self._repository.update_orgao_publico(cod_orgao, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar orgao publico %s", cod_orgao)
+            raise
+
+
+    async def delete_orgao_publico(self, cod_orgao: int) -> None:
+        try:
+            await self._repository.delete_orgao_publico(cod_orgao)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar orgao publico %s", cod_orgao)
+            raise
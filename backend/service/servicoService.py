@@ -3,29 +3,39 @@ from typing import Any, Dict, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.servicoRepository import ServicoRepository
+from ..persistence.servicoRepository import AsyncServicoRepository, ServicoRepository
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
 class ServicoService:
     
     def __init__(self, db_manager: DatabaseManager) -> None:
         self._repository = ServicoRepository(db_manager)
 
 
-    def list_servicos(self) -> Sequence[dict[str, Any]]:
-        return self._repository.list_servicos()
+    def list_servicos(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return self._repository.list_servicos(fields)
 
 
     def get_servico_by_id(self, cod_servico: int) -> Optional[dict[str, Any]]:
         return self._repository.get_servico_by_id(cod_servico)
 
 
-    def get_servicos_by_ocorrencia(self, cod_ocorrencia: int) -> Sequence[dict[str, Any]]:
-        return self._repository.get_servicos_by_ocorrencia(cod_ocorrencia)
+    def get_servicos_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[dict[str, Any]]:
+        return self._repository.get_servicos_by_ocorrencia(cod_ocorrencia, fields)
 
 
     def create_servico(
@@ -39,7 +49,7 @@ class ServicoService:
         fim_servico: Optional[str],
     ) -> dict[str, Any]:
         try:
-            cod_servico = self._repository.create_servico(
+            created = self._repository.create_servico(
                 cod_orgao=cod_orgao,
                 cod_ocorrencia=cod_ocorrencia,
                 nome=nome,
@@ -50,7 +60,7 @@ class ServicoService:
         except SQLAlchemyError:
             logger.exception("Erro ao criar servico")
             raise
-        created = self.get_servico_by_id(int(cod_servico))
+
         if created is None:
             raise RuntimeError("Servico recem criado nao encontrado")
         return created
@@ -67,28 +77,20 @@ class ServicoService:
         inicio_servico: Any = _UNSET,
         fim_servico: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-        if cod_orgao is not _UNSET:
-            fields_to_update["cod_orgao"] = cod_orgao
-        if cod_ocorrencia is not _UNSET:
-            fields_to_update["cod_ocorrencia"] = cod_ocorrencia
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if descr is not _UNSET:
-            fields_to_update["descr"] = descr
-        if inicio_servico is not _UNSET:
-            fields_to_update["inicio_servico"] = inicio_servico
-        if fim_servico is not _UNSET:
-            fields_to_update["fim_servico"] = fim_servico
-
-        if fields_to_update:
-            try:
-                self._repository.update_servico(cod_servico, fields_to_update)
-            except SQLAlchemyError:
-                logger.exception("Erro ao atualizar servico %s", cod_servico)
-                raise
-
-        return self.get_servico_by_id(cod_servico)
+        fields_to_update = _changed_fields(
+            cod_orgao=cod_orgao,
+            cod_ocorrencia=cod_ocorrencia,
+            nome=nome,
+            descr=descr,
+            inicio_servico=inicio_servico,
+            fim_servico=fim_servico,
+        )
+
+        try:
+            return self._repository.update_servico(cod_servico, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar servico %s", cod_servico)
+            raise
 
 
     def delete_servico(self, cod_servico: int) -> None:
@@ -97,3 +99,88 @@ class ServicoService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar servico %s", cod_servico)
             raise
+
+
+class AsyncServicoService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncServicoRepository(db_manager)
+
+
+    async def list_servicos(self, fields: Optional[Sequence[str]] = None) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_servicos(fields)
+
+
+    async def get_servico_by_id(self, cod_servico: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_servico_by_id(cod_servico)
+
+
+    async def get_servicos_by_ocorrencia(
+        self,
+        cod_ocorrencia: int,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[dict[str, Any]]:
+        return await self._repository.get_servicos_by_ocorrencia(cod_ocorrencia, fields)
+
+
+    async def create_servico(
+        self,
+        *,
+        cod_orgao: int,
+        cod_ocorrencia: int,
+        nome: str,
+        descr: Optional[str],
+        inicio_servico: Optional[str],
+        fim_servico: Optional[str],
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_servico(
+                cod_orgao=cod_orgao,
+                cod_ocorrencia=cod_ocorrencia,
+                nome=nome,
+                descr=descr,
+                inicio_servico=inicio_servico,
+                fim_servico=fim_servico,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar servico")
+            raise
+
+        if created is None:
+            raise RuntimeError("Servico recem criado nao encontrado")
+        return created
+
+
+    async def update_servico(
+        self,
+        cod_servico: int,
+        *,
+        cod_orgao: Any = _UNSET,
+        cod_ocorrencia: Any = _UNSET,
+        nome: Any = _UNSET,
+        descr: Any = _UNSET,
+        inicio_servico: Any = _UNSET,
+        fim_servico: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        fields_to_update = _changed_fields(
+            cod_orgao=cod_orgao,
+            cod_ocorrencia=cod_ocorrencia,
+            nome=nome,
+            descr=descr,
+            inicio_servico=inicio_servico,
+            fim_servico=fim_servico,
+        )
+
+        try:
+            return await self._repository.update_servico(cod_servico, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar servico %s", cod_servico)
+            raise
+
+
+    async def delete_servico(self, cod_servico: int) -> None:
+        try:
+            await self._repository.delete_servico(cod_servico)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar servico %s", cod_servico)
+            raise
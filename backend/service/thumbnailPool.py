@@ -0,0 +1,72 @@
+import asyncio
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Lado maximo, em pixels, de cada miniatura gravada junto com a foto.
+THUMBNAIL_SIZES: Tuple[int, ...] = (64, 256)
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+_JPEG_QUALITY = 80
+
+
+def render_thumbnails(foto: bytes, sizes: Sequence[int]) -> Dict[int, bytes]:
+    """JPEG de cada tamanho em ``sizes``, mantendo a proporcao da foto.
+
+    Roda nos processos do pool; ``ValueError`` se o conteudo nao for uma imagem.
+    """
+    try:
+        with Image.open(io.BytesIO(foto)) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+
+            thumbnails = {}
+            for size in sizes:
+                thumbnail = image.copy()
+                thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                thumbnail.save(buffer, "JPEG", quality=_JPEG_QUALITY, optimize=True)
+                thumbnails[size] = buffer.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as exc:
+        raise ValueError("Foto deve ser uma imagem valida") from exc
+    return thumbnails
+
+
+class ThumbnailPool:
+    """Processos que redimensionam as fotos fora da thread da requisicao.
+
+    O pool so e criado no primeiro uso.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, sizes: Sequence[int] = THUMBNAIL_SIZES) -> None:
+        self.sizes = tuple(sizes)
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+
+    def render(self, foto: bytes) -> Dict[int, bytes]:
+        return self._get_executor().submit(render_thumbnails, foto, self.sizes).result()
+
+
+    async def render_async(self, foto: bytes) -> Dict[int, bytes]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), render_thumbnails, foto, self.sizes)
+
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            return self._executor
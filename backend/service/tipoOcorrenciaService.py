@@ -3,13 +3,19 @@ from typing import Any, Dict, Optional, Sequence
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..persistence.asyncDatabaseManager import AsyncDatabaseManager
 from ..persistence.databaseManager import DatabaseManager
-from ..persistence.tipoOcorrenciaRepository import TipoOcorrenciaRepository
+from ..persistence.tipoOcorrenciaRepository import AsyncTipoOcorrenciaRepository, TipoOcorrenciaRepository
 
 logger = logging.getLogger(__name__)
 
 _UNSET = object()
 
+
+def _changed_fields(**candidates: Any) -> Dict[str, Any]:
+    return {column: value for column, value in candidates.items() if value is not _UNSET}
+
+
 class TipoOcorrenciaService:
     
     def __init__(self, db_manager: DatabaseManager) -> None:
@@ -32,7 +38,7 @@ class TipoOcorrenciaService:
         orgao_pub: int,
     ) -> dict[str, Any]:
         try:
-            cod_tipo = self._repository.create_tipo_ocorrencia(
+            created = self._repository.create_tipo_ocorrencia(
                 nome=nome,
                 descr=descr,
                 orgao_pub=orgao_pub,
@@ -41,7 +47,6 @@ class TipoOcorrenciaService:
             logger.exception("Erro ao criar tipo de ocorrencia")
             raise
 
-        created = self.get_tipo_by_id(int(cod_tipo))
         if created is None:
             raise RuntimeError("Tipo de ocorrencia recem criado nao encontrado")
         return created
@@ -55,22 +60,13 @@ class TipoOcorrenciaService:
         descr: Any = _UNSET,
         orgao_pub: Any = _UNSET,
     ) -> Optional[dict[str, Any]]:
-        fields_to_update: Dict[str, Any] = {}
-        if nome is not _UNSET:
-            fields_to_update["nome"] = nome
-        if descr is not _UNSET:
-            fields_to_update["descr"] = descr
-        if orgao_pub is not _UNSET:
-            fields_to_update["orgao_pub"] = orgao_pub
-
-        if fields_to_update:
-            try:
-                self._repository.update_tipo_ocorrencia(cod_tipo, fields_to_update)
-            except SQLAlchemyError:
-                logger.exception("Erro ao atualizar tipo de ocorrencia %s", cod_tipo)
-                raise
+        fields_to_update = _changed_fields(nome=nome, descr=descr, orgao_pub=orgao_pub)
 
-        return self.get_tipo_by_id(cod_tipo)
+        try:
+            return self._repository.update_tipo_ocorrencia(cod_tipo, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar tipo de ocorrencia %s", cod_tipo)
+            raise
 
 
     def delete_tipo_ocorrencia(self, cod_tipo: int) -> None:
@@ -79,3 +75,64 @@ class TipoOcorrenciaService:
         except SQLAlchemyError:
             logger.exception("Erro ao deletar tipo de ocorrencia %s", cod_tipo)
             raise
+
+
+class AsyncTipoOcorrenciaService:
+
+    def __init__(self, db_manager: AsyncDatabaseManager) -> None:
+        self._repository = AsyncTipoOcorrenciaRepository(db_manager)
+
+
+    async def list_tipos_ocorrencia(self) -> Sequence[dict[str, Any]]:
+        return await self._repository.list_tipos_ocorrencia()
+
+
+    async def get_tipo_by_id(self, cod_tipo: int) -> Optional[dict[str, Any]]:
+        return await self._repository.get_tipo_by_id(cod_tipo)
+
+
+    async def create_tipo_ocorrencia(
+        self,
+        *,
+        nome: str,
+        descr: Optional[str],
+        orgao_pub: int,
+    ) -> dict[str, Any]:
+        try:
+            created = await self._repository.create_tipo_ocorrencia(
+                nome=nome,
+                descr=descr,
+                orgao_pub=orgao_pub,
+            )
+        except SQLAlchemyError:
+            logger.exception("Erro ao criar tipo de ocorrencia")
+            raise
+
+        if created is None:
+            raise RuntimeError("Tipo de ocorrencia recem criado nao encontrado")
+        return created
+
+
+    async def update_tipo_ocorrencia(
+        self,
+        cod_tipo: int,
+        *,
+        nome: Any = _UNSET,
+        descr: Any = _UNSET,
+        orgao_pub: Any = _UNSET,
+    ) -> Optional[dict[str, Any]]:
+        fields_to_update = _changed_fields(nome=nome, descr=descr, orgao_pub=orgao_pub)
+
+        try:
+            return await self._repository.update_tipo_ocorrencia(cod_tipo, fields_to_update)
+        except SQLAlchemyError:
+            logger.exception("Erro ao atualizar tipo de ocorrencia %s", cod_tipo)
+            raise
+
+
+    async def delete_tipo_ocorrencia(self, cod_tipo: int) -> None:
+        try:
+            await self._repository.delete_tipo_ocorrencia(cod_tipo)
+        except SQLAlchemyError:
+            logger.exception("Erro ao deletar tipo de ocorrencia %s", cod_tipo)
+            raise
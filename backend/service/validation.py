@@ -0,0 +1,8 @@
+from pydantic import ValidationError
+
+
+def validation_message(exc: ValidationError) -> str:
+    """Primeiro erro de validacao como ``campo: motivo``."""
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
@@ -18,6 +18,9 @@ import { Servico } from "../../../components/servicos/types";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
 
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 300;
+
 const funcionarioLinks = [
 	{ href: "/menu_funcionario", label: "Menu" },
 ];
@@ -133,25 +136,36 @@ const normalizeAvaliacaoRecord = (raw: unknown): Avaliacao => {
 
 const AvaliacoesPage = () => {
 	const { isFuncionario } = useUser();
-	const [avaliacoes, setAvaliacoes] = useState<AvaliacaoDisplay[]>([]);
+	const [avaliacoes, setAvaliacoes] = useState<Avaliacao[]>([]);
+	const [servicos, setServicos] = useState<Servico[]>([]);
+	const [ocorrencias, setOcorrencias] = useState<Ocorrencia[]>([]);
+	const [moradores, setMoradores] = useState<Morador[]>([]);
 	const [searchTerm, setSearchTerm] = useState("");
+	const [debouncedTerm, setDebouncedTerm] = useState("");
+	const [nextCursor, setNextCursor] = useState<string | null>(null);
 	const [isLoading, setIsLoading] = useState(false);
+	const [isLoadingMore, setIsLoadingMore] = useState(false);
 	const [alertMessage, setAlertMessage] = useState("");
 	const [alertType, setAlertType] = useState<"success" | "error">("error");
 	const [selectedServico, setSelectedServico] = useState<Servico | null>(null);
 	const [selectedOcorrencia, setSelectedOcorrencia] = useState<Ocorrencia | null>(null);
 	const [descricaoSelecionada, setDescricaoSelecionada] = useState<string | null>(null);
 
+	const showLoadError = (error: unknown) => {
+		setAlertType("error");
+		if (axios.isAxiosError(error)) {
+			setAlertMessage(error.response?.data?.message ?? "Não foi possível carregar as avaliações.");
+		} else {
+			setAlertMessage("Erro inesperado ao carregar dados.");
+		}
+	};
+
 	useEffect(() => {
 		const controller = new AbortController();
 
-		const fetchData = async () => {
-			setIsLoading(true);
-			setAlertMessage("");
-
+		const fetchLookups = async () => {
 			try {
-				const [avaliacoesResponse, servicosResponse, ocorrenciasResponse, moradoresResponse] = await Promise.all([
-					axios.get<Avaliacao[]>(`${API_BASE_URL}/avaliacoes`, { signal: controller.signal }),
+				const [servicosResponse, ocorrenciasResponse, moradoresResponse] = await Promise.all([
 					axios.get<Servico[]>(`${API_BASE_URL}/servicos`, { signal: controller.signal }),
 					axios.get<Ocorrencia[]>(`${API_BASE_URL}/ocorrencias`, { signal: controller.signal }),
 					axios.get<Morador[]>(`${API_BASE_URL}/moradores`, { signal: controller.signal }),
@@ -160,30 +174,46 @@ const AvaliacoesPage = () => {
 				const ocorrenciasData = Array.isArray(ocorrenciasResponse.data) ? ocorrenciasResponse.data : [];
 				const moradoresData = Array.isArray(moradoresResponse.data) ? moradoresResponse.data : [];
 				const servicosData = Array.isArray(servicosResponse.data) ? servicosResponse.data : [];
-				const avaliacoesData = Array.isArray(avaliacoesResponse.data) ? avaliacoesResponse.data : [];
 
 				const normalizedOcorrencias = ocorrenciasData.map((item) => normalizeOcorrenciaRecord(item));
-				const normalizedMoradores = moradoresData.map((item) => normalizeMoradorRecord(item));
-				const normalizedServicos = servicosData.map((item) => normalizeServicoRecord(item, normalizedOcorrencias));
-				const normalizedAvaliacoes = avaliacoesData.map((item) => normalizeAvaliacaoRecord(item));
-
-				setAvaliacoes(
-					buildAvaliacaoDisplay(
-						normalizedAvaliacoes,
-						normalizedServicos,
-						normalizedOcorrencias,
-						normalizedMoradores,
-					),
-				);
+				setOcorrencias(normalizedOcorrencias);
+				setMoradores(moradoresData.map((item) => normalizeMoradorRecord(item)));
+				setServicos(servicosData.map((item) => normalizeServicoRecord(item, normalizedOcorrencias)));
 			} catch (error) {
 				if (!controller.signal.aborted) {
-					if (axios.isAxiosError(error)) {
-						setAlertType("error");
-						setAlertMessage(error.response?.data?.message ?? "Não foi possível carregar as avaliações.");
-					} else {
-						setAlertType("error");
-						setAlertMessage("Erro inesperado ao carregar dados.");
-					}
+					showLoadError(error);
+				}
+			}
+		};
+
+		fetchLookups();
+
+		return () => controller.abort();
+	}, []);
+
+	useEffect(() => {
+		const timeout = setTimeout(() => setDebouncedTerm(searchTerm.trim()), SEARCH_DEBOUNCE_MS);
+		return () => clearTimeout(timeout);
+	}, [searchTerm]);
+
+	useEffect(() => {
+		const controller = new AbortController();
+
+		const fetchData = async () => {
+			setIsLoading(true);
+			setAlertMessage("");
+
+			try {
+				const response = await axios.get<Avaliacao[]>(`${API_BASE_URL}/avaliacoes`, {
+					params: { limit: PAGE_SIZE, busca: debouncedTerm || undefined },
+					signal: controller.signal,
+				});
+				const avaliacoesData = Array.isArray(response.data) ? response.data : [];
+				setAvaliacoes(avaliacoesData.map((item) => normalizeAvaliacaoRecord(item)));
+				setNextCursor(response.headers["x-next-cursor"] ?? null);
+			} catch (error) {
+				if (!controller.signal.aborted) {
+					showLoadError(error);
 				}
 			} finally {
 				setIsLoading(false);
@@ -193,16 +223,34 @@ const AvaliacoesPage = () => {
 		fetchData();
 
 		return () => controller.abort();
-	}, []);
+	}, [debouncedTerm]);
 
-	const filteredAvaliacoes = useMemo(() => {
-		const term = searchTerm.trim().toLowerCase();
-		if (!term) {
-			return avaliacoes.sort((a, b) => a.cod_avaliacao - b.cod_avaliacao);
+	const loadMoreAvaliacoes = async () => {
+		if (!nextCursor) {
+			return;
 		}
-		return avaliacoes.filter((avaliacao) => avaliacao.servico_nome.toLowerCase().includes(term))
-			.sort((a, b) => a.cod_avaliacao - b.cod_avaliacao);
-	}, [avaliacoes, searchTerm]);
+
+		setIsLoadingMore(true);
+		setAlertMessage("");
+
+		try {
+			const response = await axios.get<Avaliacao[]>(`${API_BASE_URL}/avaliacoes`, {
+				params: { limit: PAGE_SIZE, busca: debouncedTerm || undefined, cursor: nextCursor },
+			});
+			const avaliacoesData = Array.isArray(response.data) ? response.data : [];
+			setAvaliacoes((prev) => [...prev, ...avaliacoesData.map((item) => normalizeAvaliacaoRecord(item))]);
+			setNextCursor(response.headers["x-next-cursor"] ?? null);
+		} catch (error) {
+			showLoadError(error);
+		} finally {
+			setIsLoadingMore(false);
+		}
+	};
+
+	const avaliacoesDisplay = useMemo<AvaliacaoDisplay[]>(
+		() => buildAvaliacaoDisplay(avaliacoes, servicos, ocorrencias, moradores),
+		[avaliacoes, servicos, ocorrencias, moradores],
+	);
 
 	const openOcorrenciaModal = (avaliacao: AvaliacaoDisplay) => {
 		if (!avaliacao.ocorrenciaDetalhe) {
@@ -250,12 +298,24 @@ const AvaliacoesPage = () => {
 							<AvaliacaoSearchBar value={searchTerm} onChange={setSearchTerm} />
 						</div>
 						<AvaliacaoTable
-							avaliacoes={filteredAvaliacoes}
+							avaliacoes={avaliacoesDisplay}
 							isLoading={isLoading}
 							onShowOcorrencia={openOcorrenciaModal}
 							onShowServico={openServicoModal}
 							onShowDescricao={openDescricaoModal}
 						/>
+						{!isLoading && nextCursor ? (
+							<div className="flex justify-center">
+								<button
+									type="button"
+									onClick={loadMoreAvaliacoes}
+									disabled={isLoadingMore}
+									className="rounded-full border border-neutral-300 bg-white px-6 py-3 text-sm font-medium text-neutral-800 shadow-sm transition hover:bg-neutral-50 disabled:cursor-not-allowed disabled:opacity-60"
+								>
+									{isLoadingMore ? "Carregando..." : "Carregar mais"}
+								</button>
+							</div>
+						) : null}
 					</div>
 				</main>
 				<AppFooter />
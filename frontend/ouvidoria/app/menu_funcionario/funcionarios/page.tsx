@@ -28,36 +28,18 @@ const emptyForm: FuncionarioFormState = {
 	email: "",
 	senha: "",
 	foto: "",
+	fotoAtual: "",
 };
 
 const funcionarioLinks = [
 	{ href: "/menu_funcionario", label: "Menu" },
 ];
 
-const buildImageSource = (raw: string | null | undefined): string | null => {
-	if (!raw) {
-		return null;
-	}
-
-	const trimmed = raw.trim();
-	if (!trimmed) {
-		return null;
-	}
-
-	if (trimmed.startsWith("data:")) {
-		return trimmed;
-	}
-
-	const lower = trimmed.toLowerCase();
-	let mime = "image/jpeg";
-	if (lower.startsWith("ivbor")) {
-		mime = "image/png";
-	} else if (lower.startsWith("r0lgod")) {
-		mime = "image/gif";
-	}
-
-	return `data:${mime};base64,${trimmed}`;
-};
+// A URL leva o hash da foto: muda quando a foto muda, entao o navegador pode guarda-la em cache.
+const buildFotoUrl = (funcionario: Funcionario, tamanho: number): string | null =>
+	funcionario.foto_hash
+		? `${API_BASE_URL}/funcionarios/${funcionario.cpf}/foto/${tamanho}?v=${funcionario.foto_hash}`
+		: null;
 
 const FuncionariosPage = () => {
 	const { isFuncionario } = useUser();
@@ -96,7 +78,7 @@ const FuncionariosPage = () => {
 						inicio_contrato: item.inicio_contrato ?? "",
 						fim_contrato: item.fim_contrato ?? null,
 						email: item.email ?? null,
-						foto: item.foto ?? null,
+						foto_hash: item.foto_hash ?? null,
 					}))
 				);
 				setCargos(cargoResponse.data ?? []);
@@ -183,7 +165,7 @@ const FuncionariosPage = () => {
 						orgao_nome: responseData.orgao_nome ?? orgaoNome,
 						cargo_nome: responseData.cargo_nome ?? cargoNome,
 						fim_contrato: responseData.fim_contrato ?? null,
-							foto: responseData.foto ?? (createFormState.foto ? createFormState.foto : null),
+							foto_hash: responseData.foto_hash ?? null,
 							email: responseData.email ?? (createFormState.email || null),
 					}
 					: {
@@ -196,7 +178,7 @@ const FuncionariosPage = () => {
 						data_nasc: createFormState.dataNasc,
 						inicio_contrato: createFormState.inicioContrato,
 						fim_contrato: createFormState.fimContrato || null,
-							foto: createFormState.foto ? createFormState.foto : null,
+							foto_hash: null,
 							email: createFormState.email || null,
 					};
 
@@ -228,7 +210,8 @@ const FuncionariosPage = () => {
 			fimContrato: funcionario.fim_contrato?.slice(0, 10) ?? "",
 			email: funcionario.email ?? "",
 			senha: "",
-			foto: funcionario.foto ?? "",
+			foto: "",
+			fotoAtual: buildFotoUrl(funcionario, 256) ?? "",
 		});
 		setErrorMessage("");
 		setSuccessMessage("");
@@ -258,9 +241,15 @@ const FuncionariosPage = () => {
 				inicio_contrato: formState.inicioContrato,
 				fim_contrato: formState.fimContrato ? formState.fimContrato : null,
 				email: formState.email || null,
-				foto: formState.foto ? formState.foto : null,
 			};
 
+			// Sem foto nova a atual so e enviada (como null) quando foi removida.
+			if (formState.foto) {
+				payload.foto = formState.foto;
+			} else if (editingFuncionario.foto_hash && !formState.fotoAtual) {
+				payload.foto = null;
+			}
+
 			if (formState.senha) {
 				payload.senha = formState.senha;
 			}
@@ -276,7 +265,6 @@ const FuncionariosPage = () => {
 				responseData?.cargo_nome ??
 				cargos.find((item) => String(item.cod_cargo) === formState.cargo)?.nome ??
 				editingFuncionario.cargo_nome;
-			const updatedFoto = responseData?.foto ?? (formState.foto ? formState.foto : null);
 			const updatedEmail = responseData?.email ?? (formState.email || null);
 			const updatedFimContrato = responseData?.fim_contrato ?? (formState.fimContrato || null);
 
@@ -294,7 +282,7 @@ const FuncionariosPage = () => {
 							inicio_contrato: responseData?.inicio_contrato ?? formState.inicioContrato,
 							fim_contrato: updatedFimContrato,
 							email: updatedEmail,
-							foto: updatedFoto,
+							foto_hash: responseData ? responseData.foto_hash ?? null : item.foto_hash,
 						}
 						: item
 				)
@@ -422,7 +410,7 @@ const FuncionariosPage = () => {
 										</tr>
 									) : (
 										filteredFuncionarios.map((funcionario) => {
-											const fotoSrc = buildImageSource(funcionario.foto);
+											const fotoSrc = buildFotoUrl(funcionario, 64);
 											return (
 												<tr key={funcionario.cpf} className="transition-colors hover:bg-neutral-50">
 												<td className="px-6 py-4">
@@ -37,6 +37,18 @@ const emptyAvaliacaoForm: AvaliacaoFormState = {
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL;
 
+const PAGE_SIZE = 50;
+
+const normalizeOcorrencias = (items: Ocorrencia[] | undefined) =>
+	(items ?? []).map((item) => ({
+		...item,
+		estado: item.estado ?? "",
+		cidade: item.cidade ?? "",
+		bairro: item.bairro ?? "",
+		status: item.tipo_status ?? "",
+		descricao: item.descr ?? null,
+	}));
+
 const listarLinksFuncionario = [
 	{ href: "/ocorrencias", label: "Ocorrências" },
 	{ href: "/ocorrencias/listar", label: "Listar Ocorrências" },
@@ -52,6 +64,8 @@ const OcorrenciasListarPage = () => {
 	const [ocorrencias, setOcorrencias] = useState<Ocorrencia[]>([]);
 	const [tipos, setTipos] = useState<TipoOcorrencia[]>([]);
 	const [isLoading, setIsLoading] = useState(false);
+	const [nextCursor, setNextCursor] = useState<string | null>(null);
+	const [isLoadingMore, setIsLoadingMore] = useState(false);
 	const [errorMessage, setErrorMessage] = useState("");
 	const [successMessage, setSuccessMessage] = useState("");
 	const [editingOcorrencia, setEditingOcorrencia] = useState<Ocorrencia | null>(null);
@@ -70,11 +84,20 @@ const OcorrenciasListarPage = () => {
 
 	const sanitizedCpf = useMemo(() => (cpf ? cpf.replace(/\D/g, "") : ""), [cpf]);
 
+	const ocorrenciasUrl = useMemo(
+		() =>
+			isFuncionario
+				? `${API_BASE_URL}/ocorrencias`
+				: `${API_BASE_URL}/ocorrencias/cpf/${encodeURIComponent(cpf ?? "")}`,
+		[cpf, isFuncionario]
+	);
+
 	useEffect(() => {
 		const controller = new AbortController();
 
 		if (!isFuncionario && (!email || !cpf)) {
 			setOcorrencias([]);
+			setNextCursor(null);
 			return () => controller.abort();
 		}
 
@@ -83,27 +106,18 @@ const OcorrenciasListarPage = () => {
 			setErrorMessage("");
 
 			try {
-				const ocorrenciasRequest = isFuncionario
-					? axios.get<Ocorrencia[]>(`${API_BASE_URL}/ocorrencias`, { signal: controller.signal })
-					: axios.get<Ocorrencia[]>(`${API_BASE_URL}/ocorrencias/cpf/${encodeURIComponent(cpf ?? "")}`, {
-							signal: controller.signal,
-					  });
+				const ocorrenciasRequest = axios.get<Ocorrencia[]>(ocorrenciasUrl, {
+					params: { limit: PAGE_SIZE },
+					signal: controller.signal,
+				});
 				const tiposRequest = axios.get<TipoOcorrencia[]>(`${API_BASE_URL}/tipos-ocorrencias`, {
 					signal: controller.signal,
 				});
 
 				const [ocorrenciasResponse, tiposResponse] = await Promise.all([ocorrenciasRequest, tiposRequest]);
 
-				const normalizedOcorrencias = (ocorrenciasResponse.data ?? []).map((item) => ({
-					...item,
-					estado: item.estado ?? "",
-					cidade: item.cidade ?? "",
-					bairro: item.bairro ?? "",
-					status: item.tipo_status ?? "",
-					descricao: item.descr ?? null,
-				}));
-
-				setOcorrencias(normalizedOcorrencias);
+				setOcorrencias(normalizeOcorrencias(ocorrenciasResponse.data));
+				setNextCursor(ocorrenciasResponse.headers["x-next-cursor"] ?? null);
 				setTipos(tiposResponse.data ?? []);
 			} catch (error) {
 				if (!controller.signal.aborted) {
@@ -121,7 +135,32 @@ const OcorrenciasListarPage = () => {
 		fetchData();
 
 		return () => controller.abort();
-	}, [cpf, email, isFuncionario]);
+	}, [cpf, email, isFuncionario, ocorrenciasUrl]);
+
+	const loadMoreOcorrencias = async () => {
+		if (!nextCursor) {
+			return;
+		}
+
+		setIsLoadingMore(true);
+		setErrorMessage("");
+
+		try {
+			const response = await axios.get<Ocorrencia[]>(ocorrenciasUrl, {
+				params: { limit: PAGE_SIZE, cursor: nextCursor },
+			});
+			setOcorrencias((prev) => [...prev, ...normalizeOcorrencias(response.data)]);
+			setNextCursor(response.headers["x-next-cursor"] ?? null);
+		} catch (error) {
+			if (axios.isAxiosError(error)) {
+				setErrorMessage(error.response?.data?.message ?? "Não foi possível carregar mais ocorrências.");
+			} else {
+				setErrorMessage("Erro inesperado ao carregar dados.");
+			}
+		} finally {
+			setIsLoadingMore(false);
+		}
+	};
 
 	const handleFieldChange = (field: keyof OcorrenciaFormState, value: string) => {
 		setFormState((prev) => ({ ...prev, [field]: value }));
@@ -431,6 +470,18 @@ const OcorrenciasListarPage = () => {
 								))
 							)}
 						</div>
+						{!isLoading && nextCursor ? (
+							<div className="flex justify-center">
+								<button
+									type="button"
+									onClick={loadMoreOcorrencias}
+									disabled={isLoadingMore}
+									className="rounded-full border border-neutral-300 bg-white px-6 py-3 text-sm font-medium text-neutral-800 shadow-sm transition hover:bg-neutral-50 disabled:cursor-not-allowed disabled:opacity-60"
+								>
+									{isLoadingMore ? "Carregando..." : "Carregar mais"}
+								</button>
+							</div>
+						) : null}
 					</div>
 				</main>
 				<AppFooter />
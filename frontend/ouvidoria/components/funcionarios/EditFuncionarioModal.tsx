@@ -48,9 +48,10 @@ const EditFuncionarioModal = ({ funcionario, cargos, orgaos, formState, isSaving
 
 	const handleRemoveImage = () => {
 		onChange("foto", "");
+		onChange("fotoAtual", "");
 	};
 
-	const previewSrc = formState.foto ? `data:image/*;base64,${formState.foto}` : null;
+	const previewSrc = formState.foto ? `data:image/*;base64,${formState.foto}` : formState.fotoAtual || null;
 
 	return (
 		<div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60 px-4">
@@ -92,7 +93,7 @@ const EditFuncionarioModal = ({ funcionario, cargos, orgaos, formState, isSaving
 								<input type="file" accept="image/*" className="hidden" onChange={handleImageChange} />
 								Alterar imagem
 							</label>
-							{formState.foto && (
+							{(formState.foto || formState.fotoAtual) && (
 								<button
 									type="button"
 									onClick={handleRemoveImage}
@@ -24,7 +24,7 @@ export type Funcionario = {
 	inicio_contrato: string;
 	fim_contrato?: string | null;
 	email?: string | null;
-	foto?: string | null;
+	foto_hash?: string | null;
 };
 
 export type FuncionarioFormState = {
@@ -38,4 +38,5 @@ export type FuncionarioFormState = {
 	email: string;
 	senha: string;
 	foto: string;
+	fotoAtual: string;
 };
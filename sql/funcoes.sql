@@ -77,16 +77,19 @@ DROP TRIGGER IF EXISTS trg_servico_status_after_update;
 
 DELIMITER $$
 
+-- nota_media_servico e derivada de soma_notas_servico (soma de nota_serv + nota_tempo) e
+-- qtd_avaliacoes_servico, ajustadas pela diferenca de cada escrita: o custo nao depende de
+-- quantas avaliacoes o servico ja tem. O SET do MySQL e aplicado da esquerda para a direita,
+-- entao a media usa a soma e a contagem ja atualizadas. Para reconstruir os agregados:
+-- python -m backend.commands.rebuildNotasServico
 CREATE TRIGGER trg_avaliacao_media_after_insert
 AFTER INSERT ON AVALIACAO
 FOR EACH ROW
 BEGIN
     UPDATE SERVICO s
-    SET s.nota_media_servico = (
-        SELECT AVG((a.nota_serv + a.nota_tempo) / 2.0)
-        FROM AVALIACAO a
-        WHERE a.cod_servico = NEW.cod_servico
-    )
+    SET s.soma_notas_servico = s.soma_notas_servico + NEW.nota_serv + NEW.nota_tempo,
+        s.qtd_avaliacoes_servico = s.qtd_avaliacoes_servico + 1,
+        s.nota_media_servico = s.soma_notas_servico / (2.0 * s.qtd_avaliacoes_servico)
     WHERE s.cod_servico = NEW.cod_servico;
 END $$
 
@@ -95,13 +98,25 @@ CREATE TRIGGER trg_avaliacao_media_after_update
 AFTER UPDATE ON AVALIACAO
 FOR EACH ROW
 BEGIN
-    UPDATE SERVICO s
-    SET s.nota_media_servico = (
-        SELECT AVG((a.nota_serv + a.nota_tempo) / 2.0)
-        FROM AVALIACAO a
-        WHERE a.cod_servico = NEW.cod_servico
-    )
-    WHERE s.cod_servico = NEW.cod_servico;
+    IF NEW.cod_servico <> OLD.cod_servico THEN
+        UPDATE SERVICO s
+        SET s.soma_notas_servico = s.soma_notas_servico - OLD.nota_serv - OLD.nota_tempo,
+            s.qtd_avaliacoes_servico = s.qtd_avaliacoes_servico - 1,
+            s.nota_media_servico = s.soma_notas_servico / (2.0 * NULLIF(s.qtd_avaliacoes_servico, 0))
+        WHERE s.cod_servico = OLD.cod_servico;
+
+        UPDATE SERVICO s
+        SET s.soma_notas_servico = s.soma_notas_servico + NEW.nota_serv + NEW.nota_tempo,
+            s.qtd_avaliacoes_servico = s.qtd_avaliacoes_servico + 1,
+            s.nota_media_servico = s.soma_notas_servico / (2.0 * s.qtd_avaliacoes_servico)
+        WHERE s.cod_servico = NEW.cod_servico;
+    ELSEIF NEW.nota_serv <> OLD.nota_serv OR NEW.nota_tempo <> OLD.nota_tempo THEN
+        UPDATE SERVICO s
+        SET s.soma_notas_servico = s.soma_notas_servico
+                - OLD.nota_serv - OLD.nota_tempo + NEW.nota_serv + NEW.nota_tempo,
+            s.nota_media_servico = s.soma_notas_servico / (2.0 * NULLIF(s.qtd_avaliacoes_servico, 0))
+        WHERE s.cod_servico = NEW.cod_servico;
+    END IF;
 END $$
 
 
@@ -110,11 +125,9 @@ AFTER DELETE ON AVALIACAO
 FOR EACH ROW
 BEGIN
     UPDATE SERVICO s
-    SET s.nota_media_servico = (
-        SELECT AVG((a.nota_serv + a.nota_tempo) / 2.0)
-        FROM AVALIACAO a
-        WHERE a.cod_servico = OLD.cod_servico
-    )
+    SET s.soma_notas_servico = s.soma_notas_servico - OLD.nota_serv - OLD.nota_tempo,
+        s.qtd_avaliacoes_servico = s.qtd_avaliacoes_servico - 1,
+        s.nota_media_servico = s.soma_notas_servico / (2.0 * NULLIF(s.qtd_avaliacoes_servico, 0))
     WHERE s.cod_servico = OLD.cod_servico;
 END $$
 
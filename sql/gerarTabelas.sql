@@ -5,6 +5,7 @@ DROP TABLE IF EXISTS AVALIACAO;
 DROP TABLE IF EXISTS SERVICO;
 DROP TABLE IF EXISTS OCORRENCIA;
 DROP TABLE IF EXISTS TIPO_OCORRENCIA;
+DROP TABLE IF EXISTS FOTO_MINIATURA;
 DROP TABLE IF EXISTS FOTO;
 DROP TABLE IF EXISTS EMAIL;
 DROP TABLE IF EXISTS TELEFONE;
@@ -50,8 +51,21 @@ CREATE TABLE FUNCIONARIO (
 
 CREATE TABLE FOTO (
     cod_foto INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    cpf_func VARCHAR(11) NOT NULL UNIQUE,
+    hash CHAR(64),
+    content_type VARCHAR(50),
+    tamanho_bytes INT,
+    FOREIGN KEY (cpf_func) REFERENCES FUNCIONARIO(cpf)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+
+CREATE TABLE FOTO_MINIATURA (
     cpf_func VARCHAR(11) NOT NULL,
-    imagem LONGBLOB,
+    tamanho SMALLINT NOT NULL,
+    hash CHAR(64) NOT NULL,
+    content_type VARCHAR(50) NOT NULL,
+    PRIMARY KEY (cpf_func, tamanho),
     FOREIGN KEY (cpf_func) REFERENCES FUNCIONARIO(cpf)
         ON DELETE CASCADE ON UPDATE CASCADE
 );
@@ -60,7 +74,7 @@ CREATE TABLE FOTO (
 CREATE TABLE LOCALIDADE (
     cod_local INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
     estado VARCHAR(30) NOT NULL,
-    municipio VARCHAR(100) NOT NULL,
+    cidade VARCHAR(100) NOT NULL,
     bairro VARCHAR(100) NOT NULL
 );
 
@@ -135,6 +149,8 @@ CREATE TABLE SERVICO (
     inicio_servico DATE,
     fim_servico DATE,
     nota_media_servico DECIMAL(4,2) DEFAULT NULL,
+    soma_notas_servico INT NOT NULL DEFAULT 0,
+    qtd_avaliacoes_servico INT NOT NULL DEFAULT 0,
     FOREIGN KEY (cod_orgao) REFERENCES ORGAO_PUBLICO(cod_orgao)
         ON DELETE CASCADE ON UPDATE CASCADE,
     FOREIGN KEY (cod_ocorrencia) REFERENCES OCORRENCIA(cod_oco)
@@ -159,6 +175,26 @@ CREATE TABLE AVALIACAO (
 );
 
 
+-- INDICES
+
+-- Paginacao por chave (keyset) das listagens de ocorrencias, ORDER BY data DESC, cod_oco DESC:
+-- cada pagina e uma faixa do indice, entao paginas profundas custam o mesmo que a primeira.
+CREATE INDEX idx_ocorrencia_data_cod ON OCORRENCIA (data, cod_oco);
+CREATE INDEX idx_ocorrencia_morador_data_cod ON OCORRENCIA (cpf_morador, data, cod_oco);
+
+-- Filtros de GET /ocorrencias/: igualdade na primeira coluna e a chave de paginacao em seguida.
+-- bairro/cidade e orgao_pub sao resolvidos em LOCALIDADE e TIPO_OCORRENCIA (tabelas pequenas)
+-- e chegam em OCORRENCIA por cod_local e cod_tipo; o periodo usa idx_ocorrencia_data_cod.
+CREATE INDEX idx_ocorrencia_status_data_cod ON OCORRENCIA (tipo_status, data, cod_oco);
+CREATE INDEX idx_ocorrencia_tipo_data_cod ON OCORRENCIA (cod_tipo, data, cod_oco);
+CREATE INDEX idx_ocorrencia_local_data_cod ON OCORRENCIA (cod_local, data, cod_oco);
+
+-- Uma linha por localidade: a resolucao por nome grava com INSERT ... ON DUPLICATE KEY,
+-- entao requisicoes simultaneas com o mesmo bairro novo nao criam duplicatas.
+-- Em bancos existentes, remova as duplicatas antes de criar o indice.
+CREATE UNIQUE INDEX uq_localidade_estado_cidade_bairro ON LOCALIDADE (estado, cidade, bairro);
+
+
 -- VIEWS
 
 CREATE VIEW vw_avaliacoes_completas AS
@@ -224,6 +260,9 @@ DELIMITER ;
 
 -- TRIGGERS
 
+-- Media mantida pela diferenca em soma_notas_servico e qtd_avaliacoes_servico;
+-- os gatilhos de UPDATE e DELETE estao em sql/funcoes.sql.
+
 DELIMITER $$
 
 CREATE TRIGGER trg_avaliacao_media_after_insert
@@ -231,11 +270,9 @@ AFTER INSERT ON AVALIACAO
 FOR EACH ROW
 BEGIN
     UPDATE SERVICO s
-    SET s.nota_media_servico = (
-        SELECT AVG((a.nota_serv + a.nota_tempo) / 2.0)
-        FROM AVALIACAO a
-        WHERE a.cod_servico = NEW.cod_servico
-    )
+    SET s.soma_notas_servico = s.soma_notas_servico + NEW.nota_serv + NEW.nota_tempo,
+        s.qtd_avaliacoes_servico = s.qtd_avaliacoes_servico + 1,
+        s.nota_media_servico = s.soma_notas_servico / (2.0 * s.qtd_avaliacoes_servico)
     WHERE s.cod_servico = NEW.cod_servico;
 END $$
 
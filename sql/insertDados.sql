@@ -40,7 +40,7 @@ INSERT INTO FUNCIONARIO (
 
 
 -- FOTOS
-INSERT INTO FOTO (cpf_func, imagem) VALUES
+INSERT INTO FOTO (cpf_func, hash) VALUES
 ('11111111111', NULL),
 ('22222222222', NULL),
 ('33333333333', NULL),